@@ -1,19 +1,24 @@
-from chalice import Chalice, CORSConfig
+from chalice import CORSConfig, Rate
 from chalicelib.database.db import init_db
 from chalicelib.swagger_config import init_swagger
 from chalicelib.controllers.doc_controller import register_doc_routes
 from chalicelib.controllers.user_controller import register_user_routes
 from chalicelib.controllers.book_controller import register_book_routes
+from chalicelib.controllers.metrics_controller import register_metrics_routes
+from chalicelib.middleware.metrics_middleware import register_metrics_middleware
+from chalicelib.services.user_service import UserService
+from chalicelib.utils.thread_local_app import ThreadLocalChalice
 
 cors_config = CORSConfig(
     allow_origin='http://localhost:4200',
     allow_headers=['Content-Type', 'Authorization'],
     max_age=600,
-    expose_headers=['Content-Type', 'Authorization'],
+    expose_headers=['Content-Type', 'Authorization', 'ETag', 'X-Cache'],
     allow_credentials=True
 )
 
-app = Chalice(app_name='library-api')
+app = ThreadLocalChalice(app_name='library-api')
+app.api.binary_types.append('application/gzip')
 
 init_db()
 
@@ -22,6 +27,8 @@ swagger_spec = init_swagger(app)
 register_doc_routes(app, swagger_spec)
 register_user_routes(app)
 register_book_routes(app)
+register_metrics_routes(app)
+register_metrics_middleware(app)
 
 
 @app.route('/', cors=cors_config)
@@ -31,3 +38,10 @@ def index():
         'version': '1.0.0',
         'docs_url': '/docs'
     }
+
+
+# Scheduled functions only run when deployed to Lambda; under `chalice local` and gunicorn every process
+# purges lazily instead, every REVOCATION_PURGE_SECONDS (see TokenRevocationList).
+@app.schedule(Rate(1, unit=Rate.HOURS))
+def purge_expired_revocations(event):
+    return {'purged': UserService.purge_expired_revocations()}
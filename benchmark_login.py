@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Benchmark login p99 and book-read latency under a mixed login/read load"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+os.environ.setdefault('DATABASE_PATH', os.path.join(tempfile.mkdtemp(prefix='login_bench_'), 'bench.db'))
+
+from chalicelib.constants.api import BCRYPT_ROUNDS, BCRYPT_MAX_PENDING, BCRYPT_TIMEOUT_SECONDS
+from chalicelib.database.db import init_db
+from chalicelib.repositories.book_repository import BookRepository
+from chalicelib.services import user_service
+from chalicelib.services.book_service import BookService
+from chalicelib.services.password_hasher import PasswordHasher
+from chalicelib.services.user_service import UserService
+from chalicelib.utils.exceptions import ConflictException, ServiceUnavailableException
+
+SEED_BOOKS = 2000
+PASSWORD = 'Benchmark-passw0rd'
+
+
+def percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def install_hasher(rounds, workers, max_pending):
+    user_service.password_hasher = PasswordHasher(
+        rounds=rounds,
+        workers=workers,
+        max_pending=max_pending,
+        timeout=BCRYPT_TIMEOUT_SECONDS
+    )
+
+
+def prepare_database(login_threads, rounds):
+    """Seed books and one user per login thread, hashed at the benchmarked cost"""
+    install_hasher(rounds, login_threads, login_threads)
+    init_db()
+    BookRepository.create_many([
+        (f'Seed Title {i}', f'Seed Author {i % 200}', 1900 + i % 120, None)
+        for i in range(SEED_BOOKS)
+    ])
+    for i in range(login_threads):
+        try:
+            UserService.register({'username': f'bench_{i}', 'email': f'bench_{i}@example.com', 'password': PASSWORD})
+        except ConflictException:
+            pass
+
+
+def run_scenario(workers, max_pending, rounds, login_threads, reader_threads, duration):
+    install_hasher(rounds, workers, max_pending)
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    results = {'login': [], 'read': [], 'rejected': 0}
+
+    def login(index):
+        latencies = []
+        rejected = 0
+        body = {'username': f'bench_{index}', 'password': PASSWORD}
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                UserService.login(body)
+                latencies.append(time.perf_counter() - started)
+            except ServiceUnavailableException:
+                rejected += 1
+                time.sleep(0.01)
+        with lock:
+            results['login'].extend(latencies)
+            results['rejected'] += rejected
+
+    def reader():
+        latencies = []
+        page = 0
+        while not stop.is_set():
+            started = time.perf_counter()
+            BookService.get_all_books(page=page % 50 + 1, per_page=20)
+            latencies.append(time.perf_counter() - started)
+            page += 1
+        with lock:
+            results['read'].extend(latencies)
+
+    threads = [threading.Thread(target=login, args=(i,)) for i in range(login_threads)]
+    threads.extend(threading.Thread(target=reader) for _ in range(reader_threads))
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {
+        'workers': workers,
+        'logins_per_sec': len(results['login']) / duration,
+        'login_p50_ms': percentile(results['login'], 0.50) * 1000,
+        'login_p99_ms': percentile(results['login'], 0.99) * 1000,
+        'rejected': results['rejected'],
+        'reads_per_sec': len(results['read']) / duration,
+        'read_p99_ms': percentile(results['read'], 0.99) * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--login-threads', type=int, default=16, help='Concurrent clients calling login')
+    parser.add_argument('--readers', type=int, default=4, help='Concurrent clients listing books')
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds to run each scenario')
+    parser.add_argument('--rounds', type=int, default=BCRYPT_ROUNDS, help='bcrypt cost factor')
+    parser.add_argument('--workers', type=int, nargs='+', default=[16, 2],
+                        help='bcrypt pool sizes to compare (a size equal to --login-threads approximates '
+                             'hashing on the request thread)')
+    parser.add_argument('--max-pending', type=int, default=BCRYPT_MAX_PENDING,
+                        help='Queue-depth limit for pools smaller than --login-threads')
+    args = parser.parse_args()
+
+    prepare_database(args.login_threads, args.rounds)
+
+    print(f"{'workers':>8} {'logins/s':>10} {'login p50':>10} {'login p99':>10} "
+          f"{'rejected':>9} {'reads/s':>10} {'read p99':>10}")
+    print('-' * 74)
+    for workers in args.workers:
+        max_pending = max(args.max_pending, args.login_threads) if workers >= args.login_threads else args.max_pending
+        result = run_scenario(workers, max_pending, args.rounds, args.login_threads, args.readers, args.duration)
+        print(f"{result['workers']:>8} {result['logins_per_sec']:>10.1f} {result['login_p50_ms']:>8.1f}ms "
+              f"{result['login_p99_ms']:>8.1f}ms {result['rejected']:>9} {result['reads_per_sec']:>10.1f} "
+              f"{result['read_p99_ms']:>8.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Benchmark mixed read/write throughput on the books table for each PRAGMA profile"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from chalicelib.constants.api import DB_PRAGMA_PROFILES
+from chalicelib.constants.db_queries import SchemaQueries, BookQueries
+from chalicelib.database.db import apply_pragmas, run_migrations
+
+SEED_BOOKS = 5000
+
+
+def open_connection(path, pragmas, include_journal_mode=False):
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    apply_pragmas(conn, pragmas, include_journal_mode=include_journal_mode)
+    return conn
+
+
+def prepare_database(path, pragmas):
+    """Create the schema and seed books using the profile's journal mode"""
+    conn = open_connection(path, pragmas, include_journal_mode=True)
+    conn.execute(SchemaQueries.CREATE_BOOKS_TABLE)
+    conn.execute(SchemaQueries.CREATE_AUTH_TOKENS_TABLE)
+    conn.commit()
+    run_migrations(conn)
+    conn.executemany(
+        BookQueries.INSERT_BOOK,
+        ((f'Seed Title {i}', f'Seed Author {i % 500}', 1900 + i % 120, None) for i in range(SEED_BOOKS))
+    )
+    conn.commit()
+    conn.close()
+
+
+def run_profile(profile_name, readers, duration):
+    pragmas = DB_PRAGMA_PROFILES[profile_name]
+    workdir = tempfile.mkdtemp(prefix='pragma_bench_')
+    path = os.path.join(workdir, 'bench.db')
+    prepare_database(path, pragmas)
+
+    stop = threading.Event()
+    counts = {'reads': 0, 'writes': 0, 'errors': 0}
+    lock = threading.Lock()
+
+    def reader():
+        conn = open_connection(path, pragmas)
+        query = BookQueries.SELECT_BOOKS_BASE + BookQueries.FILTER_BY_YEAR + BookQueries.PAGINATION_SUFFIX
+        done = errors = 0
+        while not stop.is_set():
+            try:
+                conn.execute(query, (1950 + done % 50, 10, 0)).fetchall()
+                done += 1
+            except sqlite3.OperationalError:
+                errors += 1
+        conn.close()
+        with lock:
+            counts['reads'] += done
+            counts['errors'] += errors
+
+    def writer():
+        conn = open_connection(path, pragmas)
+        done = errors = 0
+        while not stop.is_set():
+            try:
+                conn.execute(BookQueries.INSERT_BOOK, (f'Bench Title {done}', 'Bench Author', 2000, None))
+                conn.commit()
+                done += 1
+            except sqlite3.OperationalError:
+                conn.rollback()
+                errors += 1
+        conn.close()
+        with lock:
+            counts['writes'] += done
+            counts['errors'] += errors
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    for suffix in ('', '-wal', '-shm', '-journal'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    os.rmdir(workdir)
+
+    return {
+        'profile': profile_name,
+        'reads_per_sec': counts['reads'] / duration,
+        'writes_per_sec': counts['writes'] / duration,
+        'errors': counts['errors']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--readers', type=int, default=4, help='Concurrent reader threads')
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds to run each profile')
+    parser.add_argument('--profiles', nargs='+', default=['legacy', 'tuned'], choices=sorted(DB_PRAGMA_PROFILES))
+    args = parser.parse_args()
+
+    print(f"{'profile':<10} {'reads/s':>12} {'writes/s':>12} {'errors':>8}")
+    print('-' * 46)
+    for profile_name in args.profiles:
+        result = run_profile(profile_name, args.readers, args.duration)
+        print(f"{result['profile']:<10} {result['reads_per_sec']:>12.1f} "
+              f"{result['writes_per_sec']:>12.1f} {result['errors']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Benchmark GET /books list queries on the SQL path against the in-memory columnar engine"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+os.environ.setdefault('DATABASE_PATH', os.path.join(tempfile.mkdtemp(prefix='read_engine_bench_'), 'bench.db'))
+
+from chalicelib.constants.api import COUNT_EXACT, COUNT_NONE, MATCH_CONTAINS, MATCH_PREFIX
+from chalicelib.database.db import init_db
+from chalicelib.pagination import book_pagination
+from chalicelib.pagination.columnar_catalog import ColumnarCatalog, np
+from chalicelib.repositories.book_repository import BookRepository
+
+SEED_BATCH = 5000
+WORDS = ['Silent', 'River', 'Garden', 'Night', 'Empire', 'Winter', 'Shadow', 'Letters', 'Ocean', 'Memory',
+         'Glass', 'Storm', 'Harbor', 'Crown', 'Echo', 'Forest', 'Lantern', 'Iron', 'Velvet', 'Orchard']
+
+QUERIES = [
+    ('first page', dict(count=COUNT_NONE)),
+    ('first page + total', dict(count=COUNT_EXACT)),
+    ('deep page', dict(page=500, per_page=20, count=COUNT_NONE)),
+    ('year', dict(year=1987, count=COUNT_EXACT)),
+    ('author contains', dict(author='author 42', count=COUNT_EXACT)),
+    ('title contains', dict(title='night emp', count=COUNT_EXACT)),
+    ('title prefix', dict(title='ocean', match=MATCH_PREFIX, count=COUNT_EXACT)),
+    ('author + year', dict(author='author 7', year=2001, match=MATCH_CONTAINS, count=COUNT_EXACT)),
+]
+
+
+def seed(rows):
+    init_db()
+    rng = random.Random(42)
+    for start in range(0, rows, SEED_BATCH):
+        BookRepository.create_many([
+            (' '.join(rng.sample(WORDS, 3)), f'Author {rng.randrange(rows // 20 or 1)}', rng.randrange(1900, 2025), None)
+            for _ in range(min(SEED_BATCH, rows - start))
+        ])
+
+
+def measure(paginate, params, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        paginate(**params)
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Books to seed')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per query; the median is reported')
+    args = parser.parse_args()
+
+    if np is None:
+        parser.error('the columnar engine needs numpy installed')
+
+    started = time.perf_counter()
+    seed(args.rows)
+    print(f'Seeded {args.rows} books in {time.perf_counter() - started:.1f}s')
+
+    book_pagination.columnar_catalog.enabled = False
+    catalog = ColumnarCatalog(enabled=True)
+    started = time.perf_counter()
+    catalog.paginate(count=COUNT_NONE)
+    print(f'Columnar load: {time.perf_counter() - started:.2f}s, {catalog.stats()}')
+    print()
+
+    print(f"{'query':<22} {'sql':>10} {'columnar':>10} {'speedup':>8}")
+    print('-' * 53)
+    for name, params in QUERIES:
+        sql_ms = measure(book_pagination.BookPagination.paginate, params, args.repeat)
+        columnar_ms = measure(catalog.paginate, params, args.repeat)
+        print(f'{name:<22} {sql_ms:>8.2f}ms {columnar_ms:>8.2f}ms {sql_ms / columnar_ms:>7.1f}x')
+
+    started = time.perf_counter()
+    BookRepository.update(1, 'Refreshed Title', None, None, None)
+    catalog.paginate(count=COUNT_NONE)
+    print()
+    print(f'Incremental refresh after one update: {(time.perf_counter() - started) * 1000:.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
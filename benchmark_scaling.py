@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""Benchmark repository, pagination and service calls in-process as a synthetic catalog grows, reported as JSON"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+os.environ.setdefault('DATABASE_PATH', os.path.join(tempfile.mkdtemp(prefix='scaling_bench_'), 'bench.db'))
+
+from chalicelib.constants.api import (
+    COUNT_EXACT,
+    COUNT_ESTIMATE,
+    COUNT_NONE,
+    MATCH_PREFIX,
+    SUGGEST_FIELD_AUTHOR,
+    SYNTHETIC_SEED,
+    SYNTHETIC_AUTHORS
+)
+from chalicelib.constants.db_queries import BookQueries
+from chalicelib.database.db import DATABASE_PATH, db_connection, init_db, full_text_search_enabled
+from chalicelib.pagination.book_facets import BookFacets
+from chalicelib.pagination.book_pagination import BookPagination, CURSOR_NEXT, columnar_catalog
+from chalicelib.pagination.suggest_index import BookSuggestIndex
+from chalicelib.repositories.book_repository import BookRepository
+from chalicelib.services.book_service import BookService
+from chalicelib.utils.synthetic_books import SyntheticBooks, ADJECTIVES, NOUNS, FIRST_NAMES, LAST_NAMES
+
+DEFAULT_SIZES = [10_000, 1_000_000]
+PER_PAGE = 20
+BATCH_GET_IDS = 100
+# Differences below this are timer noise for sub-millisecond calls, whatever the ratio.
+NOISE_FLOOR_MS = 0.05
+
+
+def random_id(rng, size):
+    return rng.randint(1, size)
+
+
+def recent_year(rng):
+    return rng.randint(1990, 2024)
+
+
+def misspell(word):
+    """Drop one inner letter, the way a typo would"""
+    position = len(word) // 2
+    return word[:position] + word[position + 1:]
+
+
+# Each operation takes (rng, size, books) and returns a call that yields the number of rows it read.
+# Choosing the arguments, including any lookup they need, happens outside the timed call.
+
+def paginate_first_page(count):
+    return lambda rng, size, books: lambda: len(BookPagination.paginate(per_page=PER_PAGE, count=count)['books'])
+
+
+def paginate_deep_offset(rng, size, books):
+    page = rng.randint(1, max(1, size // PER_PAGE))
+    return lambda: len(BookPagination.paginate(page=page, per_page=PER_PAGE, count=COUNT_NONE)['books'])
+
+
+def paginate_keyset(rng, size, books):
+    book = BookRepository.find_by_id(random_id(rng, size))
+    position = (CURSOR_NEXT, book['created_at'], book['id']) if book else None
+    return lambda: len(BookPagination.paginate_keyset(cursor_position=position, per_page=PER_PAGE)['books'])
+
+
+def paginate_filtered(**choose):
+    def prepare(rng, size, books):
+        filters = {name: pick(rng, books) for name, pick in choose.items()}
+        return lambda: len(BookPagination.paginate(per_page=PER_PAGE, count=COUNT_EXACT, **filters)['books'])
+    return prepare
+
+
+def find_by_id(rng, size, books):
+    book_id = random_id(rng, size)
+    return lambda: int(BookRepository.find_by_id(book_id) is not None)
+
+
+def find_by_ids(rng, size, books):
+    book_ids = [random_id(rng, size) for _ in range(BATCH_GET_IDS)]
+    return lambda: len(BookRepository.find_by_ids(book_ids))
+
+
+def service_get_book(rng, size, books):
+    book_id = random_id(rng, size)
+    return lambda: int(BookService.get_book(book_id)[1] == 200)
+
+
+def service_get_all_books(rng, size, books):
+    page = rng.randint(1, 50)
+    return lambda: len(BookService.get_all_books(page=page, per_page=PER_PAGE)[0]['books'])
+
+
+def search_fts(rng, size, books):
+    term = rng.choice(NOUNS).lower()
+    return lambda: len(BookPagination.search([term], per_page=PER_PAGE)['books'])
+
+
+def search_fuzzy(rng, size, books):
+    term = misspell(rng.choice(LAST_NAMES + NOUNS).lower())
+    return lambda: len(BookPagination.search_fuzzy([term], per_page=PER_PAGE)['books'])
+
+
+def suggest_author(rng, size, books):
+    prefix = rng.choice(FIRST_NAMES)[:3]
+    return lambda: len(BookSuggestIndex.suggest(SUGGEST_FIELD_AUTHOR, prefix)['suggestions'])
+
+
+def facets(rng, size, books):
+    return lambda: len(BookFacets.fetch()['authors'])
+
+
+def facets_by_year(rng, size, books):
+    year = recent_year(rng)
+    return lambda: len(BookFacets.fetch(year=year)['authors'])
+
+
+def repository_update(rng, size, books):
+    # Rewrites a book with its own values: the triggers, change log and version bump all run,
+    # but the catalog measured at the next size is unchanged.
+    book = BookRepository.find_by_id(random_id(rng, size))
+    if book is None:
+        return lambda: 0
+    return lambda: int(BookRepository.update(book['id'], book['title'], book['author'], book['year'], book['isbn']) is not None)
+
+
+OPERATIONS = {
+    'paginate.first_page': paginate_first_page(COUNT_NONE),
+    'paginate.first_page_exact': paginate_first_page(COUNT_EXACT),
+    'paginate.first_page_estimate': paginate_first_page(COUNT_ESTIMATE),
+    'paginate.deep_offset': paginate_deep_offset,
+    'paginate.keyset': paginate_keyset,
+    'paginate.year': paginate_filtered(year=lambda rng, books: recent_year(rng)),
+    'paginate.author_contains': paginate_filtered(author=lambda rng, books: rng.choice(LAST_NAMES).lower()),
+    'paginate.author_prefix': paginate_filtered(
+        author=lambda rng, books: books.author_name(int(books.authors * rng.random() ** 2)),
+        match=lambda rng, books: MATCH_PREFIX
+    ),
+    'paginate.title_contains': paginate_filtered(title=lambda rng, books: rng.choice(NOUNS).lower()),
+    'paginate.title_prefix': paginate_filtered(
+        title=lambda rng, books: rng.choice(ADJECTIVES).lower(),
+        match=lambda rng, books: MATCH_PREFIX
+    ),
+    'paginate.author_year': paginate_filtered(
+        author=lambda rng, books: rng.choice(LAST_NAMES).lower(),
+        year=lambda rng, books: recent_year(rng)
+    ),
+    'repository.find_by_id': find_by_id,
+    'repository.find_by_ids': find_by_ids,
+    'repository.update': repository_update,
+    'service.get_book': service_get_book,
+    'service.get_all_books': service_get_all_books,
+    'search.fts': search_fts,
+    'search.fuzzy': search_fuzzy,
+    'suggest.author': suggest_author,
+    'facets.all': facets,
+    'facets.year': facets_by_year,
+}
+FULL_TEXT_OPERATIONS = ('search.fts', 'search.fuzzy')
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of already sorted samples"""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def measure(prepare, size, books, repeat, seed):
+    rng = random.Random(seed)
+    call = prepare(rng, size, books)
+    started = time.perf_counter()
+    rows = call()
+    first = time.perf_counter() - started
+
+    samples = []
+    for _ in range(repeat):
+        call = prepare(rng, size, books)
+        started = time.perf_counter()
+        rows += call()
+        samples.append(time.perf_counter() - started)
+
+    samples.sort()
+    elapsed = sum(samples) + first
+    return {
+        'samples': len(samples),
+        'first_ms': round(first * 1000, 3),
+        'p50_ms': round(percentile(samples, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(samples, 0.99) * 1000, 3),
+        'mean_ms': round(sum(samples) / len(samples) * 1000, 3) if samples else 0.0,
+        'max_ms': round(samples[-1] * 1000, 3) if samples else 0.0,
+        'rows': rows,
+        'rows_per_second': round(rows / elapsed, 1) if elapsed > 0 else 0.0
+    }
+
+
+def catalog_size():
+    with db_connection() as conn:
+        return conn.execute(BookQueries.SELECT_BOOK_STATS).fetchone()['row_count']
+
+
+def database_bytes():
+    return sum(os.path.getsize(path) for path in (DATABASE_PATH, DATABASE_PATH + '-wal') if os.path.exists(path))
+
+
+def grow(books, start, size):
+    """Insert synthetic books ``start`` to ``size - 1``, one transaction per block"""
+    started = time.perf_counter()
+    for batch in books.batches(size - start, start=start):
+        BookRepository.create_many(batch)
+    elapsed = time.perf_counter() - started
+    inserted = size - start
+    # Refresh planner statistics the way a freshly started process would.
+    init_db()
+    return {
+        'inserted': inserted,
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(inserted / elapsed, 1) if inserted and elapsed > 0 else 0.0
+    }
+
+
+def compare(results, baseline, threshold):
+    """Operations whose p50 or p95 got slower than the baseline by more than ``threshold``"""
+    previous = {
+        (size_result['books'], name): stats
+        for size_result in baseline.get('results', [])
+        for name, stats in size_result['operations'].items()
+    }
+    regressions = []
+    for size_result in results:
+        for name, stats in size_result['operations'].items():
+            before = previous.get((size_result['books'], name))
+            if before is None:
+                continue
+            for metric in ('p50_ms', 'p95_ms'):
+                old, new = before[metric], stats[metric]
+                if new - old > NOISE_FLOOR_MS and new > old * (1 + threshold):
+                    regressions.append({
+                        'books': size_result['books'],
+                        'operation': name,
+                        'metric': metric,
+                        'baseline_ms': old,
+                        'current_ms': new,
+                        'ratio': round(new / old, 2) if old else None
+                    })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Catalog sizes to measure at, e.g. 10000 1000000 10000000')
+    parser.add_argument('--repeat', type=int, default=200, help='Timed calls per operation and size')
+    parser.add_argument('--seed', type=int, default=SYNTHETIC_SEED, help='Seed for the catalog and the call arguments')
+    parser.add_argument('--authors', type=int, default=SYNTHETIC_AUTHORS, help='Size of the synthetic author pool')
+    parser.add_argument('--operations', nargs='+', metavar='PREFIX',
+                        help=f"Only run operations starting with these prefixes, out of: {', '.join(OPERATIONS)}")
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    parser.add_argument('--compare', metavar='BASELINE', help='Earlier JSON report to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Slowdown (as a fraction) over the baseline p50/p95 that counts as a regression')
+    args = parser.parse_args()
+
+    sizes = sorted(set(args.sizes))
+    if sizes[0] < 1 or args.repeat < 1:
+        parser.error('sizes and --repeat must be at least 1')
+    names = [name for name in OPERATIONS if not args.operations or name.startswith(tuple(args.operations))]
+    if not names:
+        parser.error('--operations matched nothing')
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    init_db()
+    existing = catalog_size()
+    if existing > sizes[0]:
+        parser.error(f'{DATABASE_PATH} already holds {existing} books, more than the smallest size')
+    if not full_text_search_enabled():
+        names = [name for name in names if name not in FULL_TEXT_OPERATIONS]
+
+    books = SyntheticBooks(seed=args.seed, authors=args.authors)
+    report = {
+        'meta': {
+            'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'database': DATABASE_PATH,
+            'seed': args.seed,
+            'authors': args.authors,
+            'repeat': args.repeat,
+            'read_engine': 'columnar' if columnar_catalog.enabled else 'sql',
+            'full_text_search': full_text_search_enabled(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform()
+        },
+        'results': []
+    }
+
+    for size in sizes:
+        print(f'Growing catalog to {size} books...', file=sys.stderr)
+        seeded = grow(books, existing, size)
+        existing = size
+        print(f"  inserted {seeded['inserted']} in {seeded['seconds']:.1f}s "
+              f"({seeded['rows_per_second']:.0f} rows/s)", file=sys.stderr)
+
+        operations = {}
+        for name in names:
+            operations[name] = stats = measure(OPERATIONS[name], size, books, args.repeat, args.seed)
+            print(f"  {name:<30} p50 {stats['p50_ms']:>9.3f}ms  p95 {stats['p95_ms']:>9.3f}ms  "
+                  f"p99 {stats['p99_ms']:>9.3f}ms  first {stats['first_ms']:>9.3f}ms", file=sys.stderr)
+        report['results'].append({
+            'books': size,
+            'seed': seeded,
+            'database_bytes': database_bytes(),
+            'operations': operations
+        })
+
+    regressions = []
+    if baseline is not None:
+        regressions = compare(report['results'], baseline, args.threshold)
+        report['comparison'] = {'baseline': args.compare, 'threshold': args.threshold, 'regressions': regressions}
+        for regression in regressions:
+            print(f"✗ {regression['operation']} at {regression['books']} books: {regression['metric']} "
+                  f"{regression['baseline_ms']}ms -> {regression['current_ms']}ms", file=sys.stderr)
+        if not regressions:
+            print(f'✓ No regressions over {args.compare}', file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
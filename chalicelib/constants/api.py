@@ -2,9 +2,130 @@ JWT_SECRET_KEY = "your-secret-key-change-in-production"
 JWT_ALGORITHM = "HS256"
 JWT_TOKEN_EXPIRATION_HOURS = 24
 
+TOKEN_CACHE_MAX_ENTRIES = 10000
+TOKEN_CACHE_TTL_SECONDS = 60
+
+REVOCATION_BLOOM_CAPACITY = 100000
+REVOCATION_BLOOM_ERROR_RATE = 0.01
+REVOCATION_SYNC_SECONDS = 5.0
+REVOCATION_PURGE_SECONDS = 3600.0
+
+BCRYPT_ROUNDS = 12
+BCRYPT_WORKERS = 2
+BCRYPT_MAX_PENDING = 16
+BCRYPT_TIMEOUT_SECONDS = 10.0
+BCRYPT_RETRY_AFTER_SECONDS = 1
+
 DEFAULT_PAGE = 1
 DEFAULT_PER_PAGE = 10
 MAX_PER_PAGE = 100
+MATCH_CONTAINS = 'contains'
+MATCH_PREFIX = 'prefix'
+MATCH_MODES = (MATCH_CONTAINS, MATCH_PREFIX)
+COUNT_EXACT = 'exact'
+COUNT_ESTIMATE = 'estimate'
+COUNT_NONE = 'none'
+COUNT_MODES = (COUNT_EXACT, COUNT_ESTIMATE, COUNT_NONE)
+COUNT_CACHE_MAX_ENTRIES = 1024
+# count=estimate extrapolates author/title filters from the first rows, unless too few of them match.
+COUNT_ESTIMATE_SAMPLE_ROWS = 10000
+COUNT_ESTIMATE_MIN_MATCHES = 50
+
+RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+RESPONSE_CACHE_MAX_ENTRY_BYTES = 1024 * 1024
+RESPONSE_CACHE_SYNC_SECONDS = 1.0
+RESPONSE_CACHE_HEADER = 'X-Cache'
+
+FULL_TEXT_MIN_TERM_LENGTH = 3
+SEARCH_HIGHLIGHT_START = '<mark>'
+SEARCH_HIGHLIGHT_END = '</mark>'
+FUZZY_SIMILARITY_THRESHOLD = 0.3
+FUZZY_MAX_EXPANSIONS = 8
+FUZZY_MAX_CANDIDATES = 1000
+
+EXPORT_FORMAT_NDJSON = 'ndjson'
+EXPORT_FORMAT_CSV = 'csv'
+EXPORT_FORMATS = (EXPORT_FORMAT_NDJSON, EXPORT_FORMAT_CSV)
+EXPORT_CHUNK_SIZE = 1000
+# GET /books/export buffers its response, so it is capped; export_books.py streams any size.
+EXPORT_MAX_ROWS = 50000
+
+CHANGES_DEFAULT_LIMIT = 100
+CHANGES_MAX_LIMIT = 1000
+
+READ_ENGINE_SQL = 'sql'
+READ_ENGINE_COLUMNAR = 'columnar'
+BOOK_READ_ENGINE = READ_ENGINE_SQL
+COLUMNAR_LOAD_BATCH_SIZE = 10000
+
+SUGGEST_FIELD_TITLE = 'title'
+SUGGEST_FIELD_AUTHOR = 'author'
+SUGGEST_FIELDS = (SUGGEST_FIELD_TITLE, SUGGEST_FIELD_AUTHOR)
+SUGGEST_DEFAULT_LIMIT = 10
+SUGGEST_MAX_LIMIT = 50
+SUGGEST_RELOAD_CHANGES = 5000
+# Prefixes matching more distinct values than this keep their ranked completions cached.
+SUGGEST_TOP_CACHE_MIN_MATCHES = 256
+
+FACETS_DEFAULT_LIMIT = 10
+FACETS_MAX_LIMIT = 100
+
+# Book versions start at 1, so an If-Match that can never pass asks for version 0 and gets a 412.
+IF_MATCH_NO_VERSION = 0
+
+BATCH_GET_MAX_IDS = 1000
+# SQLITE_MAX_VARIABLE_NUMBER before SQLite 3.32; newer builds allow more, older ones reject more.
+SQLITE_MAX_VARIABLES = 999
+
+IMPORT_FORMAT_CSV = 'csv'
+IMPORT_FORMAT_NDJSON = 'ndjson'
+IMPORT_FORMATS = (IMPORT_FORMAT_CSV, IMPORT_FORMAT_NDJSON)
+IMPORT_BATCH_SIZE = 5000
+IMPORT_PROGRESS_SECONDS = 5.0
+
+SYNTHETIC_SEED = 42
+SYNTHETIC_AUTHORS = 200000
+SYNTHETIC_BLOCK_SIZE = 10000
+SYNTHETIC_FIRST_YEAR = 1800
+SYNTHETIC_LAST_YEAR = 2024
+SYNTHETIC_MISSING_YEAR_RATE = 0.03
+SYNTHETIC_MISSING_ISBN_RATE = 0.15
+
+METRICS_NAMESPACE = 'library'
+METRICS_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS_COMPONENT_DB = 'db'
+METRICS_COMPONENT_BCRYPT = 'bcrypt'
+METRICS_COMPONENT_JWT = 'jwt'
+METRICS_COMPONENTS = (METRICS_COMPONENT_DB, METRICS_COMPONENT_BCRYPT, METRICS_COMPONENT_JWT)
+METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+METRICS_FLUSH_SECONDS = 1.0
+
+BULK_MAX_BOOKS = 5000
+BULK_MODE_ATOMIC = 'atomic'
+BULK_MODE_BEST_EFFORT = 'best_effort'
+BULK_MODES = (BULK_MODE_ATOMIC, BULK_MODE_BEST_EFFORT)
+
+DB_POOL_MAX_SIZE = 8
+DB_POOL_TIMEOUT_SECONDS = 5.0
+DB_POOL_MAX_IDLE_SECONDS = 300.0
+DB_POOL_HEALTH_CHECK_SECONDS = 30.0
+
+DB_PRAGMA_PROFILE = 'tuned'
+DB_PRAGMA_PROFILES = {
+    'tuned': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 268435456,
+        'cache_size': -65536,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000
+    },
+    'legacy': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'busy_timeout': 5000
+    }
+}
 
 MIN_PASSWORD_LENGTH = 8
 MIN_USERNAME_LENGTH = 3
@@ -16,10 +137,13 @@ MAX_AUTHOR_LENGTH = 255
 
 HTTP_OK = 200
 HTTP_CREATED = 201
+HTTP_MULTI_STATUS = 207
 HTTP_BAD_REQUEST = 400
 HTTP_UNAUTHORIZED = 401
 HTTP_NOT_FOUND = 404
 HTTP_CONFLICT = 409
+HTTP_PRECONDITION_FAILED = 412
+HTTP_SERVICE_UNAVAILABLE = 503
 
 ERROR_INVALID_EMAIL = "Invalid email format"
 ERROR_INVALID_PASSWORD = "Password must be at least {} characters long"
@@ -28,11 +152,19 @@ ERROR_USER_NOT_FOUND = "User not found"
 ERROR_INVALID_CREDENTIALS = "Invalid username or password"
 ERROR_UNAUTHORIZED = "Unauthorized - Invalid or missing authentication token"
 ERROR_BOOK_NOT_FOUND = "Book not found"
+ERROR_BOOK_VERSION_MISMATCH = "Book has changed: current version is {}"
+ERROR_INVALID_IF_MATCH = "Invalid If-Match header: expected the book's ETag or a version such as \"3\""
 ERROR_VALIDATION_ERROR = "Validation error"
 ERROR_MISSING_REQUIRED_FIELD = "Missing required field: {}"
+ERROR_SEARCH_UNAVAILABLE = "Full-text search is not available on this server"
+ERROR_EXPORT_TOO_LARGE = "Export exceeds {} books: narrow the filters, or run export_books.py for a full export"
+ERROR_COLUMNAR_NEEDS_NUMPY = "BOOK_READ_ENGINE=columnar needs numpy: pip install -r requirements-columnar.txt"
+ERROR_AUTH_BUSY = "Authentication is temporarily overloaded, please retry shortly"
 
 SUCCESS_USER_REGISTERED = "User registered successfully"
 SUCCESS_LOGIN = "Login successful"
 SUCCESS_BOOK_CREATED = "Book created successfully"
+SUCCESS_BOOKS_CREATED = "{} book(s) created successfully"
+ERROR_BULK_VALIDATION = "No books were created: {} item(s) failed validation"
 SUCCESS_BOOK_UPDATED = "Book updated successfully"
 SUCCESS_BOOK_DELETED = "Book deleted successfully"
@@ -1,4 +1,7 @@
 class SchemaQueries:
+    SET_PRAGMA = 'PRAGMA {name} = {value}'
+    OPTIMIZE = 'PRAGMA optimize'
+
     CREATE_USERS_TABLE = '''
         CREATE TABLE IF NOT EXISTS users (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -31,6 +34,160 @@ class SchemaQueries:
     '''
 
 
+class FullTextQueries:
+    PROBE_TRIGRAM = "CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(value, tokenize='trigram')"
+    DROP_PROBE = 'DROP TABLE IF EXISTS temp.fts5_probe'
+    BOOKS_FTS_EXISTS = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'books_fts'"
+
+    CREATE_BOOKS_FTS_TABLE = '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+            title,
+            author,
+            content='books',
+            content_rowid='id',
+            tokenize='trigram'
+        )
+    '''
+    REBUILD_BOOKS_FTS = "INSERT INTO books_fts (books_fts) VALUES ('rebuild')"
+
+    CREATE_BOOKS_FTS_TRIGGERS = [
+        '''CREATE TRIGGER IF NOT EXISTS trg_books_fts_insert AFTER INSERT ON books BEGIN
+            INSERT INTO books_fts (rowid, title, author) VALUES (new.id, new.title, new.author);
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_books_fts_delete AFTER DELETE ON books BEGIN
+            INSERT INTO books_fts (books_fts, rowid, title, author) VALUES ('delete', old.id, old.title, old.author);
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_books_fts_update AFTER UPDATE OF title, author ON books BEGIN
+            INSERT INTO books_fts (books_fts, rowid, title, author) VALUES ('delete', old.id, old.title, old.author);
+            INSERT INTO books_fts (rowid, title, author) VALUES (new.id, new.title, new.author);
+        END''',
+    ]
+
+
+FACET_COUNTS_ADD = '''
+    INSERT INTO book_author_counts (author, count) VALUES (NEW.author, 1)
+        ON CONFLICT (author) DO UPDATE SET count = count + 1;
+    INSERT INTO book_year_counts (year, count) SELECT NEW.year, 1 WHERE NEW.year IS NOT NULL
+        ON CONFLICT (year) DO UPDATE SET count = count + 1;
+'''
+
+FACET_COUNTS_REMOVE = '''
+    UPDATE book_author_counts SET count = count - 1 WHERE author = OLD.author;
+    DELETE FROM book_author_counts WHERE author = OLD.author AND count <= 0;
+    UPDATE book_year_counts SET count = count - 1 WHERE year = OLD.year;
+    DELETE FROM book_year_counts WHERE year = OLD.year AND count <= 0;
+'''
+
+
+class MigrationQueries:
+    GET_SCHEMA_VERSION = 'PRAGMA user_version'
+    SET_SCHEMA_VERSION = 'PRAGMA user_version = {version}'
+
+    MIGRATIONS = [
+        (1, [
+            'ALTER TABLE books ADD COLUMN author_lc TEXT GENERATED ALWAYS AS (lower(author)) VIRTUAL',
+            'ALTER TABLE books ADD COLUMN title_lc TEXT GENERATED ALWAYS AS (lower(title)) VIRTUAL',
+            'CREATE INDEX IF NOT EXISTS idx_books_created_at ON books (created_at)',
+            'CREATE INDEX IF NOT EXISTS idx_books_year ON books (year)',
+            'CREATE INDEX IF NOT EXISTS idx_books_isbn ON books (isbn)',
+            'CREATE INDEX IF NOT EXISTS idx_books_author_lc ON books (author_lc)',
+            'CREATE INDEX IF NOT EXISTS idx_books_title_lc ON books (title_lc)',
+        ]),
+        (2, [
+            '''CREATE TABLE IF NOT EXISTS book_stats (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                row_count INTEGER NOT NULL,
+                generation INTEGER NOT NULL
+            )''',
+            'INSERT OR IGNORE INTO book_stats (id, row_count, generation) SELECT 1, COUNT(*), 0 FROM books',
+            '''CREATE TRIGGER IF NOT EXISTS trg_book_stats_insert AFTER INSERT ON books BEGIN
+                UPDATE book_stats SET row_count = row_count + 1, generation = generation + 1 WHERE id = 1;
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS trg_book_stats_update AFTER UPDATE ON books BEGIN
+                UPDATE book_stats SET generation = generation + 1 WHERE id = 1;
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS trg_book_stats_delete AFTER DELETE ON books BEGIN
+                UPDATE book_stats SET row_count = row_count - 1, generation = generation + 1 WHERE id = 1;
+            END''',
+        ]),
+        (3, [
+            'ALTER TABLE auth_tokens ADD COLUMN expires_at INTEGER',
+            'CREATE INDEX IF NOT EXISTS idx_auth_tokens_expires_at ON auth_tokens (expires_at)',
+        ]),
+        (4, [
+            'ALTER TABLE books ADD COLUMN version INTEGER NOT NULL DEFAULT 1',
+        ]),
+        (5, [
+            'ALTER TABLE books ADD COLUMN updated_at TIMESTAMP',
+            'UPDATE books SET updated_at = created_at',
+        ]),
+        (6, [
+            # One row per book holding its latest change; re-inserting gives it the next AUTOINCREMENT seq.
+            '''CREATE TABLE IF NOT EXISTS book_changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                book_id INTEGER NOT NULL UNIQUE,
+                deleted INTEGER NOT NULL DEFAULT 0
+            )''',
+            'INSERT INTO book_changes (book_id) SELECT id FROM books ORDER BY id',
+            '''CREATE TRIGGER IF NOT EXISTS trg_book_changes_insert AFTER INSERT ON books BEGIN
+                DELETE FROM book_changes WHERE book_id = NEW.id;
+                INSERT INTO book_changes (book_id) VALUES (NEW.id);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS trg_book_changes_update AFTER UPDATE ON books BEGIN
+                DELETE FROM book_changes WHERE book_id = NEW.id;
+                INSERT INTO book_changes (book_id) VALUES (NEW.id);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS trg_book_changes_delete AFTER DELETE ON books BEGIN
+                DELETE FROM book_changes WHERE book_id = OLD.id;
+                INSERT INTO book_changes (book_id, deleted) VALUES (OLD.id, 1);
+            END''',
+        ]),
+        (7, [
+            # Facet counts for the unfiltered catalog; rows whose count drops to 0 are removed.
+            '''CREATE TABLE IF NOT EXISTS book_author_counts (
+                author TEXT PRIMARY KEY,
+                count INTEGER NOT NULL
+            ) WITHOUT ROWID''',
+            'CREATE INDEX IF NOT EXISTS idx_book_author_counts_count ON book_author_counts (count DESC, author)',
+            '''CREATE TABLE IF NOT EXISTS book_year_counts (
+                year INTEGER PRIMARY KEY,
+                count INTEGER NOT NULL
+            )''',
+            'INSERT INTO book_author_counts (author, count) SELECT author, COUNT(*) FROM books GROUP BY author',
+            '''INSERT INTO book_year_counts (year, count)
+                SELECT year, COUNT(*) FROM books WHERE year IS NOT NULL GROUP BY year''',
+            f'''CREATE TRIGGER IF NOT EXISTS trg_book_facets_insert AFTER INSERT ON books BEGIN
+                {FACET_COUNTS_ADD}
+            END''',
+            f'''CREATE TRIGGER IF NOT EXISTS trg_book_facets_update AFTER UPDATE OF author, year ON books
+            WHEN OLD.author IS NOT NEW.author OR OLD.year IS NOT NEW.year BEGIN
+                {FACET_COUNTS_REMOVE}
+                {FACET_COUNTS_ADD}
+            END''',
+            f'''CREATE TRIGGER IF NOT EXISTS trg_book_facets_delete AFTER DELETE ON books BEGIN
+                {FACET_COUNTS_REMOVE}
+            END''',
+        ]),
+        (8, [
+            # Resume point of a file import, committed in the same transaction as the books it covers.
+            '''CREATE TABLE IF NOT EXISTS import_checkpoints (
+                source TEXT PRIMARY KEY,
+                byte_offset INTEGER NOT NULL,
+                record INTEGER NOT NULL,
+                imported INTEGER NOT NULL,
+                rejected INTEGER NOT NULL,
+                rejects_offset INTEGER NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )''',
+        ]),
+        (9, [
+            # Identity of the file a checkpoint belongs to, so a replaced file is never resumed mid-way.
+            'ALTER TABLE import_checkpoints ADD COLUMN file_size INTEGER',
+            'ALTER TABLE import_checkpoints ADD COLUMN file_mtime_ns INTEGER',
+        ]),
+    ]
+
+
 class UserQueries:
     INSERT_USER = 'INSERT INTO users (username, email, password) VALUES (?, ?, ?)'
     SELECT_USER_BY_USERNAME = 'SELECT * FROM users WHERE username = ?'
@@ -38,18 +195,120 @@ class UserQueries:
     SELECT_USER_BY_ID = 'SELECT * FROM users WHERE id = ?'
 
 
+class AuthTokenQueries:
+    # auth_tokens is the revocation list: ``token`` holds the jti of a revoked token.
+    INSERT_REVOKED_TOKEN = 'INSERT OR IGNORE INTO auth_tokens (user_id, token, expires_at) VALUES (?, ?, ?)'
+    SELECT_REVOKED_SINCE = 'SELECT id, token, expires_at FROM auth_tokens WHERE id > ? AND expires_at > ? ORDER BY id'
+    DELETE_EXPIRED_TOKENS = 'DELETE FROM auth_tokens WHERE expires_at <= ?'
+
+
+class ImportQueries:
+    SELECT_CHECKPOINT = '''
+        SELECT byte_offset, record, imported, rejected, rejects_offset, file_size, file_mtime_ns
+        FROM import_checkpoints WHERE source = ?
+    '''
+    UPSERT_CHECKPOINT = '''
+        INSERT INTO import_checkpoints (
+            source, byte_offset, record, imported, rejected, rejects_offset, file_size, file_mtime_ns
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (source) DO UPDATE SET
+            byte_offset = excluded.byte_offset,
+            record = excluded.record,
+            imported = excluded.imported,
+            rejected = excluded.rejected,
+            rejects_offset = excluded.rejects_offset,
+            file_size = excluded.file_size,
+            file_mtime_ns = excluded.file_mtime_ns,
+            updated_at = CURRENT_TIMESTAMP
+    '''
+    DELETE_CHECKPOINT = 'DELETE FROM import_checkpoints WHERE source = ?'
+
+
 class BookQueries:
-    INSERT_BOOK = 'INSERT INTO books (title, author, year, isbn) VALUES (?, ?, ?, ?)'
-    SELECT_ALL_BOOKS = 'SELECT * FROM books ORDER BY created_at DESC'
-    SELECT_BOOK_BY_ID = 'SELECT * FROM books WHERE id = ?'
-    UPDATE_BOOK = 'UPDATE books SET title = ?, author = ?, year = ?, isbn = ? WHERE id = ?'
+    BOOK_COLUMNS = 'id, title, author, year, isbn, created_at, updated_at, version'
+
+    INSERT_BOOK = 'INSERT INTO books (title, author, year, isbn, updated_at) VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)'
+    LAST_INSERT_ID = 'SELECT last_insert_rowid() AS id'
+    SELECT_ALL_BOOKS = f'SELECT {BOOK_COLUMNS} FROM books ORDER BY created_at DESC'
+    SELECT_BOOK_BY_ID = f'SELECT {BOOK_COLUMNS} FROM books WHERE id = ?'
+    SELECT_BOOKS_BY_IDS = f'SELECT {BOOK_COLUMNS} FROM books WHERE id IN ({{placeholders}})'
+    UPDATE_BOOK = '''
+        UPDATE books SET
+            title = COALESCE(?, title),
+            author = COALESCE(?, author),
+            year = COALESCE(?, year),
+            isbn = COALESCE(?, isbn),
+            updated_at = CURRENT_TIMESTAMP,
+            version = version + 1
+        WHERE id = ?
+    '''
+    UPDATE_BOOK_IF_VERSION = UPDATE_BOOK.rstrip() + ' AND version = ?'
+    UPDATE_RETURNING_VERSION = ' RETURNING version'
+    SELECT_BOOK_VERSION = 'SELECT version FROM books WHERE id = ?'
     DELETE_BOOK = 'DELETE FROM books WHERE id = ?'
 
-    SELECT_BOOKS_BASE = 'SELECT * FROM books WHERE 1=1'
+    SELECT_BOOKS_BASE = f'SELECT {BOOK_COLUMNS} FROM books WHERE 1=1'
     COUNT_BOOKS_BASE = 'SELECT COUNT(*) as count FROM books WHERE 1=1'
+    SELECT_BOOK_STATS = 'SELECT row_count, generation FROM book_stats WHERE id = 1'
+    SELECT_INDEX_STAT = "SELECT stat FROM sqlite_stat1 WHERE tbl = 'books' AND idx = ?"
+    SELECT_SAMPLE_BOUND = 'SELECT id FROM books ORDER BY id LIMIT 1 OFFSET ?'
+    FILTER_BY_SAMPLE = ' AND id <= ?'
 
-    FILTER_BY_AUTHOR = ' AND LOWER(author) LIKE LOWER(?)'
+    FILTER_BY_AUTHOR = ' AND author_lc LIKE lower(?)'
+    FILTER_BY_AUTHOR_PREFIX = ' AND author_lc >= ? AND author_lc < ?'
     FILTER_BY_YEAR = ' AND year = ?'
-    FILTER_BY_TITLE = ' AND LOWER(title) LIKE LOWER(?)'
+    FILTER_BY_TITLE = ' AND title_lc LIKE lower(?)'
+    FILTER_BY_TITLE_PREFIX = ' AND title_lc >= ? AND title_lc < ?'
+    FILTER_BY_FULL_TEXT = ' AND id IN (SELECT rowid FROM books_fts WHERE books_fts MATCH ?)'
+
+    SEARCH_BOOKS = '''
+        SELECT b.id, b.title, b.author, b.year, b.isbn, b.created_at, b.updated_at, b.version,
+            bm25(books_fts, 2.0, 1.0) AS score,
+            snippet(books_fts, 0, ?, ?, '…', 64) AS title_highlight,
+            snippet(books_fts, 1, ?, ?, '…', 64) AS author_highlight
+        FROM books_fts
+        JOIN books b ON b.id = books_fts.rowid
+        WHERE books_fts MATCH ?
+        ORDER BY score
+        LIMIT ? OFFSET ?
+    '''
+
+    SEARCH_BOOKS_FUZZY = f'''
+        SELECT {', '.join('b.' + column for column in BOOK_COLUMNS.split(', '))}, bm25(books_fts, 2.0, 1.0) AS score
+        FROM books_fts
+        JOIN books b ON b.id = books_fts.rowid
+        WHERE books_fts MATCH ?
+        ORDER BY score
+        LIMIT ?
+    '''
+
+    SELECT_AUTHOR_FACETS = 'SELECT author AS value, count FROM book_author_counts ORDER BY count DESC, author LIMIT ?'
+    SELECT_YEAR_FACETS = 'SELECT year AS value, count FROM book_year_counts ORDER BY year'
+    SELECT_AUTHOR_FACETS_FILTERED = '''
+        SELECT author AS value, COUNT(*) AS count FROM books WHERE 1=1{filters}
+        GROUP BY author ORDER BY count DESC, author LIMIT ?
+    '''
+    SELECT_YEAR_FACETS_FILTERED = 'SELECT year AS value, COUNT(*) AS count FROM books WHERE 1=1{filters} GROUP BY year'
+
+    SELECT_SUGGEST_SOURCE = 'SELECT id, title, author FROM books'
+    SELECT_LAST_CHANGE_SEQ = 'SELECT COALESCE(MAX(seq), 0) AS seq FROM book_changes'
+    SELECT_CHANGES_SINCE = f'''
+        SELECT c.seq, c.book_id, c.deleted, {', '.join('b.' + column for column in BOOK_COLUMNS.split(', '))}
+        FROM book_changes c
+        LEFT JOIN books b ON b.id = c.book_id
+        WHERE c.seq > ?
+        ORDER BY c.seq
+        LIMIT ?
+    '''
+
+    EXPORT_SUFFIX = ' ORDER BY id'
+
+    EXPORT_LIMIT = ' LIMIT ?'
+
+    PAGINATION_SUFFIX = ' ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?'
 
-    PAGINATION_SUFFIX = ' ORDER BY created_at DESC LIMIT ? OFFSET ?'
+    KEYSET_AFTER = ' AND (created_at, id) < (?, ?)'
+    KEYSET_BEFORE = ' AND (created_at, id) > (?, ?)'
+    KEYSET_NEXT_SUFFIX = ' ORDER BY created_at DESC, id DESC LIMIT ?'
+    KEYSET_PREV_SUFFIX = ' ORDER BY created_at ASC, id ASC LIMIT ?'
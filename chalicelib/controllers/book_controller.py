@@ -1,19 +1,39 @@
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from chalice import Response
 from chalicelib.services.book_service import BookService
 from chalicelib.middleware.auth_middleware import require_auth
-from chalicelib.utils.validators import parse_query_params
+from chalicelib.utils.validators import (
+    parse_query_params,
+    parse_search_params,
+    parse_export_params,
+    parse_bulk_request,
+    parse_if_match,
+    parse_changes_params,
+    parse_suggest_params,
+    parse_facets_params,
+    parse_batch_get_request
+)
 from chalicelib.utils.exceptions import (
     ValidationException,
     NotFoundException,
+    PreconditionFailedException,
     APIException
 )
 from chalicelib.utils.docs_decorator import document_endpoint
+from chalicelib.utils.response_cache import ResponseCache
+from chalicelib.utils.etags import book_etag, list_etag, etag_matches
 from chalicelib.docs.book_docs import (
     CREATE_BOOK_DOC,
+    CREATE_BOOKS_BULK_DOC,
+    BATCH_GET_BOOKS_DOC,
     GET_ALL_BOOKS_DOC,
     GET_BOOK_DOC,
+    SEARCH_BOOKS_DOC,
+    EXPORT_BOOKS_DOC,
+    GET_BOOK_CHANGES_DOC,
+    SUGGEST_BOOKS_DOC,
+    GET_BOOK_FACETS_DOC,
     UPDATE_BOOK_DOC,
     DELETE_BOOK_DOC
 )
@@ -40,6 +60,43 @@ def register_book_routes(app):
         except APIException as e:
             return Response(body={'error': e.message}, status_code=e.status_code)
 
+    @app.route('/books/bulk', methods=['POST'], cors=cors_config,
+               content_types=['application/json', 'application/x-ndjson'])
+    @document_endpoint(**CREATE_BOOKS_BULK_DOC)
+    def create_books_bulk():
+        try:
+            request = app.current_request
+
+            _, error_response = require_auth(request)
+            if error_response:
+                return error_response
+
+            parsed: Dict[str, Any] = parse_bulk_request(
+                request.query_params or {},
+                request.raw_body,
+                request.headers.get('Content-Type', '')
+            )
+            result, status_code = BookService.create_books_bulk(**parsed)
+            return Response(body=result, status_code=status_code)
+        except ValidationException as e:
+            return Response(body={'error': e.message}, status_code=e.status_code)
+        except APIException as e:
+            return Response(body={'error': e.message}, status_code=e.status_code)
+
+    @app.route('/books/batch-get', methods=['POST'], cors=cors_config)
+    @document_endpoint(**BATCH_GET_BOOKS_DOC)
+    def batch_get_books():
+        try:
+            request = app.current_request
+
+            parsed: Dict[str, Any] = parse_batch_get_request(request.json_body)
+            result, status_code = BookService.get_books_by_ids(**parsed)
+            return Response(body=result, status_code=status_code)
+        except ValidationException as e:
+            return Response(body={'error': e.message}, status_code=e.status_code)
+        except APIException as e:
+            return Response(body={'error': e.message}, status_code=e.status_code)
+
     @app.route('/books', methods=['GET'], cors=cors_config)
     @document_endpoint(**GET_ALL_BOOKS_DOC)
     def get_all_books():
@@ -48,19 +105,125 @@ def register_book_routes(app):
             query_params: Dict[str, Any] = request.query_params or {}
 
             parsed_params: Dict[str, Any] = parse_query_params(query_params)
-            result, status_code = BookService.get_all_books(**parsed_params)
+
+            generation: int = BookService.get_catalog_generation()
+            etag: str = list_etag(generation, parsed_params)
+            if etag_matches(request.headers.get('If-None-Match'), etag):
+                return Response(body='', status_code=304, headers={'ETag': etag})
+
+            body, status_code, hit, cached_etag = ResponseCache.read_through(
+                'books', parsed_params, lambda: BookService.get_all_books(**parsed_params),
+                etag_for=lambda _: etag, db_generation=generation
+            )
+            return Response(body=body, status_code=status_code, headers=ResponseCache.headers(hit, cached_etag))
+        except ValidationException as e:
+            return Response(body={'error': e.message}, status_code=e.status_code)
+        except APIException as e:
+            return Response(body={'error': e.message}, status_code=e.status_code)
+
+    @app.route('/books/search', methods=['GET'], cors=cors_config)
+    @document_endpoint(**SEARCH_BOOKS_DOC)
+    def search_books():
+        try:
+            request = app.current_request
+            query_params: Dict[str, Any] = request.query_params or {}
+
+            parsed_params: Dict[str, Any] = parse_search_params(query_params)
+            result, status_code = BookService.search_books(**parsed_params)
+            return Response(body=result, status_code=status_code)
+        except ValidationException as e:
+            return Response(body={'error': e.message}, status_code=e.status_code)
+        except APIException as e:
+            return Response(body={'error': e.message}, status_code=e.status_code)
+
+    @app.route('/books/export', methods=['GET'], cors=cors_config)
+    @document_endpoint(**EXPORT_BOOKS_DOC)
+    def export_books():
+        try:
+            request = app.current_request
+            query_params: Dict[str, Any] = request.query_params or {}
+
+            parsed_params: Dict[str, Any] = parse_export_params(query_params)
+            body, headers = BookService.export_books(**parsed_params)
+            return Response(body=body, headers=headers, status_code=200)
+        except ValidationException as e:
+            return Response(body={'error': e.message}, status_code=e.status_code)
+        except APIException as e:
+            return Response(body={'error': e.message}, status_code=e.status_code)
+
+    @app.route('/books/changes', methods=['GET'], cors=cors_config)
+    @document_endpoint(**GET_BOOK_CHANGES_DOC)
+    def get_book_changes():
+        try:
+            request = app.current_request
+            query_params: Dict[str, Any] = request.query_params or {}
+
+            parsed_params: Dict[str, Any] = parse_changes_params(query_params)
+            result, status_code = BookService.get_changes(**parsed_params)
+            return Response(body=result, status_code=status_code)
+        except ValidationException as e:
+            return Response(body={'error': e.message}, status_code=e.status_code)
+        except APIException as e:
+            return Response(body={'error': e.message}, status_code=e.status_code)
+
+    @app.route('/books/suggest', methods=['GET'], cors=cors_config)
+    @document_endpoint(**SUGGEST_BOOKS_DOC)
+    def suggest_books():
+        try:
+            request = app.current_request
+            query_params: Dict[str, Any] = request.query_params or {}
+
+            parsed_params: Dict[str, Any] = parse_suggest_params(query_params)
+            result, status_code = BookService.suggest_books(**parsed_params)
             return Response(body=result, status_code=status_code)
         except ValidationException as e:
             return Response(body={'error': e.message}, status_code=e.status_code)
         except APIException as e:
             return Response(body={'error': e.message}, status_code=e.status_code)
 
+    @app.route('/books/facets', methods=['GET'], cors=cors_config)
+    @document_endpoint(**GET_BOOK_FACETS_DOC)
+    def get_book_facets():
+        try:
+            request = app.current_request
+            query_params: Dict[str, Any] = request.query_params or {}
+
+            parsed_params: Dict[str, Any] = parse_facets_params(query_params)
+
+            generation: int = BookService.get_catalog_generation()
+            etag: str = list_etag(generation, {'facets': True, **parsed_params})
+            if etag_matches(request.headers.get('If-None-Match'), etag):
+                return Response(body='', status_code=304, headers={'ETag': etag})
+
+            body, status_code, hit, cached_etag = ResponseCache.read_through(
+                'facets', parsed_params, lambda: BookService.get_facets(**parsed_params),
+                etag_for=lambda _: etag, db_generation=generation
+            )
+            return Response(body=body, status_code=status_code, headers=ResponseCache.headers(hit, cached_etag))
+        except ValidationException as e:
+            return Response(body={'error': e.message}, status_code=e.status_code)
+        except APIException as e:
+            return Response(body={'error': e.message}, status_code=e.status_code)
+
     @app.route('/books/{book_id}', methods=['GET'], cors=cors_config)
     @document_endpoint(**GET_BOOK_DOC)
     def get_book(book_id):
         try:
-            result, status_code = BookService.get_book(int(book_id))
-            return Response(body=result, status_code=status_code)
+            request = app.current_request
+
+            if_none_match: Optional[str] = request.headers.get('If-None-Match')
+            if if_none_match:
+                version: Optional[int] = BookService.get_book_version(int(book_id))
+                if version is not None and etag_matches(if_none_match, book_etag(version)):
+                    return Response(body='', status_code=304, headers={'ETag': book_etag(version)})
+
+            # Checking the shared generation first keeps other workers' writes from being served stale.
+            generation: int = BookService.get_catalog_generation()
+            body, status_code, hit, etag = ResponseCache.read_through(
+                'book', {'book_id': int(book_id)}, lambda: BookService.get_book(int(book_id)),
+                etag_for=lambda result: book_etag(result['book']['version']), db_generation=generation
+            )
+            return Response(body=body, status_code=status_code, headers=ResponseCache.headers(hit, etag))
         except NotFoundException as e:
             return Response(body={'error': e.message}, status_code=e.status_code)
         except APIException as e:
@@ -77,10 +240,13 @@ def register_book_routes(app):
                 return error_response
 
             body: Dict[str, Any] = request.json_body
-            result, status_code = BookService.update_book(int(book_id), body)
-            return Response(body=result, status_code=status_code)
+            expected_version: Optional[int] = parse_if_match(request.headers.get('If-Match'))
+            result, status_code = BookService.update_book(int(book_id), body, expected_version)
+            return Response(body=result, status_code=status_code, headers={'ETag': book_etag(result['version'])})
         except ValidationException as e:
             return Response(body={'error': e.message}, status_code=e.status_code)
+        except PreconditionFailedException as e:
+            return Response(body={'error': e.message}, status_code=e.status_code)
         except NotFoundException as e:
             return Response(body={'error': e.message}, status_code=e.status_code)
         except APIException as e:
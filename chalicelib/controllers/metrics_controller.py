@@ -0,0 +1,11 @@
+from chalice import Response
+from chalicelib.services.metrics_service import MetricsService
+from chalicelib.constants.api import METRICS_CONTENT_TYPE
+
+
+def register_metrics_routes(app):
+    MetricsService.register_gauges()
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        return Response(body=MetricsService.render(), status_code=200, headers={'Content-Type': METRICS_CONTENT_TYPE})
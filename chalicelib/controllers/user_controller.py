@@ -6,9 +6,11 @@ from chalicelib.utils.exceptions import (
     ValidationException,
     AuthenticationException,
     ConflictException,
+    ServiceUnavailableException,
     APIException
 )
 from chalicelib.utils.docs_decorator import document_endpoint
+from chalicelib.constants.api import BCRYPT_RETRY_AFTER_SECONDS
 from chalicelib.docs.auth_docs import (
     REGISTER_USER_DOC,
     LOGIN_USER_DOC,
@@ -31,6 +33,12 @@ def register_user_routes(app):
             return Response(body={'error': e.message}, status_code=e.status_code)
         except ValidationException as e:
             return Response(body={'error': e.message}, status_code=e.status_code)
+        except ServiceUnavailableException as e:
+            return Response(
+                body={'error': e.message},
+                status_code=e.status_code,
+                headers={'Retry-After': str(BCRYPT_RETRY_AFTER_SECONDS)}
+            )
         except APIException as e:
             return Response(body={'error': e.message}, status_code=e.status_code)
 
@@ -46,6 +54,12 @@ def register_user_routes(app):
             return Response(body={'error': e.message}, status_code=e.status_code)
         except ValidationException as e:
             return Response(body={'error': e.message}, status_code=e.status_code)
+        except ServiceUnavailableException as e:
+            return Response(
+                body={'error': e.message},
+                status_code=e.status_code,
+                headers={'Retry-After': str(BCRYPT_RETRY_AFTER_SECONDS)}
+            )
         except APIException as e:
             return Response(body={'error': e.message}, status_code=e.status_code)
 
@@ -1,12 +1,26 @@
 import sqlite3
 import os
+import re
+import threading
+import time
+from collections import deque
 from contextlib import contextmanager
-from typing import Generator
+from typing import Generator, Deque, Dict, Any, List, Tuple, Optional
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from chalicelib.constants.db_queries import SchemaQueries
+from chalicelib.constants.db_queries import SchemaQueries, MigrationQueries, FullTextQueries
+from chalicelib.constants.api import (
+    DB_POOL_MAX_SIZE,
+    DB_POOL_TIMEOUT_SECONDS,
+    DB_POOL_MAX_IDLE_SECONDS,
+    DB_POOL_HEALTH_CHECK_SECONDS,
+    DB_PRAGMA_PROFILE,
+    DB_PRAGMA_PROFILES,
+    METRICS_COMPONENT_DB
+)
+from chalicelib.utils.request_metrics import request_metrics
 
-DATABASE_PATH: str = os.path.join(os.path.dirname(__file__), 'app.db')
+DATABASE_PATH: str = os.getenv('DATABASE_PATH', os.path.join(os.path.dirname(__file__), 'app.db'))
 DATABASE_URL: str = f'sqlite:///{DATABASE_PATH}'
 
 Base = declarative_base()
@@ -22,28 +36,299 @@ def get_db():
         pass
 
 
+def load_pragma_profile(profile_name: Optional[str] = None) -> Dict[str, Any]:
+    name: str = profile_name or os.getenv('DB_PRAGMA_PROFILE', DB_PRAGMA_PROFILE)
+    if name not in DB_PRAGMA_PROFILES:
+        raise ValueError(f"Unknown PRAGMA profile '{name}', expected one of {sorted(DB_PRAGMA_PROFILES)}")
+
+    profile: Dict[str, Any] = dict(DB_PRAGMA_PROFILES[name])
+    for pragma in profile:
+        override: Optional[str] = os.getenv(f'DB_PRAGMA_{pragma.upper()}')
+        if override is not None:
+            profile[pragma] = override
+    return profile
+
+
+PRAGMA_PROFILE: Dict[str, Any] = load_pragma_profile()
+
+_PRAGMA_VALUE_PATTERN = re.compile(r'^-?[A-Za-z0-9_]+$')
+
+
+def apply_pragmas(conn: sqlite3.Connection, pragmas: Dict[str, Any], include_journal_mode: bool = False) -> None:
+    for name, value in pragmas.items():
+        if name == 'journal_mode' and not include_journal_mode:
+            continue
+        if not _PRAGMA_VALUE_PATTERN.match(str(value)):
+            raise ValueError(f"Invalid value for PRAGMA {name}: {value!r}")
+        conn.execute(SchemaQueries.SET_PRAGMA.format(name=name, value=value))
+
+
 def get_db_connection() -> sqlite3.Connection:
-    conn: sqlite3.Connection = sqlite3.connect(DATABASE_PATH)
+    conn: sqlite3.Connection = sqlite3.connect(DATABASE_PATH, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    apply_pragmas(conn, PRAGMA_PROFILE)
     return conn
 
 
+class PoolTimeoutError(sqlite3.OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """
+    Bounded checkout/return pool of SQLite connections.
+
+    Idle connections are reused most-recently-used first so hot requests get a
+    warm page cache, are health-checked after sitting idle, and are closed once
+    they exceed ``max_idle_seconds``. The pool is reset in a forked child so
+    processes never share a connection.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DB_POOL_MAX_SIZE,
+        timeout: float = DB_POOL_TIMEOUT_SECONDS,
+        max_idle_seconds: float = DB_POOL_MAX_IDLE_SECONDS,
+        health_check_seconds: float = DB_POOL_HEALTH_CHECK_SECONDS
+    ) -> None:
+        self.max_size: int = max_size
+        self.timeout: float = timeout
+        self.max_idle_seconds: float = max_idle_seconds
+        self.health_check_seconds: float = health_check_seconds
+        self._lock: threading.Condition = threading.Condition()
+        self._reset_state()
+
+    def _reset_state(self) -> None:
+        self._pid: int = os.getpid()
+        self._idle: Deque[Tuple[sqlite3.Connection, float]] = deque()
+        self._size: int = 0
+        self._in_use: int = 0
+        self._created: int = 0
+        self._evicted: int = 0
+        self._discarded: int = 0
+        self._waits: int = 0
+        self._wait_time: float = 0.0
+        self._timeouts: int = 0
+
+    def _check_pid(self) -> None:
+        if self._pid != os.getpid():
+            self._reset_state()
+
+    def _evict_idle(self, now: float) -> List[sqlite3.Connection]:
+        evicted: List[sqlite3.Connection] = []
+        while self._idle and now - self._idle[0][1] > self.max_idle_seconds:
+            conn, _ = self._idle.popleft()
+            evicted.append(conn)
+            self._size -= 1
+            self._evicted += 1
+        return evicted
+
+    @staticmethod
+    def _is_healthy(conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    @staticmethod
+    def _close_quietly(connections: List[sqlite3.Connection]) -> None:
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def acquire(self) -> sqlite3.Connection:
+        conn: Optional[sqlite3.Connection] = None
+        last_used: float = 0.0
+        wait_started: Optional[float] = None
+
+        with self._lock:
+            self._check_pid()
+            evicted: List[sqlite3.Connection] = self._evict_idle(time.monotonic())
+
+            while True:
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    self._created += 1
+                    break
+
+                now: float = time.monotonic()
+                if wait_started is None:
+                    wait_started = now
+                    self._waits += 1
+                remaining: float = self.timeout - (now - wait_started)
+                if remaining <= 0:
+                    self._timeouts += 1
+                    self._wait_time += now - wait_started
+                    raise PoolTimeoutError('Timed out waiting for a database connection')
+                self._lock.wait(remaining)
+
+            self._in_use += 1
+            if wait_started is not None:
+                self._wait_time += time.monotonic() - wait_started
+
+        self._close_quietly(evicted)
+
+        if conn is not None and time.monotonic() - last_used > self.health_check_seconds:
+            if not self._is_healthy(conn):
+                self._close_quietly([conn])
+                with self._lock:
+                    self._discarded += 1
+                    self._created += 1
+                conn = None
+
+        if conn is None:
+            try:
+                conn = get_db_connection()
+            except Exception:
+                with self._lock:
+                    self._size -= 1
+                    self._in_use -= 1
+                    self._lock.notify()
+                raise
+
+        return conn
+
+    def release(self, conn: sqlite3.Connection, discard: bool = False) -> None:
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            self._in_use -= 1
+            if discard:
+                self._size -= 1
+                self._discarded += 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._lock.notify()
+
+        if discard:
+            self._close_quietly([conn])
+
+    def close_all(self) -> None:
+        with self._lock:
+            self._check_pid()
+            idle: List[sqlite3.Connection] = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+        self._close_quietly(idle)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._check_pid()
+            return {
+                'max_size': self.max_size,
+                'size': self._size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'created': self._created,
+                'evicted': self._evicted,
+                'discarded': self._discarded,
+                'waits': self._waits,
+                'wait_time_seconds': round(self._wait_time, 6),
+                'timeouts': self._timeouts
+            }
+
+
+connection_pool: ConnectionPool = ConnectionPool(
+    max_size=int(os.getenv('DB_POOL_MAX_SIZE', DB_POOL_MAX_SIZE)),
+    timeout=float(os.getenv('DB_POOL_TIMEOUT_SECONDS', DB_POOL_TIMEOUT_SECONDS)),
+    max_idle_seconds=float(os.getenv('DB_POOL_MAX_IDLE_SECONDS', DB_POOL_MAX_IDLE_SECONDS))
+)
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    return connection_pool.stats()
+
+
 @contextmanager
 def db_connection() -> Generator[sqlite3.Connection, None, None]:
-    conn: sqlite3.Connection = get_db_connection()
+    started: float = time.perf_counter()
+    conn: sqlite3.Connection = connection_pool.acquire()
+    discard: bool = False
     try:
         yield conn
         conn.commit()
-    except Exception:
-        conn.rollback()
+    except BaseException:
+        try:
+            conn.rollback()
+        except sqlite3.Error:
+            discard = True
         raise
     finally:
-        conn.close()
+        connection_pool.release(conn, discard)
+        # Includes waiting for a pooled connection, which is database time from the request's point of view.
+        request_metrics.observe(METRICS_COMPONENT_DB, time.perf_counter() - started)
+
+
+def run_migrations(conn: sqlite3.Connection) -> int:
+    version: int = conn.execute(MigrationQueries.GET_SCHEMA_VERSION).fetchone()[0]
+    for target_version, statements in MigrationQueries.MIGRATIONS:
+        if target_version <= version:
+            continue
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            version = conn.execute(MigrationQueries.GET_SCHEMA_VERSION).fetchone()[0]
+            if target_version > version:
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(MigrationQueries.SET_SCHEMA_VERSION.format(version=int(target_version)))
+                version = target_version
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return version
+
+
+_full_text_search_enabled: bool = False
+
+
+def full_text_search_enabled() -> bool:
+    return _full_text_search_enabled
+
+
+def setup_full_text_search(conn: sqlite3.Connection) -> bool:
+    global _full_text_search_enabled
+
+    try:
+        conn.execute(FullTextQueries.PROBE_TRIGRAM)
+        conn.execute(FullTextQueries.DROP_PROBE)
+    except sqlite3.OperationalError:
+        _full_text_search_enabled = False
+        return False
+
+    if conn.execute(FullTextQueries.BOOKS_FTS_EXISTS).fetchone() is None:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if conn.execute(FullTextQueries.BOOKS_FTS_EXISTS).fetchone() is None:
+                conn.execute(FullTextQueries.CREATE_BOOKS_FTS_TABLE)
+                for statement in FullTextQueries.CREATE_BOOKS_FTS_TRIGGERS:
+                    conn.execute(statement)
+                conn.execute(FullTextQueries.REBUILD_BOOKS_FTS)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    _full_text_search_enabled = True
+    return True
 
 
 def init_db() -> None:
     with db_connection() as conn:
+        if 'journal_mode' in PRAGMA_PROFILE:
+            apply_pragmas(conn, {'journal_mode': PRAGMA_PROFILE['journal_mode']}, include_journal_mode=True)
         cursor = conn.cursor()
         cursor.execute(SchemaQueries.CREATE_USERS_TABLE)
         cursor.execute(SchemaQueries.CREATE_BOOKS_TABLE)
         cursor.execute(SchemaQueries.CREATE_AUTH_TOKENS_TABLE)
+        conn.commit()
+        run_migrations(conn)
+        setup_full_text_search(conn)
+        cursor.execute(SchemaQueries.OPTIMIZE)
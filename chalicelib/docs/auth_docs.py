@@ -21,7 +21,8 @@ REGISTER_USER_DOC = {
     'responses': {
         201: 'User registered successfully',
         400: 'Validation error',
-        409: 'User already exists'
+        409: 'User already exists',
+        503: 'Password hashing pool is full, retry after the Retry-After delay'
     }
 }
 
@@ -47,7 +48,8 @@ LOGIN_USER_DOC = {
     'responses': {
         200: 'Login successful, returns JWT token',
         401: 'Invalid credentials',
-        404: 'User not found'
+        404: 'User not found',
+        503: 'Password hashing pool is full, retry after the Retry-After delay'
     }
 }
 
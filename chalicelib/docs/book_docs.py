@@ -27,6 +27,74 @@ CREATE_BOOK_DOC = {
     'security': ['BearerAuth']
 }
 
+CREATE_BOOKS_BULK_DOC = {
+    'summary': 'Create books in bulk',
+    'description': 'Create up to 5000 books in a single transaction from a JSON array or an NDJSON body '
+                   '(Content-Type: application/x-ndjson). Every item is validated like POST /books and the '
+                   'response reports a result per item (requires authentication)',
+    'tags': ['Books'],
+    'parameters': [
+        {
+            'name': 'mode',
+            'in': 'query',
+            'schema': {'type': 'string', 'enum': ['atomic', 'best_effort'], 'default': 'atomic'},
+            'description': 'atomic creates nothing if any item is invalid; best_effort creates the valid items'
+        }
+    ],
+    'request_body': {
+        'required': True,
+        'content': {
+            'application/json': {
+                'schema': {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'required': ['title', 'author'],
+                        'properties': {
+                            'title': {'type': 'string', 'example': 'The Great Gatsby'},
+                            'author': {'type': 'string', 'example': 'F. Scott Fitzgerald'},
+                            'year': {'type': 'integer', 'example': 1925},
+                            'isbn': {'type': 'string', 'example': '978-0-7432-7356-5'}
+                        }
+                    }
+                }
+            }
+        }
+    },
+    'responses': {
+        201: 'All books created',
+        207: 'Some books created (best_effort), see per-item results',
+        400: 'Validation error; in atomic mode nothing was created',
+        401: 'Unauthorized - JWT token required'
+    },
+    'security': ['BearerAuth']
+}
+
+BATCH_GET_BOOKS_DOC = {
+    'summary': 'Get books by IDs',
+    'description': 'Fetch up to 1000 books in one request. Results follow the order of ids (duplicates included); '
+                   'ids without a book come back with found false and book null',
+    'tags': ['Books'],
+    'request_body': {
+        'required': True,
+        'content': {
+            'application/json': {
+                'schema': {
+                    'type': 'object',
+                    'required': ['ids'],
+                    'properties': {
+                        'ids': {'type': 'array', 'items': {'type': 'integer'}, 'example': [3, 1, 99999]}
+                    }
+                }
+            }
+        }
+    },
+    'responses': {
+        200: 'One result per requested id, in request order',
+        400: 'Missing, empty, too many or non-integer ids'
+    }
+}
+
 GET_ALL_BOOKS_DOC = {
     'summary': 'Get all books',
     'description': 'Retrieve all books with optional pagination and filtering',
@@ -61,10 +129,242 @@ GET_ALL_BOOKS_DOC = {
             'in': 'query',
             'schema': {'type': 'integer'},
             'description': 'Filter by publication year'
+        },
+        {
+            'name': 'match',
+            'in': 'query',
+            'schema': {'type': 'string', 'enum': ['contains', 'prefix'], 'default': 'contains'},
+            'description': 'How title/author filters match; prefix matches use the lowercase indexes'
+        },
+        {
+            'name': 'cursor',
+            'in': 'query',
+            'schema': {'type': 'string'},
+            'description': 'Opaque keyset cursor. Pass an empty value for the first page, then next_cursor/prev_cursor '
+                           'from the previous response; page is ignored in this mode'
+        },
+        {
+            'name': 'count',
+            'in': 'query',
+            'schema': {'type': 'string', 'enum': ['exact', 'estimate', 'none'], 'default': 'exact'},
+            'description': 'How total is computed: exact (cached per filter set), estimate or none (total is null, '
+                           'use has_more). An estimate is any earlier count for the same filters, even if stale; '
+                           'otherwise index statistics for a year-only filter, or, for author/title filters, the '
+                           'matches among the first 10000 books scaled to the catalog. When fewer than 50 of those '
+                           'match, or the catalog is smaller, the exact count is returned instead'
+        },
+        {
+            'name': 'If-None-Match',
+            'in': 'header',
+            'schema': {'type': 'string'},
+            'description': 'ETag from a previous response; answered with 304 if the catalog has not changed'
         }
     ],
     'responses': {
         200: 'List of books retrieved successfully',
+        304: 'Not modified since the ETag in If-None-Match',
+        400: 'Invalid query parameters'
+    }
+}
+
+SEARCH_BOOKS_DOC = {
+    'summary': 'Search books',
+    'description': 'Full-text search over title and author, ranked by relevance (bm25) with highlighted matches. '
+                   'Terms are matched as case-insensitive substrings, so partial words work as prefix queries; '
+                   'terms shorter than 3 characters are ignored',
+    'tags': ['Books'],
+    'parameters': [
+        {
+            'name': 'q',
+            'in': 'query',
+            'required': True,
+            'schema': {'type': 'string'},
+            'description': 'Search terms, all of which must match'
+        },
+        {
+            'name': 'page',
+            'in': 'query',
+            'schema': {'type': 'integer', 'default': 1},
+            'description': 'Page number for pagination'
+        },
+        {
+            'name': 'per_page',
+            'in': 'query',
+            'schema': {'type': 'integer', 'default': 10},
+            'description': 'Number of books per page'
+        },
+        {
+            'name': 'fuzzy',
+            'in': 'query',
+            'schema': {'type': 'boolean', 'default': False},
+            'description': 'Tolerate typos and accents: each term matches the most similar catalog words by '
+                           'trigram similarity, books are ranked by similarity and corrections are returned'
+        }
+    ],
+    'responses': {
+        200: 'Matching books, best match first',
+        400: 'Invalid or missing search query',
+        503: 'Full-text search is not available'
+    }
+}
+
+EXPORT_BOOKS_DOC = {
+    'summary': 'Export books',
+    'description': 'Export the whole catalog, or the books matching the same filters as GET /books, '
+                   'as NDJSON or CSV, optionally gzip-compressed. At most 50000 books (EXPORT_MAX_ROWS) per request; '
+                   'larger exports are rejected with 400, use the export_books.py CLI for those',
+    'tags': ['Books'],
+    'parameters': [
+        {
+            'name': 'format',
+            'in': 'query',
+            'schema': {'type': 'string', 'enum': ['ndjson', 'csv'], 'default': 'ndjson'},
+            'description': 'Output format'
+        },
+        {
+            'name': 'gzip',
+            'in': 'query',
+            'schema': {'type': 'boolean', 'default': False},
+            'description': 'Compress the export (served as application/gzip); requires an '
+                           '`Accept: application/gzip` request header, otherwise the request fails with 400'
+        },
+        {
+            'name': 'title',
+            'in': 'query',
+            'schema': {'type': 'string'},
+            'description': 'Filter by book title'
+        },
+        {
+            'name': 'author',
+            'in': 'query',
+            'schema': {'type': 'string'},
+            'description': 'Filter by author name'
+        },
+        {
+            'name': 'year',
+            'in': 'query',
+            'schema': {'type': 'integer'},
+            'description': 'Filter by publication year'
+        },
+        {
+            'name': 'match',
+            'in': 'query',
+            'schema': {'type': 'string', 'enum': ['contains', 'prefix'], 'default': 'contains'},
+            'description': 'How title/author filters match'
+        }
+    ],
+    'responses': {
+        200: 'Catalog export',
+        400: 'Invalid query parameters, more books than EXPORT_MAX_ROWS, or gzip=true without '
+             'Accept: application/gzip'
+    }
+}
+
+GET_BOOK_CHANGES_DOC = {
+    'summary': 'Get book changes',
+    'description': 'Books created, updated or deleted after a sync token, oldest first. Each book appears once, '
+                   'at its latest change; deleted books are returned as tombstones with op "delete"',
+    'tags': ['Books'],
+    'parameters': [
+        {
+            'name': 'since',
+            'in': 'query',
+            'schema': {'type': 'string', 'default': '0'},
+            'description': 'next_since from the previous response, or 0 for a full initial sync'
+        },
+        {
+            'name': 'limit',
+            'in': 'query',
+            'schema': {'type': 'integer', 'default': 100, 'minimum': 1, 'maximum': 1000},
+            'description': 'Changes per page; keep requesting with next_since while has_more is true'
+        }
+    ],
+    'responses': {
+        200: 'Page of changes with next_since and has_more',
+        400: 'Invalid since or limit parameter'
+    }
+}
+
+SUGGEST_BOOKS_DOC = {
+    'summary': 'Suggest titles or authors',
+    'description': 'Autocomplete for search-as-you-type: distinct titles or authors starting with a prefix '
+                   '(ASCII case-insensitive), with the number of books for each. The values with the most books come '
+                   'first; ties are in alphabetical order',
+    'tags': ['Books'],
+    'parameters': [
+        {
+            'name': 'field',
+            'in': 'query',
+            'required': True,
+            'schema': {'type': 'string', 'enum': ['title', 'author']},
+            'description': 'Which field to complete'
+        },
+        {
+            'name': 'prefix',
+            'in': 'query',
+            'required': True,
+            'schema': {'type': 'string'},
+            'description': 'What the user has typed so far'
+        },
+        {
+            'name': 'limit',
+            'in': 'query',
+            'schema': {'type': 'integer', 'default': 10, 'minimum': 1, 'maximum': 50},
+            'description': 'Maximum number of suggestions'
+        }
+    ],
+    'responses': {
+        200: 'Suggestions, alphabetically',
+        400: 'Invalid field, prefix or limit parameter'
+    }
+}
+
+GET_BOOK_FACETS_DOC = {
+    'summary': 'Get book facets',
+    'description': 'Top authors, a year histogram and decade buckets for the books matching the same filters as '
+                   'GET /books. Unfiltered facets are read from counts maintained on every write',
+    'tags': ['Books'],
+    'parameters': [
+        {
+            'name': 'title',
+            'in': 'query',
+            'schema': {'type': 'string'},
+            'description': 'Filter by book title'
+        },
+        {
+            'name': 'author',
+            'in': 'query',
+            'schema': {'type': 'string'},
+            'description': 'Filter by author name'
+        },
+        {
+            'name': 'year',
+            'in': 'query',
+            'schema': {'type': 'integer'},
+            'description': 'Filter by publication year'
+        },
+        {
+            'name': 'match',
+            'in': 'query',
+            'schema': {'type': 'string', 'enum': ['contains', 'prefix'], 'default': 'contains'},
+            'description': 'How title/author filters match'
+        },
+        {
+            'name': 'limit',
+            'in': 'query',
+            'schema': {'type': 'integer', 'default': 10, 'minimum': 1, 'maximum': 100},
+            'description': 'Number of top authors to return'
+        },
+        {
+            'name': 'If-None-Match',
+            'in': 'header',
+            'schema': {'type': 'string'},
+            'description': 'ETag from a previous response; answered with 304 if the catalog has not changed'
+        }
+    ],
+    'responses': {
+        200: 'Facet counts',
+        304: 'Not modified since the ETag in If-None-Match',
         400: 'Invalid query parameters'
     }
 }
@@ -80,10 +380,17 @@ GET_BOOK_DOC = {
             'required': True,
             'schema': {'type': 'integer'},
             'description': 'The ID of the book'
+        },
+        {
+            'name': 'If-None-Match',
+            'in': 'header',
+            'schema': {'type': 'string'},
+            'description': 'ETag from a previous response; answered with 304 if the book has not changed'
         }
     ],
     'responses': {
         200: 'Book found',
+        304: 'Not modified since the ETag in If-None-Match',
         404: 'Book not found'
     }
 }
@@ -99,6 +406,14 @@ UPDATE_BOOK_DOC = {
             'required': True,
             'schema': {'type': 'integer'},
             'description': 'The ID of the book to update'
+        },
+        {
+            'name': 'If-Match',
+            'in': 'header',
+            'required': False,
+            'schema': {'type': 'string'},
+            'description': 'Only update if the book still has this ETag (e.g. "9-3") or version (e.g. "3"); '
+                           'the response ETag carries the new version'
         }
     ],
     'request_body': {
@@ -118,8 +433,10 @@ UPDATE_BOOK_DOC = {
         }
     },
     'responses': {
-        200: 'Book updated successfully',
+        200: 'Book updated successfully, returns the new version',
+        400: 'Validation error or malformed If-Match header',
         404: 'Book not found',
+        412: 'If-Match version does not match the current book version (a weak W/ tag never matches)',
         401: 'Unauthorized - JWT token required'
     },
     'security': ['BearerAuth']
@@ -1,3 +1,4 @@
 from chalicelib.middleware.auth_middleware import get_auth_token, require_auth
+from chalicelib.middleware.metrics_middleware import register_metrics_middleware
 
-__all__ = ['get_auth_token', 'require_auth']
+__all__ = ['get_auth_token', 'require_auth', 'register_metrics_middleware']
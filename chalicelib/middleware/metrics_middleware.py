@@ -0,0 +1,21 @@
+import time
+from typing import Any, Callable
+from chalice.app import Request, Response
+from chalicelib.utils.request_metrics import request_metrics
+
+
+def register_metrics_middleware(app) -> None:
+
+    @app.middleware('http')
+    def record_request_metrics(event: Request, get_response: Callable[[Request], Response]) -> Any:
+        # Group by the route template, so /books/1 and /books/2 share one series.
+        route: str = event.context.get('resourcePath') or event.path
+        request_metrics.begin_request()
+        started: float = time.perf_counter()
+        status: int = 500
+        try:
+            response: Response = get_response(event)
+            status = response.status_code
+            return response
+        finally:
+            request_metrics.end_request(event.method, route, status, time.perf_counter() - started)
@@ -1,3 +1,8 @@
 from .book_pagination import BookPagination
+from .count_cache import BookCountCache
+from .book_export import BookExport
+from .book_changes import BookChanges
+from .suggest_index import BookSuggestIndex
+from .book_facets import BookFacets
 
-__all__ = ['BookPagination']
+__all__ = ['BookPagination', 'BookCountCache', 'BookExport', 'BookChanges', 'BookSuggestIndex', 'BookFacets']
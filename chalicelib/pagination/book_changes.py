@@ -0,0 +1,40 @@
+from typing import Dict, List, Any
+from chalicelib.database.db import db_connection
+from chalicelib.constants import db_queries
+from chalicelib.constants.api import CHANGES_DEFAULT_LIMIT
+
+CHANGE_UPSERT = 'upsert'
+CHANGE_DELETE = 'delete'
+
+
+class BookChanges:
+    """
+    Reads the ``book_changes`` log, which triggers on ``books`` keep at one
+    row per book carrying the sequence number of its latest change. A client
+    that remembers ``next_since`` only ever reads the books that changed after
+    it, and deleted books come back as tombstones.
+    """
+
+    @staticmethod
+    def fetch(since: int = 0, limit: int = CHANGES_DEFAULT_LIMIT) -> Dict[str, Any]:
+        with db_connection() as conn:
+            rows: List[Any] = conn.execute(db_queries.BookQueries.SELECT_CHANGES_SINCE, (since, limit + 1)).fetchall()
+
+        changes: List[Dict[str, Any]] = []
+        for row in rows[:limit]:
+            change: Dict[str, Any] = dict(row)
+            seq: int = change.pop('seq')
+            book_id: int = change.pop('book_id')
+            deleted: bool = bool(change.pop('deleted'))
+            changes.append({
+                'seq': seq,
+                'op': CHANGE_DELETE if deleted else CHANGE_UPSERT,
+                'book_id': book_id,
+                'book': None if deleted else change
+            })
+
+        return {
+            'changes': changes,
+            'next_since': str(changes[-1]['seq'] if changes else since),
+            'has_more': len(rows) > limit
+        }
@@ -0,0 +1,103 @@
+import csv
+import io
+import json
+import zlib
+from typing import Optional, List, Any, Iterator
+from chalicelib.database.db import db_connection
+from chalicelib.constants import db_queries
+from chalicelib.constants.api import MATCH_CONTAINS, EXPORT_CHUNK_SIZE, EXPORT_FORMAT_NDJSON, EXPORT_FORMAT_CSV
+from chalicelib.pagination.book_pagination import BookPagination
+
+EXPORT_COLUMNS: List[str] = db_queries.BookQueries.BOOK_COLUMNS.split(', ')
+
+
+class BookExport:
+    """
+    Streams the catalog as NDJSON or CSV.
+
+    Rows are pulled with ``fetchmany`` and encoded one chunk at a time, so
+    memory stays flat no matter how large the catalog is.
+    """
+
+    @staticmethod
+    def iter_books(
+        author: Optional[str] = None,
+        year: Optional[int] = None,
+        title: Optional[str] = None,
+        match: str = MATCH_CONTAINS,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+        limit: Optional[int] = None
+    ) -> Iterator[List[Any]]:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+
+            filter_clause, filter_params = BookPagination.build_filters(author, year, title, match)
+            query: str = db_queries.BookQueries.SELECT_BOOKS_BASE + filter_clause + db_queries.BookQueries.EXPORT_SUFFIX
+            if limit is not None:
+                query += db_queries.BookQueries.EXPORT_LIMIT
+                filter_params = filter_params + [limit]
+            cursor.execute(query, filter_params)
+
+            while True:
+                rows: List[Any] = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+
+    @staticmethod
+    def _encode_ndjson(chunks: Iterator[List[Any]]) -> Iterator[bytes]:
+        for rows in chunks:
+            yield ''.join(
+                json.dumps(dict(row), ensure_ascii=False, separators=(',', ':')) + '\n' for row in rows
+            ).encode('utf-8')
+
+    @staticmethod
+    def _encode_csv(chunks: Iterator[List[Any]]) -> Iterator[bytes]:
+        buffer: io.StringIO = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        for rows in chunks:
+            writer.writerows(tuple(row) for row in rows)
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
+
+    @staticmethod
+    def _gzip(chunks: Iterator[bytes]) -> Iterator[bytes]:
+        compressor = zlib.compressobj(wbits=31)
+        for chunk in chunks:
+            compressed: bytes = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    @staticmethod
+    def encode(
+        chunks: Iterator[List[Any]],
+        export_format: str = EXPORT_FORMAT_NDJSON,
+        compress: bool = False
+    ) -> Iterator[bytes]:
+        encoded: Iterator[bytes] = (BookExport._encode_csv(chunks) if export_format == EXPORT_FORMAT_CSV
+                                    else BookExport._encode_ndjson(chunks))
+        return BookExport._gzip(encoded) if compress else encoded
+
+    @staticmethod
+    def stream(
+        export_format: str = EXPORT_FORMAT_NDJSON,
+        compress: bool = False,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+        **filters: Any
+    ) -> Iterator[bytes]:
+        return BookExport.encode(BookExport.iter_books(chunk_size=chunk_size, **filters), export_format, compress)
+
+    @staticmethod
+    def content_type(export_format: str, compress: bool) -> str:
+        if compress:
+            return 'application/gzip'
+        return 'text/csv; charset=utf-8' if export_format == EXPORT_FORMAT_CSV else 'application/x-ndjson'
+
+    @staticmethod
+    def filename(export_format: str, compress: bool) -> str:
+        return f"books.{export_format}{'.gz' if compress else ''}"
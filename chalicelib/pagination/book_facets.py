@@ -0,0 +1,66 @@
+from typing import Optional, Dict, List, Any
+from chalicelib.database.db import db_connection
+from chalicelib.constants import db_queries
+from chalicelib.constants.api import MATCH_CONTAINS, FACETS_DEFAULT_LIMIT
+from chalicelib.pagination.book_pagination import BookPagination
+
+
+class BookFacets:
+    """
+    Author, year and decade counts for a filter set.
+
+    Without filters the counts come straight from ``book_author_counts`` and
+    ``book_year_counts``, which triggers on ``books`` keep current, so the
+    cost does not grow with the catalog. Filtered facets group only the rows
+    the filter indexes select.
+    """
+
+    @staticmethod
+    def _decades(years: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        decades: Dict[int, int] = {}
+        for bucket in years:
+            decade: int = bucket['value'] // 10 * 10
+            decades[decade] = decades.get(decade, 0) + bucket['count']
+        return [{'value': decade, 'count': count} for decade, count in sorted(decades.items())]
+
+    @staticmethod
+    def fetch(
+        author: Optional[str] = None,
+        year: Optional[int] = None,
+        title: Optional[str] = None,
+        match: str = MATCH_CONTAINS,
+        limit: int = FACETS_DEFAULT_LIMIT
+    ) -> Dict[str, Any]:
+        with db_connection() as conn:
+            if author or year or title:
+                filter_clause, filter_params = BookPagination.build_filters(author, year, title, match)
+                authors: List[Any] = conn.execute(
+                    db_queries.BookQueries.SELECT_AUTHOR_FACETS_FILTERED.format(filters=filter_clause),
+                    filter_params + [limit]
+                ).fetchall()
+                year_rows: List[Any] = conn.execute(
+                    db_queries.BookQueries.SELECT_YEAR_FACETS_FILTERED.format(filters=filter_clause),
+                    filter_params
+                ).fetchall()
+                total: int = sum(row['count'] for row in year_rows)
+            else:
+                authors = conn.execute(db_queries.BookQueries.SELECT_AUTHOR_FACETS, (limit,)).fetchall()
+                year_rows = conn.execute(db_queries.BookQueries.SELECT_YEAR_FACETS).fetchall()
+                total = conn.execute(db_queries.BookQueries.SELECT_BOOK_STATS).fetchone()['row_count']
+
+        years: List[Dict[str, Any]] = sorted(
+            (dict(row) for row in year_rows if row['value'] is not None), key=lambda bucket: bucket['value']
+        )
+        return {
+            'total': total,
+            'authors': [dict(row) for row in authors],
+            'years': years,
+            'decades': BookFacets._decades(years),
+            'unknown_year': total - sum(bucket['count'] for bucket in years),
+            'filters': {
+                'author': author,
+                'year': year,
+                'title': title,
+                'match': match
+            }
+        }
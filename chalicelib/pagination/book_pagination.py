@@ -1,64 +1,356 @@
-from typing import Optional, Dict, List, Any
-from chalicelib.database.db import db_connection
+import base64
+import json
+import sqlite3
+import string
+from typing import Optional, Dict, List, Any, Tuple
+from chalicelib.database.db import db_connection, full_text_search_enabled
 from chalicelib.constants import db_queries
+from chalicelib.constants.api import (
+    MATCH_CONTAINS,
+    MATCH_PREFIX,
+    COUNT_EXACT,
+    COUNT_ESTIMATE,
+    COUNT_NONE,
+    COUNT_ESTIMATE_SAMPLE_ROWS,
+    COUNT_ESTIMATE_MIN_MATCHES,
+    FULL_TEXT_MIN_TERM_LENGTH,
+    SEARCH_HIGHLIGHT_START,
+    SEARCH_HIGHLIGHT_END,
+    FUZZY_SIMILARITY_THRESHOLD,
+    FUZZY_MAX_EXPANSIONS,
+    FUZZY_MAX_CANDIDATES
+)
+from chalicelib.pagination.count_cache import BookCountCache
+from chalicelib.pagination.columnar_catalog import columnar_catalog
+from chalicelib.pagination.suggest_index import BookSuggestIndex
+from chalicelib.pagination.trigram_index import tokenize
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+CURSOR_NEXT = 'next'
+CURSOR_PREV = 'prev'
 
 
 class BookPagination:
 
+    @staticmethod
+    def _prefix_bounds(value: str) -> Tuple[str, str]:
+        # author_lc/title_lc are built with SQLite's lower(), which only folds ASCII.
+        lower_bound: str = value.translate(_ASCII_LOWER)
+        upper_bound: str = lower_bound[:-1] + chr(min(ord(lower_bound[-1]) + 1, 0x10FFFF))
+        return lower_bound, upper_bound
+
+    @staticmethod
+    def _fts_phrase(value: str) -> str:
+        return '"' + value.replace('"', '""') + '"'
+
+    @staticmethod
+    def _fts_can_prefilter(value: str) -> bool:
+        # The trigram index is a superset of LIKE '%value%' only for literal terms of 3+ characters.
+        return len(value) >= FULL_TEXT_MIN_TERM_LENGTH and '%' not in value and '_' not in value
+
+    @staticmethod
+    def build_filters(
+        author: Optional[str] = None,
+        year: Optional[int] = None,
+        title: Optional[str] = None,
+        match: str = MATCH_CONTAINS
+    ) -> Tuple[str, List[Any]]:
+        clause: str = ''
+        params: List[Any] = []
+        full_text: List[str] = []
+        use_full_text: bool = full_text_search_enabled()
+
+        if author and match == MATCH_PREFIX:
+            clause += db_queries.BookQueries.FILTER_BY_AUTHOR_PREFIX
+            params.extend(BookPagination._prefix_bounds(author))
+        elif author:
+            clause += db_queries.BookQueries.FILTER_BY_AUTHOR
+            params.append(f'%{author}%')
+            if use_full_text and BookPagination._fts_can_prefilter(author):
+                full_text.append('author : ' + BookPagination._fts_phrase(author))
+
+        if year:
+            clause += db_queries.BookQueries.FILTER_BY_YEAR
+            params.append(year)
+
+        if title and match == MATCH_PREFIX:
+            clause += db_queries.BookQueries.FILTER_BY_TITLE_PREFIX
+            params.extend(BookPagination._prefix_bounds(title))
+        elif title:
+            clause += db_queries.BookQueries.FILTER_BY_TITLE
+            params.append(f'%{title}%')
+            if use_full_text and BookPagination._fts_can_prefilter(title):
+                full_text.append('title : ' + BookPagination._fts_phrase(title))
+
+        if full_text:
+            clause += db_queries.BookQueries.FILTER_BY_FULL_TEXT
+            params.append(' AND '.join(full_text))
+
+        return clause, params
+
+    @staticmethod
+    def encode_cursor(direction: str, book: Dict[str, Any]) -> str:
+        raw: bytes = json.dumps([direction, book['created_at'], book['id']], separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, str, int]:
+        try:
+            padded: str = cursor + '=' * (-len(cursor) % 4)
+            direction, created_at, book_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        except (ValueError, TypeError, UnicodeError):
+            raise ValueError("Malformed cursor")
+
+        if direction not in (CURSOR_NEXT, CURSOR_PREV) or not isinstance(created_at, str) \
+                or not isinstance(book_id, int) or isinstance(book_id, bool):
+            raise ValueError("Malformed cursor")
+        return direction, created_at, book_id
+
+    @staticmethod
+    def _estimate_from_index_stat(cursor, index_name: str, row_count: int) -> Optional[int]:
+        try:
+            row = cursor.execute(db_queries.BookQueries.SELECT_INDEX_STAT, (index_name,)).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        if not row:
+            return None
+
+        stat: List[str] = row['stat'].split()
+        if len(stat) < 2 or not stat[0].isdigit() or not stat[1].isdigit() or int(stat[0]) == 0:
+            return None
+        return round(int(stat[1]) * row_count / int(stat[0]))
+
+    @staticmethod
+    def _estimate_from_sample(cursor, filter_clause: str, filter_params: List[Any], row_count: int) -> Optional[int]:
+        if row_count <= COUNT_ESTIMATE_SAMPLE_ROWS:
+            return None
+        bound = cursor.execute(db_queries.BookQueries.SELECT_SAMPLE_BOUND, (COUNT_ESTIMATE_SAMPLE_ROWS - 1,)).fetchone()
+        if not bound:
+            return None
+
+        matches: int = cursor.execute(
+            db_queries.BookQueries.COUNT_BOOKS_BASE + filter_clause + db_queries.BookQueries.FILTER_BY_SAMPLE,
+            list(filter_params) + [bound['id']]
+        ).fetchone()['count']
+        # A selective filter says little from a sample, but its exact count is small and cheap.
+        if matches < COUNT_ESTIMATE_MIN_MATCHES:
+            return None
+        return round(matches * row_count / COUNT_ESTIMATE_SAMPLE_ROWS)
+
+    @staticmethod
+    def _count(cursor, filter_clause: str, filter_params: List[Any], count: str) -> Optional[int]:
+        if count == COUNT_NONE:
+            return None
+
+        stats = cursor.execute(db_queries.BookQueries.SELECT_BOOK_STATS).fetchone()
+        row_count: int = stats['row_count']
+        generation: int = stats['generation']
+        if not filter_clause:
+            return row_count
+
+        key = (filter_clause, tuple(filter_params))
+        estimate: bool = count == COUNT_ESTIMATE
+        # An estimate may reuse a count taken before later writes; an exact count needs the current generation.
+        cached: Optional[int] = BookCountCache.get(key, None if estimate else generation)
+        if cached is not None:
+            return cached
+
+        if estimate:
+            approximate: Optional[int] = (
+                BookPagination._estimate_from_index_stat(cursor, 'idx_books_year', row_count)
+                if filter_clause == db_queries.BookQueries.FILTER_BY_YEAR
+                else BookPagination._estimate_from_sample(cursor, filter_clause, filter_params, row_count)
+            )
+            if approximate is not None:
+                return approximate
+
+        total_count: int = cursor.execute(
+            db_queries.BookQueries.COUNT_BOOKS_BASE + filter_clause,
+            filter_params
+        ).fetchone()['count']
+        BookCountCache.set(key, generation, total_count)
+        return total_count
+
     @staticmethod
     def paginate(
         page: int = 1,
         per_page: int = 10,
         author: Optional[str] = None,
         year: Optional[int] = None,
-        title: Optional[str] = None
+        title: Optional[str] = None,
+        match: str = MATCH_CONTAINS,
+        count: str = COUNT_EXACT
     ) -> Dict[str, Any]:
+        if columnar_catalog.can_answer(author, title, match):
+            return columnar_catalog.paginate(page, per_page, author, year, title, match, count)
+
         with db_connection() as conn:
             cursor = conn.cursor()
 
-            query: str = db_queries.BookQueries.SELECT_BOOKS_BASE
-            count_query: str = db_queries.BookQueries.COUNT_BOOKS_BASE
-            params: List[Any] = []
-            count_params: List[Any] = []
-
-            if author:
-                query += db_queries.BookQueries.FILTER_BY_AUTHOR
-                count_query += db_queries.BookQueries.FILTER_BY_AUTHOR
-                filter_value: str = f'%{author}%'
-                params.append(filter_value)
-                count_params.append(filter_value)
-
-            if year:
-                query += db_queries.BookQueries.FILTER_BY_YEAR
-                count_query += db_queries.BookQueries.FILTER_BY_YEAR
-                params.append(year)
-                count_params.append(year)
-
-            if title:
-                query += db_queries.BookQueries.FILTER_BY_TITLE
-                count_query += db_queries.BookQueries.FILTER_BY_TITLE
-                filter_value: str = f'%{title}%'
-                params.append(filter_value)
-                count_params.append(filter_value)
+            filter_clause, filter_params = BookPagination.build_filters(author, year, title, match)
+            query: str = db_queries.BookQueries.SELECT_BOOKS_BASE + filter_clause
+            params: List[Any] = list(filter_params)
 
             offset: int = (page - 1) * per_page
 
-            total_count: int = cursor.execute(count_query, count_params).fetchone()['count']
+            total_count: Optional[int] = BookPagination._count(cursor, filter_clause, filter_params, count)
 
             query += db_queries.BookQueries.PAGINATION_SUFFIX
-            params.extend([per_page, offset])
+            params.extend([per_page + 1, offset])
+
+            rows: List[Any] = cursor.execute(query, params).fetchall()
 
-            books: List[Any] = cursor.execute(query, params).fetchall()
+            if total_count is None:
+                total_pages: Optional[int] = None
+            else:
+                total_pages = (total_count + per_page - 1) // per_page if total_count > 0 else 0
 
             return {
-                'books': [dict(book) for book in books],
+                'books': [dict(book) for book in rows[:per_page]],
                 'total': total_count,
                 'page': page,
                 'per_page': per_page,
-                'total_pages': (total_count + per_page - 1) // per_page if total_count > 0 else 0,
+                'total_pages': total_pages,
+                'has_more': len(rows) > per_page,
+                'count': count,
+                'filters': {
+                    'author': author,
+                    'year': year,
+                    'title': title,
+                    'match': match
+                }
+            }
+
+    @staticmethod
+    def paginate_keyset(
+        cursor_position: Optional[Tuple[str, str, int]] = None,
+        per_page: int = 10,
+        author: Optional[str] = None,
+        year: Optional[int] = None,
+        title: Optional[str] = None,
+        match: str = MATCH_CONTAINS
+    ) -> Dict[str, Any]:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+
+            filter_clause, filter_params = BookPagination.build_filters(author, year, title, match)
+            query: str = db_queries.BookQueries.SELECT_BOOKS_BASE + filter_clause
+            params: List[Any] = list(filter_params)
+
+            direction: str = CURSOR_NEXT
+            if cursor_position is not None:
+                direction, created_at, book_id = cursor_position
+                query += (db_queries.BookQueries.KEYSET_AFTER if direction == CURSOR_NEXT
+                          else db_queries.BookQueries.KEYSET_BEFORE)
+                params.extend([created_at, book_id])
+
+            query += (db_queries.BookQueries.KEYSET_NEXT_SUFFIX if direction == CURSOR_NEXT
+                      else db_queries.BookQueries.KEYSET_PREV_SUFFIX)
+            params.append(per_page + 1)
+
+            rows: List[Any] = cursor.execute(query, params).fetchall()
+            has_more: bool = len(rows) > per_page
+            books: List[Dict[str, Any]] = [dict(book) for book in rows[:per_page]]
+
+            if direction == CURSOR_PREV:
+                books.reverse()
+                has_next: bool = True
+                has_prev: bool = has_more
+            else:
+                has_next = has_more
+                has_prev = cursor_position is not None
+
+            return {
+                'books': books,
+                'per_page': per_page,
+                'next_cursor': BookPagination.encode_cursor(CURSOR_NEXT, books[-1]) if books and has_next else None,
+                'prev_cursor': BookPagination.encode_cursor(CURSOR_PREV, books[0]) if books and has_prev else None,
                 'filters': {
                     'author': author,
                     'year': year,
-                    'title': title
+                    'title': title,
+                    'match': match
                 }
             }
+
+    @staticmethod
+    def search(terms: List[str], page: int = 1, per_page: int = 10) -> Dict[str, Any]:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+
+            match_expression: str = ' '.join(BookPagination._fts_phrase(term) for term in terms)
+            offset: int = (page - 1) * per_page
+            rows: List[Any] = cursor.execute(
+                db_queries.BookQueries.SEARCH_BOOKS,
+                (
+                    SEARCH_HIGHLIGHT_START, SEARCH_HIGHLIGHT_END,
+                    SEARCH_HIGHLIGHT_START, SEARCH_HIGHLIGHT_END,
+                    match_expression, per_page + 1, offset
+                )
+            ).fetchall()
+
+            books: List[Dict[str, Any]] = []
+            for row in rows[:per_page]:
+                book: Dict[str, Any] = dict(row)
+                book['highlights'] = {
+                    'title': book.pop('title_highlight'),
+                    'author': book.pop('author_highlight')
+                }
+                books.append(book)
+
+            return {
+                'books': books,
+                'page': page,
+                'per_page': per_page,
+                'has_more': len(rows) > per_page,
+                'terms': terms
+            }
+
+    @staticmethod
+    def search_fuzzy(terms: List[str], page: int = 1, per_page: int = 10) -> Dict[str, Any]:
+        expansions: List[List[Tuple[str, float, List[str]]]] = [
+            BookSuggestIndex.similar_words(term, FUZZY_SIMILARITY_THRESHOLD, FUZZY_MAX_EXPANSIONS) for term in terms
+        ]
+        corrections: Dict[str, Optional[str]] = {
+            term: matches[0][0] if matches else None for term, matches in zip(terms, expansions)
+        }
+        result: Dict[str, Any] = {
+            'books': [],
+            'page': page,
+            'per_page': per_page,
+            'has_more': False,
+            'terms': terms,
+            'fuzzy': True,
+            'corrections': corrections
+        }
+        if not all(expansions):
+            return result
+
+        match_expression: str = ' AND '.join(
+            '(' + ' OR '.join(BookPagination._fts_phrase(spelling) for _, _, spellings in matches
+                              for spelling in spellings) + ')'
+            for matches in expansions
+        )
+        with db_connection() as conn:
+            rows: List[Any] = conn.execute(
+                db_queries.BookQueries.SEARCH_BOOKS_FUZZY,
+                (match_expression, FUZZY_MAX_CANDIDATES)
+            ).fetchall()
+
+        ranked: List[Tuple[float, float, int, Dict[str, Any]]] = []
+        for row in rows:
+            book: Dict[str, Any] = dict(row)
+            score: float = book.pop('score')
+            words = {folded for folded, _ in tokenize(book['title'] + ' ' + book['author'])}
+            book['similarity'] = round(sum(
+                max((similarity for word, similarity, _ in matches if word in words), default=0.0)
+                for matches in expansions
+            ) / len(expansions), 4)
+            ranked.append((-book['similarity'], score, book['id'], book))
+        ranked.sort(key=lambda entry: entry[:3])
+
+        offset: int = (page - 1) * per_page
+        result['books'] = [entry[3] for entry in ranked[offset:offset + per_page]]
+        result['has_more'] = len(ranked) > offset + per_page
+        return result
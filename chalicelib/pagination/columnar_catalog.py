@@ -0,0 +1,324 @@
+import os
+import re
+import string
+import threading
+from typing import Optional, Dict, List, Any
+from chalicelib.database.db import db_connection
+from chalicelib.constants import db_queries
+from chalicelib.constants.api import (
+    MATCH_CONTAINS,
+    MATCH_PREFIX,
+    COUNT_EXACT,
+    COUNT_NONE,
+    COLUMNAR_LOAD_BATCH_SIZE,
+    CHANGES_MAX_LIMIT,
+    BOOK_READ_ENGINE,
+    READ_ENGINE_COLUMNAR,
+    ERROR_COLUMNAR_NEEDS_NUMPY
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is None and os.getenv('BOOK_READ_ENGINE', BOOK_READ_ENGINE) == READ_ENGINE_COLUMNAR:
+    raise ImportError(ERROR_COLUMNAR_NEEDS_NUMPY)
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+_SEPARATOR = '\x00'
+
+BOOK_COLUMNS: List[str] = db_queries.BookQueries.BOOK_COLUMNS.split(', ')
+
+
+class _StringColumn:
+    """
+    Dictionary-encoded strings. The ASCII-lowered form of every distinct value
+    is kept in one separator-joined blob, so a substring or prefix search is a
+    single C-level scan plus a ``searchsorted`` that maps hits back to codes.
+    """
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._blob: str = _SEPARATOR
+        self._starts = np.empty(0, dtype=np.int64)
+        self._pending: List[str] = []
+
+    def intern(self, value: str) -> int:
+        code: Optional[int] = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self._codes[value] = code
+            self._pending.append(value.translate(_ASCII_LOWER))
+        return code
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        lengths = np.fromiter((len(value) + 1 for value in self._pending), dtype=np.int64, count=len(self._pending))
+        starts = len(self._blob) + np.concatenate((np.zeros(1, dtype=np.int64), np.cumsum(lengths)[:-1]))
+        self._blob += _SEPARATOR.join(self._pending) + _SEPARATOR
+        self._starts = np.concatenate((self._starts, starts))
+        self._pending = []
+
+    def matching_codes(self, needle: str, prefix: bool):
+        """Boolean array over codes: which distinct values contain (or start with) ``needle``"""
+        self._flush()
+        pattern: str = needle.translate(_ASCII_LOWER)
+        if prefix:
+            pattern = _SEPARATOR + pattern
+        positions = np.fromiter((match.start() for match in re.finditer(re.escape(pattern), self._blob)),
+                                dtype=np.int64)
+        if prefix:
+            positions += 1
+
+        flags = np.zeros(len(self.values), dtype=bool)
+        if positions.size:
+            flags[np.searchsorted(self._starts, positions, side='right') - 1] = True
+        return flags
+
+
+class ColumnarCatalog:
+    """
+    Optional in-memory read engine for ``BookPagination.paginate``.
+
+    ``books`` is held as NumPy column arrays (ids, years, created_at seconds,
+    versions, and dictionary codes for title and author), so filters, the
+    ``created_at DESC, id DESC`` ordering and paging are vectorized masks and
+    index arithmetic. Each query first compares ``book_stats.generation``; when
+    it moved, only the rows listed in ``book_changes`` since the last applied
+    sequence are re-read, which covers writes from every process.
+    """
+
+    _INITIAL_CAPACITY: int = 1024
+
+    def __init__(self, enabled: bool) -> None:
+        self.enabled: bool = enabled and np is not None
+        self._lock: threading.Lock = threading.Lock()
+        self._pid: Optional[int] = None
+
+    def _reset_state(self) -> None:
+        self._pid = os.getpid()
+        self._size: int = 0
+        self._ids = np.empty(self._INITIAL_CAPACITY, dtype=np.int64)
+        self._years = np.empty(self._INITIAL_CAPACITY, dtype=np.int32)
+        self._created = np.empty(self._INITIAL_CAPACITY, dtype=np.int64)
+        self._versions = np.empty(self._INITIAL_CAPACITY, dtype=np.int64)
+        self._title_codes = np.empty(self._INITIAL_CAPACITY, dtype=np.int32)
+        self._author_codes = np.empty(self._INITIAL_CAPACITY, dtype=np.int32)
+        self._alive = np.zeros(self._INITIAL_CAPACITY, dtype=bool)
+        self._isbns: List[Optional[str]] = []
+        self._created_at: List[str] = []
+        self._updated_at: List[Optional[str]] = []
+        self._timestamps: Dict[str, str] = {}
+        self._titles: _StringColumn = _StringColumn()
+        self._authors: _StringColumn = _StringColumn()
+        self._order = None
+        self._last_seq: int = 0
+        self._generation: Optional[int] = None
+
+    def _grow(self, needed: int) -> None:
+        capacity: int = len(self._ids)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ('_ids', '_years', '_created', '_versions', '_title_codes', '_author_codes', '_alive'):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            setattr(self, name, grown)
+
+    def _timestamp(self, value: Optional[str]) -> Optional[str]:
+        return self._timestamps.setdefault(value, value) if value is not None else None
+
+    def _append(self, rows: List[Any]) -> None:
+        start: int = self._size
+        end: int = start + len(rows)
+        self._grow(end)
+
+        self._ids[start:end] = [row['id'] for row in rows]
+        self._years[start:end] = [row['year'] or 0 for row in rows]
+        self._created[start:end] = np.array([row['created_at'] for row in rows], dtype='datetime64[s]').astype(np.int64)
+        self._versions[start:end] = [row['version'] for row in rows]
+        self._title_codes[start:end] = [self._titles.intern(row['title']) for row in rows]
+        self._author_codes[start:end] = [self._authors.intern(row['author']) for row in rows]
+        self._alive[start:end] = True
+        self._isbns.extend(row['isbn'] for row in rows)
+        self._created_at.extend(self._timestamp(row['created_at']) for row in rows)
+        self._updated_at.extend(self._timestamp(row['updated_at']) for row in rows)
+        self._size = end
+
+    def _replace(self, position: int, row: Any) -> None:
+        self._years[position] = row['year'] or 0
+        self._created[position] = np.datetime64(row['created_at'], 's').astype(np.int64)
+        self._versions[position] = row['version']
+        self._title_codes[position] = self._titles.intern(row['title'])
+        self._author_codes[position] = self._authors.intern(row['author'])
+        self._alive[position] = True
+        self._isbns[position] = row['isbn']
+        self._created_at[position] = self._timestamp(row['created_at'])
+        self._updated_at[position] = self._timestamp(row['updated_at'])
+
+    def _position(self, book_id: int) -> Optional[int]:
+        # AUTOINCREMENT ids only grow and rows are appended in id order, so ids stay sorted.
+        position: int = int(np.searchsorted(self._ids[:self._size], book_id))
+        if position < self._size and self._ids[position] == book_id:
+            return position
+        return None
+
+    def _load(self) -> None:
+        self._reset_state()
+        with db_connection() as conn:
+            self._generation = conn.execute(db_queries.BookQueries.SELECT_BOOK_STATS).fetchone()['generation']
+            self._last_seq = conn.execute(db_queries.BookQueries.SELECT_LAST_CHANGE_SEQ).fetchone()['seq']
+            cursor = conn.execute(db_queries.BookQueries.SELECT_BOOKS_BASE + db_queries.BookQueries.EXPORT_SUFFIX)
+            while True:
+                rows: List[Any] = cursor.fetchmany(COLUMNAR_LOAD_BATCH_SIZE)
+                if not rows:
+                    break
+                self._append(rows)
+
+    def _apply_changes(self, rows: List[Any]) -> bool:
+        appended: List[Any] = []
+        for row in rows:
+            position: Optional[int] = self._position(row['book_id'])
+            if row['deleted']:
+                if position is not None:
+                    self._alive[position] = False
+            elif position is not None:
+                self._replace(position, row)
+            elif not self._size or row['book_id'] > self._ids[self._size - 1]:
+                appended.append(row)
+            else:
+                return False
+        appended.sort(key=lambda row: row['book_id'])
+        if appended:
+            self._append(appended)
+        return True
+
+    def _refresh(self) -> None:
+        if self._pid != os.getpid():
+            self._load()
+            return
+
+        complete: bool = True
+        with db_connection() as conn:
+            generation: int = conn.execute(db_queries.BookQueries.SELECT_BOOK_STATS).fetchone()['generation']
+            if generation == self._generation:
+                return
+            while complete:
+                rows: List[Any] = conn.execute(
+                    db_queries.BookQueries.SELECT_CHANGES_SINCE,
+                    (self._last_seq, CHANGES_MAX_LIMIT)
+                ).fetchall()
+                if not rows:
+                    break
+                complete = self._apply_changes(rows)
+                self._last_seq = rows[-1]['seq']
+
+        if not complete:
+            # A book appeared below the highest loaded id, so positions can no longer be appended in order.
+            self._load()
+            return
+        self._generation = generation
+        self._order = None
+
+    def _sorted_positions(self):
+        """Positions of live rows in ``created_at DESC, id DESC`` order, rebuilt after each refresh"""
+        if self._order is None:
+            size: int = self._size
+            order = np.lexsort((self._ids[:size], self._created[:size]))[::-1]
+            self._order = order[self._alive[order]]
+        return self._order
+
+    def _book(self, position: int) -> Dict[str, Any]:
+        year: int = int(self._years[position])
+        return dict(zip(BOOK_COLUMNS, (
+            int(self._ids[position]),
+            self._titles.values[self._title_codes[position]],
+            self._authors.values[self._author_codes[position]],
+            year or None,
+            self._isbns[position],
+            self._created_at[position],
+            self._updated_at[position],
+            int(self._versions[position])
+        )))
+
+    def can_answer(self, author: Optional[str], title: Optional[str], match: str) -> bool:
+        if not self.enabled:
+            return False
+        # Contains filters go through SQL LIKE, where % and _ are wildcards rather than literals.
+        return match != MATCH_CONTAINS or not any(value and ('%' in value or '_' in value) for value in (author, title))
+
+    def paginate(
+        self,
+        page: int = 1,
+        per_page: int = 10,
+        author: Optional[str] = None,
+        year: Optional[int] = None,
+        title: Optional[str] = None,
+        match: str = MATCH_CONTAINS,
+        count: str = COUNT_EXACT
+    ) -> Dict[str, Any]:
+        # Every count mode is exact here: the selection already holds every match.
+        with self._lock:
+            self._refresh()
+
+            size: int = self._size
+            prefix: bool = match == MATCH_PREFIX
+            mask = None
+            if author:
+                mask = self._authors.matching_codes(author, prefix)[self._author_codes[:size]]
+            if year:
+                year_mask = self._years[:size] == year
+                mask = year_mask if mask is None else mask & year_mask
+            if title:
+                title_mask = self._titles.matching_codes(title, prefix)[self._title_codes[:size]]
+                mask = title_mask if mask is None else mask & title_mask
+
+            order = self._sorted_positions()
+            selected = order if mask is None else order[mask[order]]
+            offset: int = (page - 1) * per_page
+            books: List[Dict[str, Any]] = [self._book(int(position)) for position in selected[offset:offset + per_page]]
+
+        total_count: Optional[int] = None if count == COUNT_NONE else int(selected.size)
+        if total_count is None:
+            total_pages: Optional[int] = None
+        else:
+            total_pages = (total_count + per_page - 1) // per_page if total_count > 0 else 0
+
+        return {
+            'books': books,
+            'total': total_count,
+            'page': page,
+            'per_page': per_page,
+            'total_pages': total_pages,
+            'has_more': int(selected.size) > offset + per_page,
+            'count': count,
+            'filters': {
+                'author': author,
+                'year': year,
+                'title': title,
+                'match': match
+            }
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._pid is None:
+                return {'enabled': self.enabled, 'rows': 0}
+            return {
+                'enabled': self.enabled,
+                'rows': int(self._alive[:self._size].sum()),
+                'distinct_titles': len(self._titles.values),
+                'distinct_authors': len(self._authors.values),
+                'last_seq': self._last_seq
+            }
+
+
+columnar_catalog: ColumnarCatalog = ColumnarCatalog(
+    enabled=os.getenv('BOOK_READ_ENGINE', BOOK_READ_ENGINE) == READ_ENGINE_COLUMNAR
+)
@@ -0,0 +1,55 @@
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple, Any, Dict
+from chalicelib.constants.api import COUNT_CACHE_MAX_ENTRIES
+
+CountKey = Tuple[str, Tuple[Any, ...]]
+
+
+class BookCountCache:
+    """
+    LRU of ``COUNT(*)`` results keyed by filter signature.
+
+    Each entry remembers the ``book_stats.generation`` it was computed at. The
+    triggers behind that counter bump it on every write to ``books``, so an
+    entry from an older generation is stale for exact counts but still usable
+    as an estimate.
+    """
+
+    _entries: 'OrderedDict[CountKey, Tuple[int, int]]' = OrderedDict()
+    _lock: threading.Lock = threading.Lock()
+    _hits: int = 0
+    _misses: int = 0
+
+    @staticmethod
+    def get(key: CountKey, generation: Optional[int] = None) -> Optional[int]:
+        with BookCountCache._lock:
+            entry: Optional[Tuple[int, int]] = BookCountCache._entries.get(key)
+            if entry is None or (generation is not None and entry[0] != generation):
+                BookCountCache._misses += 1
+                return None
+            BookCountCache._entries.move_to_end(key)
+            BookCountCache._hits += 1
+            return entry[1]
+
+    @staticmethod
+    def set(key: CountKey, generation: int, count: int) -> None:
+        with BookCountCache._lock:
+            BookCountCache._entries[key] = (generation, count)
+            BookCountCache._entries.move_to_end(key)
+            while len(BookCountCache._entries) > COUNT_CACHE_MAX_ENTRIES:
+                BookCountCache._entries.popitem(last=False)
+
+    @staticmethod
+    def clear() -> None:
+        with BookCountCache._lock:
+            BookCountCache._entries.clear()
+
+    @staticmethod
+    def stats() -> Dict[str, int]:
+        with BookCountCache._lock:
+            return {
+                'entries': len(BookCountCache._entries),
+                'hits': BookCountCache._hits,
+                'misses': BookCountCache._misses
+            }
@@ -0,0 +1,251 @@
+import bisect
+import heapq
+import os
+import string
+import threading
+from typing import Optional, Dict, List, Any, Tuple
+from chalicelib.database.db import db_connection
+from chalicelib.constants import db_queries
+from chalicelib.pagination.trigram_index import TrigramIndex
+from chalicelib.constants.api import (
+    SUGGEST_FIELD_TITLE,
+    SUGGEST_FIELD_AUTHOR,
+    SUGGEST_DEFAULT_LIMIT,
+    SUGGEST_MAX_LIMIT,
+    SUGGEST_TOP_CACHE_MIN_MATCHES,
+    CHANGES_MAX_LIMIT,
+    SUGGEST_RELOAD_CHANGES,
+    COLUMNAR_LOAD_BATCH_SIZE
+)
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+_MAX_CHAR = chr(0x10FFFF)
+
+Entry = Tuple[str, str]
+
+
+class PrefixIndex:
+    """
+    Distinct values kept sorted by their ASCII-lowered form (the folding the
+    ``*_lc`` columns use), each with the number of books carrying it.
+
+    A prefix lookup bisects to the range of matching values and returns the
+    ``limit`` with the most books, ties in alphabetical order. Small ranges
+    are ranked on the spot with a bounded heap. Prefixes matching more than
+    ``SUGGEST_TOP_CACHE_MIN_MATCHES`` values (the first keystrokes) keep their
+    best ``2 * SUGGEST_MAX_LIMIT`` cached. Every value outside such a list
+    ranks below its last entry, so writes re-rank the lists in place: a raised
+    count may enter a list, and a lowered one leaves it once it falls below
+    the last entry. A list that shrinks under ``SUGGEST_MAX_LIMIT`` is
+    recomputed on the next lookup.
+    """
+
+    TOP_SIZE: int = 2 * SUGGEST_MAX_LIMIT
+
+    def __init__(self, values: Optional[Dict[str, int]] = None) -> None:
+        self._counts: Dict[str, int] = dict(values or {})
+        self._entries: List[Entry] = sorted((value.translate(_ASCII_LOWER), value) for value in self._counts)
+        self._top: Dict[str, List[Entry]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _rank(self, entry: Entry) -> Tuple[int, str, str]:
+        return -self._counts[entry[1]], entry[0], entry[1]
+
+    def _raised(self, entry: Entry) -> None:
+        for length in range(len(entry[0]) + 1):
+            top: Optional[List[Entry]] = self._top.get(entry[0][:length])
+            if top is None:
+                continue
+            if entry not in top:
+                if self._rank(entry) > self._rank(top[-1]):
+                    continue
+                top.append(entry)
+            top.sort(key=self._rank)
+            del top[PrefixIndex.TOP_SIZE:]
+
+    def _lowered(self, entry: Entry) -> None:
+        for length in range(len(entry[0]) + 1):
+            top: Optional[List[Entry]] = self._top.get(entry[0][:length])
+            if top is None or entry not in top:
+                continue
+            top.remove(entry)
+            # Only a value still ranked above the rest of the list is known to beat every value outside it.
+            if entry[1] in self._counts and top and self._rank(entry) < self._rank(top[-1]):
+                top.append(entry)
+                top.sort(key=self._rank)
+            if len(top) < SUGGEST_MAX_LIMIT:
+                del self._top[entry[0][:length]]
+
+    def add(self, value: str) -> bool:
+        """Count one more book with ``value``; True when the value is new"""
+        count: int = self._counts.get(value, 0)
+        self._counts[value] = count + 1
+        entry: Entry = (value.translate(_ASCII_LOWER), value)
+        if not count:
+            bisect.insort(self._entries, entry)
+        self._raised(entry)
+        return not count
+
+    def remove(self, value: str) -> bool:
+        """Count one book fewer with ``value``; True when no book has it any more"""
+        count: int = self._counts.get(value, 0)
+        if not count:
+            return False
+        entry: Entry = (value.translate(_ASCII_LOWER), value)
+        if count > 1:
+            self._counts[value] = count - 1
+        else:
+            del self._counts[value]
+            position: int = bisect.bisect_left(self._entries, entry)
+            if position < len(self._entries) and self._entries[position] == entry:
+                del self._entries[position]
+        self._lowered(entry)
+        return count == 1
+
+    def values(self) -> List[str]:
+        return list(self._counts)
+
+    def complete(self, prefix: str, limit: int) -> List[Dict[str, Any]]:
+        folded: str = prefix.translate(_ASCII_LOWER)
+        start: int = bisect.bisect_left(self._entries, (folded,))
+        end: int = bisect.bisect_left(self._entries, (folded + _MAX_CHAR,), start)
+
+        ranked: Optional[List[Entry]] = self._top.get(folded)
+        if ranked is None:
+            if end - start <= SUGGEST_TOP_CACHE_MIN_MATCHES:
+                ranked = heapq.nsmallest(limit, self._entries[start:end], key=self._rank)
+            else:
+                ranked = self._top[folded] = heapq.nsmallest(
+                    PrefixIndex.TOP_SIZE, self._entries[start:end], key=self._rank
+                )
+        return [{'value': value, 'count': self._counts[value]} for _, value in ranked[:limit]]
+
+
+class BookSuggestIndex:
+    """
+    In-memory autocomplete and fuzzy word lookup over book titles and authors.
+
+    Built once from ``books``, then kept current from the ``book_changes``
+    log: each lookup compares ``book_stats.generation`` and, when it moved,
+    re-reads only the books changed since the last applied sequence. The
+    title/author last seen for every book id lets an update or delete retract
+    the old values, so writes from any process are reflected on the next call.
+    The trigram vocabulary is built on the first fuzzy lookup and follows the
+    distinct values, so it only changes when a title or author appears or
+    disappears. A backlog of more than ``SUGGEST_RELOAD_CHANGES`` changes is
+    cheaper to rebuild than to apply one sorted insert at a time.
+    """
+
+    _lock: threading.Lock = threading.Lock()
+    _pid: Optional[int] = None
+    _generation: Optional[int] = None
+    _last_seq: int = 0
+    _books: Dict[int, Tuple[str, str]] = {}
+    _indexes: Dict[str, PrefixIndex] = {}
+    _words: Optional[TrigramIndex] = None
+
+    @staticmethod
+    def _load() -> None:
+        books: Dict[int, Tuple[str, str]] = {}
+        titles: Dict[str, int] = {}
+        authors: Dict[str, int] = {}
+        with db_connection() as conn:
+            generation: int = conn.execute(db_queries.BookQueries.SELECT_BOOK_STATS).fetchone()['generation']
+            last_seq: int = conn.execute(db_queries.BookQueries.SELECT_LAST_CHANGE_SEQ).fetchone()['seq']
+            cursor = conn.execute(db_queries.BookQueries.SELECT_SUGGEST_SOURCE)
+            while True:
+                rows: List[Any] = cursor.fetchmany(COLUMNAR_LOAD_BATCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    books[row['id']] = (row['title'], row['author'])
+                    titles[row['title']] = titles.get(row['title'], 0) + 1
+                    authors[row['author']] = authors.get(row['author'], 0) + 1
+
+        BookSuggestIndex._pid = os.getpid()
+        BookSuggestIndex._generation = generation
+        BookSuggestIndex._last_seq = last_seq
+        BookSuggestIndex._books = books
+        BookSuggestIndex._indexes = {
+            SUGGEST_FIELD_TITLE: PrefixIndex(titles),
+            SUGGEST_FIELD_AUTHOR: PrefixIndex(authors)
+        }
+        BookSuggestIndex._words = None
+
+    @staticmethod
+    def _apply(row: Any) -> None:
+        titles: PrefixIndex = BookSuggestIndex._indexes[SUGGEST_FIELD_TITLE]
+        authors: PrefixIndex = BookSuggestIndex._indexes[SUGGEST_FIELD_AUTHOR]
+        words: Optional[TrigramIndex] = BookSuggestIndex._words
+
+        previous: Optional[Tuple[str, str]] = BookSuggestIndex._books.pop(row['book_id'], None)
+        if previous is not None:
+            for index, value in ((titles, previous[0]), (authors, previous[1])):
+                if index.remove(value) and words is not None:
+                    words.remove_text(value)
+        if not row['deleted'] and row['title'] is not None:
+            BookSuggestIndex._books[row['book_id']] = (row['title'], row['author'])
+            for index, value in ((titles, row['title']), (authors, row['author'])):
+                if index.add(value) and words is not None:
+                    words.add_text(value)
+
+    @staticmethod
+    def _refresh() -> None:
+        if BookSuggestIndex._pid != os.getpid():
+            BookSuggestIndex._load()
+            return
+
+        with db_connection() as conn:
+            generation: int = conn.execute(db_queries.BookQueries.SELECT_BOOK_STATS).fetchone()['generation']
+            if generation == BookSuggestIndex._generation:
+                return
+            last_seq: int = conn.execute(db_queries.BookQueries.SELECT_LAST_CHANGE_SEQ).fetchone()['seq']
+            reload: bool = last_seq - BookSuggestIndex._last_seq > SUGGEST_RELOAD_CHANGES
+            while not reload:
+                rows: List[Any] = conn.execute(
+                    db_queries.BookQueries.SELECT_CHANGES_SINCE,
+                    (BookSuggestIndex._last_seq, CHANGES_MAX_LIMIT)
+                ).fetchall()
+                if not rows:
+                    break
+                for row in rows:
+                    BookSuggestIndex._apply(row)
+                BookSuggestIndex._last_seq = rows[-1]['seq']
+
+        if reload:
+            BookSuggestIndex._load()
+            return
+        BookSuggestIndex._generation = generation
+
+    @staticmethod
+    def suggest(field: str, prefix: str, limit: int = SUGGEST_DEFAULT_LIMIT) -> Dict[str, Any]:
+        with BookSuggestIndex._lock:
+            BookSuggestIndex._refresh()
+            suggestions: List[Dict[str, Any]] = BookSuggestIndex._indexes[field].complete(prefix, limit)
+        return {'field': field, 'prefix': prefix, 'suggestions': suggestions}
+
+    @staticmethod
+    def similar_words(term: str, threshold: float, limit: int) -> List[Tuple[str, float, List[str]]]:
+        """Catalog words resembling ``term``, see ``TrigramIndex.lookup``"""
+        with BookSuggestIndex._lock:
+            BookSuggestIndex._refresh()
+            if BookSuggestIndex._words is None:
+                words: TrigramIndex = TrigramIndex()
+                for index in BookSuggestIndex._indexes.values():
+                    for value in index.values():
+                        words.add_text(value)
+                BookSuggestIndex._words = words
+            return BookSuggestIndex._words.lookup(term, threshold, limit)
+
+    @staticmethod
+    def stats() -> Dict[str, int]:
+        with BookSuggestIndex._lock:
+            return {
+                'books': len(BookSuggestIndex._books),
+                'titles': len(BookSuggestIndex._indexes.get(SUGGEST_FIELD_TITLE, ())),
+                'authors': len(BookSuggestIndex._indexes.get(SUGGEST_FIELD_AUTHOR, ())),
+                'words': len(BookSuggestIndex._words or ()),
+                'last_seq': BookSuggestIndex._last_seq
+            }
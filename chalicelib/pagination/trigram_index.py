@@ -0,0 +1,103 @@
+import math
+import re
+import unicodedata
+from typing import Optional, Dict, List, Set, Tuple
+from chalicelib.constants.api import FULL_TEXT_MIN_TERM_LENGTH
+
+_WORD = re.compile(r'\w+')
+
+
+def fold(text: str) -> str:
+    """Case- and accent-insensitive form: "Brontë" and "BRONTE" both fold to "bronte" """
+    if text.isascii():
+        return text.lower()
+    decomposed: str = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def trigrams(word: str) -> Set[str]:
+    # Padded like pg_trgm, so word starts weigh more than word ends.
+    padded: str = '  ' + word + ' '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(left: Set[str], right: Set[str]) -> float:
+    shared: int = len(left & right)
+    return shared / (len(left) + len(right) - shared) if shared else 0.0
+
+
+def tokenize(text: str) -> List[Tuple[str, str]]:
+    """``(folded, spelling)`` for every indexable word; the spelling is what the FTS table can match"""
+    tokens: List[Tuple[str, str]] = []
+    for token in _WORD.findall(text):
+        folded: str = fold(token)
+        if len(folded) >= FULL_TEXT_MIN_TERM_LENGTH and len(token) >= FULL_TEXT_MIN_TERM_LENGTH:
+            tokens.append((folded, token.lower()))
+    return tokens
+
+
+class TrigramIndex:
+    """
+    Vocabulary of folded words with an inverted index from trigram to words.
+
+    Words are reference-counted per indexed text, so removing a title or
+    author retracts exactly what adding it contributed. A lookup only reads
+    the posting lists of the query's own trigrams, and by prefix filtering
+    only the shortest of them, so its cost follows how common those trigrams
+    are rather than the size of the catalog.
+    """
+
+    def __init__(self) -> None:
+        self._spellings: Dict[str, Dict[str, int]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._spellings)
+
+    def add_text(self, text: str) -> None:
+        for folded, spelling in tokenize(text):
+            spellings: Optional[Dict[str, int]] = self._spellings.get(folded)
+            if spellings is None:
+                spellings = self._spellings[folded] = {}
+                for trigram in trigrams(folded):
+                    self._postings.setdefault(trigram, set()).add(folded)
+            spellings[spelling] = spellings.get(spelling, 0) + 1
+
+    def remove_text(self, text: str) -> None:
+        for folded, spelling in tokenize(text):
+            spellings: Optional[Dict[str, int]] = self._spellings.get(folded)
+            if spellings is None or spelling not in spellings:
+                continue
+            spellings[spelling] -= 1
+            if spellings[spelling]:
+                continue
+            del spellings[spelling]
+            if spellings:
+                continue
+            del self._spellings[folded]
+            for trigram in trigrams(folded):
+                words: Optional[Set[str]] = self._postings.get(trigram)
+                if words is not None:
+                    words.discard(folded)
+                    if not words:
+                        del self._postings[trigram]
+
+    def lookup(self, term: str, threshold: float, limit: int) -> List[Tuple[str, float, List[str]]]:
+        """Up to ``limit`` ``(word, similarity, spellings)`` with similarity >= ``threshold``, best first"""
+        query: Set[str] = trigrams(fold(term))
+        # similarity >= threshold needs at least this many shared trigrams, so any match must
+        # appear in one of the len(query) - required + 1 shortest posting lists.
+        required: int = max(1, math.ceil(threshold * len(query)))
+        postings: List[Set[str]] = sorted((self._postings.get(trigram, set()) for trigram in query), key=len)
+
+        candidates: Set[str] = set()
+        for words in postings[:len(query) - required + 1]:
+            candidates.update(words)
+
+        matches: List[Tuple[str, float, List[str]]] = []
+        for word in candidates:
+            score: float = similarity(query, trigrams(word))
+            if score >= threshold:
+                matches.append((word, score, sorted(self._spellings[word])))
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches[:limit]
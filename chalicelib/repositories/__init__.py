@@ -1,4 +1,5 @@
 from .user_repository import UserRepository
 from .book_repository import BookRepository
+from .auth_token_repository import AuthTokenRepository
 
-__all__ = ['UserRepository', 'BookRepository']
+__all__ = ['UserRepository', 'BookRepository', 'AuthTokenRepository']
@@ -0,0 +1,29 @@
+from typing import List, Dict, Any
+from chalicelib.database.db import db_connection
+from chalicelib.constants import db_queries
+
+
+class AuthTokenRepository:
+
+    @staticmethod
+    def revoke(user_id: int, jti: str, expires_at: int) -> None:
+        with db_connection() as conn:
+            conn.execute(
+                db_queries.AuthTokenQueries.INSERT_REVOKED_TOKEN,
+                (user_id, jti, expires_at)
+            )
+
+    @staticmethod
+    def find_revoked_since(last_id: int, now: int) -> List[Dict[str, Any]]:
+        with db_connection() as conn:
+            rows = conn.execute(
+                db_queries.AuthTokenQueries.SELECT_REVOKED_SINCE,
+                (last_id, now)
+            ).fetchall()
+            return [dict(row) for row in rows]
+
+    @staticmethod
+    def delete_expired(now: int) -> int:
+        with db_connection() as conn:
+            cursor = conn.execute(db_queries.AuthTokenQueries.DELETE_EXPIRED_TOKENS, (now,))
+            return cursor.rowcount
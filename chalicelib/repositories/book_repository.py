@@ -1,6 +1,8 @@
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
 from chalicelib.database.db import db_connection
 from chalicelib.constants import db_queries
+from chalicelib.utils.response_cache import ResponseCache
+from chalicelib.constants.api import SQLITE_MAX_VARIABLES
 
 
 class BookRepository:
@@ -14,7 +16,56 @@ class BookRepository:
                 (title, author, year, isbn)
             )
             book_id: int = cursor.lastrowid
-            return book_id
+        ResponseCache.invalidate()
+        return book_id
+
+    @staticmethod
+    def create_many(books: List[Tuple[str, str, Optional[int], Optional[str]]]) -> List[int]:
+        if not books:
+            return []
+
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(db_queries.BookQueries.INSERT_BOOK, books)
+            last_id: int = cursor.execute(db_queries.BookQueries.LAST_INSERT_ID).fetchone()['id']
+        ResponseCache.invalidate()
+        # The write lock is held for the whole executemany, so AUTOINCREMENT ids are contiguous.
+        return list(range(last_id - len(books) + 1, last_id + 1))
+
+    @staticmethod
+    def import_batch(
+        books: List[Tuple[str, str, Optional[int], Optional[str]]],
+        source: Optional[str] = None,
+        checkpoint: Optional[Dict[str, int]] = None,
+        finished: bool = False
+    ) -> int:
+        """Insert a batch and, when given, its import checkpoint in one transaction, so both land or neither does.
+        The last batch of an import removes the checkpoint instead."""
+        with db_connection() as conn:
+            if books:
+                conn.executemany(db_queries.BookQueries.INSERT_BOOK, books)
+            if source is not None and finished:
+                conn.execute(db_queries.ImportQueries.DELETE_CHECKPOINT, (source,))
+            elif source is not None and checkpoint is not None:
+                conn.execute(db_queries.ImportQueries.UPSERT_CHECKPOINT, (
+                    source, checkpoint['byte_offset'], checkpoint['record'], checkpoint['imported'],
+                    checkpoint['rejected'], checkpoint['rejects_offset'],
+                    checkpoint.get('file_size'), checkpoint.get('file_mtime_ns')
+                ))
+        if books:
+            ResponseCache.invalidate()
+        return len(books)
+
+    @staticmethod
+    def find_import_checkpoint(source: str) -> Optional[Dict[str, int]]:
+        with db_connection() as conn:
+            row = conn.execute(db_queries.ImportQueries.SELECT_CHECKPOINT, (source,)).fetchone()
+            return dict(row) if row else None
+
+    @staticmethod
+    def delete_import_checkpoint(source: str) -> None:
+        with db_connection() as conn:
+            conn.execute(db_queries.ImportQueries.DELETE_CHECKPOINT, (source,))
 
     @staticmethod
     def find_all() -> List[Dict[str, Any]]:
@@ -33,40 +84,56 @@ class BookRepository:
             ).fetchone()
             return dict(book) if book else None
 
+    @staticmethod
+    def find_by_ids(book_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Books keyed by id, fetched on one connection in chunks that fit SQLite's variable limit"""
+        unique_ids: List[int] = list(dict.fromkeys(book_ids))
+        books: Dict[int, Dict[str, Any]] = {}
+        with db_connection() as conn:
+            for start in range(0, len(unique_ids), SQLITE_MAX_VARIABLES):
+                chunk: List[int] = unique_ids[start:start + SQLITE_MAX_VARIABLES]
+                query: str = db_queries.BookQueries.SELECT_BOOKS_BY_IDS.format(placeholders=', '.join('?' * len(chunk)))
+                for row in conn.execute(query, chunk).fetchall():
+                    books[row['id']] = dict(row)
+        return books
+
     @staticmethod
     def update(
         book_id: int,
         title: Optional[str] = None,
         author: Optional[str] = None,
         year: Optional[int] = None,
-        isbn: Optional[str] = None
-    ) -> bool:
-        with db_connection() as conn:
-            cursor = conn.cursor()
+        isbn: Optional[str] = None,
+        expected_version: Optional[int] = None
+    ) -> Optional[int]:
+        """Apply the non-None fields and return the new version, or None if no row matched"""
+        params: List[Any] = [title, author, year, isbn, book_id]
+        query: str = db_queries.BookQueries.UPDATE_BOOK
+        if expected_version is not None:
+            query = db_queries.BookQueries.UPDATE_BOOK_IF_VERSION
+            params.append(expected_version)
 
-            book = cursor.execute(db_queries.BookQueries.SELECT_BOOK_BY_ID, (book_id,)).fetchone()
-            if not book:
-                return False
+        with db_connection() as conn:
+            row = conn.execute(query + db_queries.BookQueries.UPDATE_RETURNING_VERSION, params).fetchone()
+        if row:
+            ResponseCache.invalidate()
+        return row['version'] if row else None
 
-            update_title: str = title if title is not None else book['title']
-            update_author: str = author if author is not None else book['author']
-            update_year: Optional[int] = year if year is not None else book['year']
-            update_isbn: Optional[str] = isbn if isbn is not None else book['isbn']
+    @staticmethod
+    def get_generation() -> int:
+        with db_connection() as conn:
+            return conn.execute(db_queries.BookQueries.SELECT_BOOK_STATS).fetchone()['generation']
 
-            cursor.execute(
-                db_queries.BookQueries.UPDATE_BOOK,
-                (update_title, update_author, update_year, update_isbn, book_id)
-            )
-            return True
+    @staticmethod
+    def find_version(book_id: int) -> Optional[int]:
+        with db_connection() as conn:
+            row = conn.execute(db_queries.BookQueries.SELECT_BOOK_VERSION, (book_id,)).fetchone()
+            return row['version'] if row else None
 
     @staticmethod
     def delete(book_id: int) -> bool:
         with db_connection() as conn:
-            cursor = conn.cursor()
-
-            book = cursor.execute(db_queries.BookQueries.SELECT_BOOK_BY_ID, (book_id,)).fetchone()
-            if not book:
-                return False
-
-            cursor.execute(db_queries.BookQueries.DELETE_BOOK, (book_id,))
-            return True
+            deleted: bool = conn.execute(db_queries.BookQueries.DELETE_BOOK, (book_id,)).rowcount > 0
+        if deleted:
+            ResponseCache.invalidate()
+        return deleted
@@ -0,0 +1,212 @@
+import csv
+import gzip
+import json
+import os
+import time
+from typing import Optional, Dict, List, Any, Tuple, Iterator, Iterable, BinaryIO, Callable
+from pydantic import ValidationError
+from chalicelib.models import book_model
+from chalicelib.repositories.book_repository import BookRepository
+from chalicelib.utils.validators import format_validation_errors
+from chalicelib.constants.api import (
+    IMPORT_FORMAT_CSV,
+    IMPORT_FORMAT_NDJSON,
+    IMPORT_BATCH_SIZE,
+    IMPORT_PROGRESS_SECONDS
+)
+
+# (record number, byte offset just past the record, parsed record or None, raw text when unparseable)
+SourceRecord = Tuple[int, int, Any, Optional[str]]
+BookRow = Tuple[str, str, Optional[int], Optional[str]]
+
+
+class BookImport:
+    """
+    Streams books from a CSV or NDJSON file into ``books``.
+
+    Records are validated with the same ``BookCreate`` model as the API and
+    inserted with one ``executemany`` per batch. Each batch commits together
+    with the checkpoint for the file (byte offset, counters, the size of the
+    rejects file and the file's size and mtime), so a run that crashes resumes
+    exactly after the last committed batch without duplicating or skipping
+    books. The last batch deletes the checkpoint, so a finished file is
+    imported from the start the next time.
+    """
+
+    @staticmethod
+    def detect_format(path: str) -> str:
+        name: str = path[:-3] if path.endswith('.gz') else path
+        return IMPORT_FORMAT_CSV if name.lower().endswith('.csv') else IMPORT_FORMAT_NDJSON
+
+    @staticmethod
+    def _open(path: str) -> BinaryIO:
+        return gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')
+
+    @staticmethod
+    def _read_ndjson(stream: BinaryIO, offset: int, record: int) -> Iterator[SourceRecord]:
+        for raw in stream:
+            offset += len(raw)
+            record += 1
+            text: str = raw.decode('utf-8', errors='replace').strip()
+            if not text:
+                continue
+            try:
+                yield record, offset, json.loads(text), None
+            except ValueError:
+                yield record, offset, None, text
+
+    @staticmethod
+    def _read_csv(stream: BinaryIO, offset: int, record: int) -> Iterator[SourceRecord]:
+        header_line: bytes = stream.readline()
+        header: List[str] = [name.strip().lower() for name in next(csv.reader([header_line.decode('utf-8-sig')]))]
+        position: List[int] = [max(offset, len(header_line))]
+        if offset > len(header_line):
+            stream.seek(offset)
+
+        def lines() -> Iterator[str]:
+            # csv.reader pulls lines only as a record needs them, so after each record
+            # position[0] is the offset just past it, even for quoted multi-line fields.
+            for raw in stream:
+                position[0] += len(raw)
+                yield raw.decode('utf-8', errors='replace')
+
+        for row in csv.reader(lines()):
+            record += 1
+            if not any(value.strip() for value in row):
+                continue
+            if len(row) != len(header):
+                yield record, position[0], None, ','.join(row)
+                continue
+            yield record, position[0], {name: value for name, value in zip(header, row)}, None
+
+    @staticmethod
+    def _validate(item: Any) -> Tuple[Optional[BookRow], Optional[List[Dict[str, Any]]]]:
+        if not isinstance(item, dict):
+            return None, [{'field': '', 'message': 'Book must be a JSON object', 'type': 'type_error'}]
+        # CSV has no null; an empty optional column means the value is absent.
+        data: Dict[str, Any] = {
+            key: value for key, value in item.items()
+            if not (key in ('year', 'isbn') and isinstance(value, str) and not value.strip())
+        }
+        try:
+            book: book_model.BookCreate = book_model.BookCreate(**data)
+        except ValidationError as e:
+            return None, format_validation_errors(e)
+        return (book.title, book.author, book.year, book.isbn), None
+
+    @staticmethod
+    def import_records(
+        records: Iterable[SourceRecord],
+        batch_size: int = IMPORT_BATCH_SIZE,
+        rejects: Optional[BinaryIO] = None,
+        source: Optional[str] = None,
+        state: Optional[Dict[str, int]] = None,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        file_identity: Optional[Dict[str, int]] = None
+    ) -> Dict[str, Any]:
+        """Validate and insert ``records`` in batches; with ``source`` every batch also commits a checkpoint"""
+        state = dict(state or {'byte_offset': 0, 'record': 0, 'imported': 0, 'rejected': 0, 'rejects_offset': 0})
+        started: float = time.monotonic()
+        reported_at: float = started
+        imported_before: int = state['imported']
+        batch: List[BookRow] = []
+
+        def flush(finished: bool = False) -> None:
+            # The checkpoint already counts this batch, since it only persists if the batch commits.
+            if rejects is not None:
+                rejects.flush()
+                state['rejects_offset'] = rejects.tell()
+            state['imported'] += len(batch)
+            BookRepository.import_batch(batch, source, {**state, **(file_identity or {})}, finished)
+            batch.clear()
+
+        for record, offset, item, raw in records:
+            book, errors = BookImport._validate(item) if raw is None else (
+                None, [{'field': '', 'message': 'Record could not be parsed', 'type': 'parse_error'}]
+            )
+            if book is not None:
+                batch.append(book)
+            else:
+                state['rejected'] += 1
+                if rejects is not None:
+                    reject: Dict[str, Any] = {'record': record, 'errors': errors, 'row': item if raw is None else raw}
+                    rejects.write(json.dumps(reject, ensure_ascii=False).encode('utf-8') + b'\n')
+            state['byte_offset'], state['record'] = offset, record
+
+            if len(batch) >= batch_size:
+                flush()
+
+            now: float = time.monotonic()
+            if progress is not None and now - reported_at >= IMPORT_PROGRESS_SECONDS:
+                progress(BookImport._summary(state, imported_before, now - started))
+                reported_at = now
+
+        flush(finished=True)
+        return BookImport._summary(state, imported_before, time.monotonic() - started)
+
+    @staticmethod
+    def _summary(state: Dict[str, int], imported_before: int, elapsed: float) -> Dict[str, Any]:
+        imported: int = state['imported'] - imported_before
+        return {
+            **state,
+            'imported_this_run': imported,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_second': round(imported / elapsed, 1) if elapsed > 0 else 0.0
+        }
+
+    @staticmethod
+    def import_file(
+        path: str,
+        import_format: Optional[str] = None,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        rejects_path: Optional[str] = None,
+        restart: bool = False,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        source: str = os.path.realpath(path)
+        import_format = import_format or BookImport.detect_format(path)
+
+        file_stat: os.stat_result = os.stat(path)
+        file_identity: Dict[str, int] = {'file_size': file_stat.st_size, 'file_mtime_ns': file_stat.st_mtime_ns}
+
+        state: Optional[Dict[str, int]] = None
+        if restart:
+            BookRepository.delete_import_checkpoint(source)
+        else:
+            state = BookRepository.find_import_checkpoint(source)
+        if state is not None:
+            checkpoint_identity: Dict[str, int] = {key: state.pop(key) for key in file_identity}
+            if checkpoint_identity != file_identity:
+                raise ValueError(
+                    f"{path} changed since its checkpoint at record {state['record']}; "
+                    f"use --restart to import it again"
+                )
+
+        rejects: Optional[BinaryIO] = None
+        if rejects_path:
+            rejects = open(rejects_path, 'ab' if state else 'wb')
+            if state:
+                # Drop rejects written for a batch that never committed.
+                rejects.truncate(min(state['rejects_offset'], rejects.tell()))
+                rejects.seek(0, os.SEEK_END)
+
+        offset: int = state['byte_offset'] if state else 0
+        record: int = state['record'] if state else 0
+        try:
+            with BookImport._open(path) as stream:
+                if import_format == IMPORT_FORMAT_CSV:
+                    records: Iterator[SourceRecord] = BookImport._read_csv(stream, offset, record)
+                else:
+                    if offset:
+                        stream.seek(offset)
+                    records = BookImport._read_ndjson(stream, offset, record)
+                result: Dict[str, Any] = BookImport.import_records(
+                    records, batch_size=batch_size, rejects=rejects, source=source, state=state, progress=progress,
+                    file_identity=file_identity
+                )
+        finally:
+            if rejects is not None:
+                rejects.close()
+
+        result['resumed'] = state is not None
+        return result
@@ -1,30 +1,41 @@
 
-from typing import Dict, Optional, Any, Tuple, List
+import os
+from typing import Dict, Optional, Any, Tuple, List, Iterator, Union
 from chalicelib.repositories.book_repository import BookRepository
 from chalicelib.pagination.book_pagination import BookPagination
+from chalicelib.pagination.book_export import BookExport
+from chalicelib.pagination.book_changes import BookChanges
+from chalicelib.pagination.suggest_index import BookSuggestIndex
+from chalicelib.pagination.book_facets import BookFacets
 from chalicelib.models import book_model
-from chalicelib.utils.exceptions import ValidationException, NotFoundException
+from chalicelib.database.db import full_text_search_enabled
+from chalicelib.utils.exceptions import APIException, ValidationException, NotFoundException, PreconditionFailedException
+from chalicelib.utils.validators import format_validation_errors
 from chalicelib.constants.api import (
     SUCCESS_BOOK_CREATED,
     SUCCESS_BOOK_UPDATED,
     SUCCESS_BOOK_DELETED,
-    ERROR_BOOK_NOT_FOUND
+    ERROR_BOOK_NOT_FOUND,
+    ERROR_BOOK_VERSION_MISMATCH,
+    MATCH_CONTAINS,
+    COUNT_EXACT,
+    ERROR_SEARCH_UNAVAILABLE,
+    HTTP_SERVICE_UNAVAILABLE,
+    SUCCESS_BOOKS_CREATED,
+    ERROR_BULK_VALIDATION,
+    BULK_MODE_ATOMIC,
+    HTTP_CREATED,
+    HTTP_MULTI_STATUS,
+    HTTP_BAD_REQUEST,
+    EXPORT_MAX_ROWS,
+    ERROR_EXPORT_TOO_LARGE
 )
 from pydantic import ValidationError
 
 
 class BookService:
 
-    @staticmethod
-    def _format_validation_errors(validation_error: ValidationError) -> List[Dict[str, Any]]:
-        errors: List[Dict[str, Any]] = []
-        for error in validation_error.errors():
-            errors.append({
-                'field': '.'.join(str(loc) for loc in error['loc']),
-                'message': error['msg'],
-                'type': error['type']
-            })
-        return errors
+    EXPORT_MAX_ROWS: int = int(os.getenv('EXPORT_MAX_ROWS', EXPORT_MAX_ROWS))
 
     @staticmethod
     def create_book(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
@@ -47,16 +58,88 @@ class BookService:
         except Exception as e:
             raise ValidationException(f"Error creating book: {str(e)}")
 
+    @staticmethod
+    def create_books_bulk(items: List[Any], mode: str = BULK_MODE_ATOMIC) -> Tuple[Dict[str, Any], int]:
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        valid: List[Tuple[int, Tuple[str, str, Optional[int], Optional[str]]]] = []
+
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results[index] = {
+                    'index': index,
+                    'status': 'error',
+                    'errors': [{'field': '', 'message': 'Book must be a JSON object', 'type': 'type_error'}]
+                }
+                continue
+            try:
+                book_data: book_model.BookCreate = book_model.BookCreate(**item)
+            except ValidationError as e:
+                results[index] = {
+                    'index': index,
+                    'status': 'error',
+                    'errors': format_validation_errors(e)
+                }
+                continue
+            valid.append((index, (book_data.title, book_data.author, book_data.year, book_data.isbn)))
+
+        failed: int = len(items) - len(valid)
+        if failed and mode == BULK_MODE_ATOMIC:
+            return {
+                'error': ERROR_BULK_VALIDATION.format(failed),
+                'mode': mode,
+                'created': 0,
+                'failed': failed,
+                'results': [result for result in results if result is not None]
+            }, HTTP_BAD_REQUEST
+
+        try:
+            book_ids: List[int] = BookRepository.create_many([book for _, book in valid])
+        except Exception as e:
+            raise ValidationException(f"Error creating books: {str(e)}")
+
+        for (index, _), book_id in zip(valid, book_ids):
+            results[index] = {'index': index, 'status': 'created', 'book_id': book_id}
+
+        return {
+            'message': SUCCESS_BOOKS_CREATED.format(len(book_ids)),
+            'mode': mode,
+            'created': len(book_ids),
+            'failed': failed,
+            'results': results
+        }, HTTP_MULTI_STATUS if failed else HTTP_CREATED
+
     @staticmethod
     def get_all_books(
         page: Optional[int] = None,
         per_page: Optional[int] = None,
         author: Optional[str] = None,
         year: Optional[int] = None,
-        title: Optional[str] = None
+        title: Optional[str] = None,
+        match: str = MATCH_CONTAINS,
+        cursor: Optional[str] = None,
+        count: str = COUNT_EXACT
     ) -> Tuple[Dict[str, Any], int]:
         try:
-            if page is not None and per_page is not None:
+            if cursor is not None:
+                per_page = per_page if per_page is not None else 10
+                if per_page < 1 or per_page > 100:
+                    raise ValidationException("Per page must be between 1 and 100")
+
+                try:
+                    cursor_position = BookPagination.decode_cursor(cursor) if cursor else None
+                except ValueError:
+                    raise ValidationException("Invalid cursor parameter")
+
+                result: Dict[str, Any] = BookPagination.paginate_keyset(
+                    cursor_position=cursor_position,
+                    per_page=per_page,
+                    author=author,
+                    year=year,
+                    title=title,
+                    match=match
+                )
+                return result, 200
+            elif page is not None and per_page is not None:
                 if page < 1:
                     raise ValidationException("Page number must be >= 1")
                 if per_page < 1 or per_page > 100:
@@ -71,7 +154,9 @@ class BookService:
                     per_page=per_page,
                     author=author,
                     year=year,
-                    title=title
+                    title=title,
+                    match=match,
+                    count=count
                 )
                 return result, 200
             else:
@@ -83,6 +168,98 @@ class BookService:
         except Exception as e:
             raise ValidationException(f"Error fetching books: {str(e)}")
 
+    @staticmethod
+    def get_catalog_generation() -> int:
+        return BookRepository.get_generation()
+
+    @staticmethod
+    def get_book_version(book_id: int) -> Optional[int]:
+        return BookRepository.find_version(book_id)
+
+    @staticmethod
+    def search_books(
+        terms: List[str],
+        page: int = 1,
+        per_page: int = 10,
+        fuzzy: bool = False
+    ) -> Tuple[Dict[str, Any], int]:
+        if not full_text_search_enabled():
+            raise APIException(ERROR_SEARCH_UNAVAILABLE, HTTP_SERVICE_UNAVAILABLE)
+
+        try:
+            search = BookPagination.search_fuzzy if fuzzy else BookPagination.search
+            result: Dict[str, Any] = search(terms=terms, page=page, per_page=per_page)
+            return result, 200
+        except Exception as e:
+            raise ValidationException(f"Error searching books: {str(e)}")
+
+    @staticmethod
+    def get_changes(since: int = 0, limit: int = 100) -> Tuple[Dict[str, Any], int]:
+        try:
+            return BookChanges.fetch(since=since, limit=limit), 200
+        except Exception as e:
+            raise ValidationException(f"Error fetching changes: {str(e)}")
+
+    @staticmethod
+    def get_facets(
+        author: Optional[str] = None,
+        year: Optional[int] = None,
+        title: Optional[str] = None,
+        match: str = MATCH_CONTAINS,
+        limit: int = 10
+    ) -> Tuple[Dict[str, Any], int]:
+        try:
+            return BookFacets.fetch(author=author, year=year, title=title, match=match, limit=limit), 200
+        except Exception as e:
+            raise ValidationException(f"Error computing facets: {str(e)}")
+
+    @staticmethod
+    def suggest_books(field: str, prefix: str, limit: int = 10) -> Tuple[Dict[str, Any], int]:
+        try:
+            return BookSuggestIndex.suggest(field=field, prefix=prefix, limit=limit), 200
+        except Exception as e:
+            raise ValidationException(f"Error fetching suggestions: {str(e)}")
+
+    @staticmethod
+    def export_books(
+        export_format: str,
+        compress: bool = False,
+        author: Optional[str] = None,
+        year: Optional[int] = None,
+        title: Optional[str] = None,
+        match: str = MATCH_CONTAINS
+    ) -> Tuple[Union[bytes, str], Dict[str, str]]:
+        max_rows: int = BookService.EXPORT_MAX_ROWS
+        rows: Iterator[List[Any]] = BookExport.iter_books(
+            author=author,
+            year=year,
+            title=title,
+            match=match,
+            limit=max_rows + 1
+        )
+
+        def capped() -> Iterator[List[Any]]:
+            exported: int = 0
+            for chunk in rows:
+                exported += len(chunk)
+                if exported > max_rows:
+                    raise ValidationException(ERROR_EXPORT_TOO_LARGE.format(max_rows))
+                yield chunk
+
+        try:
+            chunks: Iterator[bytes] = BookExport.encode(capped(), export_format, compress)
+            # Text chunks always end on a row boundary, so each one decodes on its own.
+            body: Union[bytes, str] = (b''.join(chunks) if compress
+                                       else ''.join(chunk.decode('utf-8') for chunk in chunks))
+        finally:
+            rows.close()
+
+        headers: Dict[str, str] = {
+            'Content-Type': BookExport.content_type(export_format, compress),
+            'Content-Disposition': f'attachment; filename="{BookExport.filename(export_format, compress)}"'
+        }
+        return body, headers
+
     @staticmethod
     def get_book(book_id: int) -> Tuple[Dict[str, Any], int]:
         try:
@@ -97,24 +274,50 @@ class BookService:
             raise NotFoundException(ERROR_BOOK_NOT_FOUND)
 
     @staticmethod
-    def update_book(book_id: int, data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+    def get_books_by_ids(ids: List[int]) -> Tuple[Dict[str, Any], int]:
+        try:
+            books: Dict[int, Dict[str, Any]] = BookRepository.find_by_ids(ids)
+        except Exception as e:
+            raise ValidationException(f"Error fetching books: {str(e)}")
+
+        results: List[Dict[str, Any]] = [
+            {'id': book_id, 'found': book_id in books, 'book': books.get(book_id)} for book_id in ids
+        ]
+        return {
+            'results': results,
+            'found': sum(1 for result in results if result['found']),
+            'not_found': [result['id'] for result in results if not result['found']]
+        }, 200
+
+    @staticmethod
+    def update_book(
+        book_id: int,
+        data: Dict[str, Any],
+        expected_version: Optional[int] = None
+    ) -> Tuple[Dict[str, Any], int]:
         try:
             book_data: book_model.BookUpdate = book_model.BookUpdate(**data)
 
-            success: bool = BookRepository.update(
+            version: Optional[int] = BookRepository.update(
                 book_id=book_id,
                 title=book_data.title,
                 author=book_data.author,
                 year=book_data.year,
-                isbn=book_data.isbn
+                isbn=book_data.isbn,
+                expected_version=expected_version
             )
 
-            if success:
-                return {'message': SUCCESS_BOOK_UPDATED}, 200
-            else:
-                raise NotFoundException(ERROR_BOOK_NOT_FOUND)
+            if version is not None:
+                return {'message': SUCCESS_BOOK_UPDATED, 'version': version}, 200
 
-        except NotFoundException:
+            # Only the failure path reads, to tell a stale version from a missing book.
+            current_version: Optional[int] = (BookRepository.find_version(book_id)
+                                              if expected_version is not None else None)
+            if current_version is not None:
+                raise PreconditionFailedException(ERROR_BOOK_VERSION_MISMATCH.format(current_version))
+            raise NotFoundException(ERROR_BOOK_NOT_FOUND)
+
+        except (NotFoundException, PreconditionFailedException):
             raise
         except ValidationError as e:
             raise ValidationException(f"Book validation failed: {str(e)}")
@@ -0,0 +1,34 @@
+from typing import Dict, Any, Callable
+from chalicelib.database.db import get_pool_stats
+from chalicelib.pagination.columnar_catalog import columnar_catalog
+from chalicelib.pagination.count_cache import BookCountCache
+from chalicelib.pagination.suggest_index import BookSuggestIndex
+from chalicelib.services.password_hasher import password_hasher
+from chalicelib.services.token_cache import TokenCache
+from chalicelib.services.token_revocation import TokenRevocationList
+from chalicelib.utils.request_metrics import request_metrics
+from chalicelib.utils.response_cache import ResponseCache
+
+
+class MetricsService:
+
+    STATS_SOURCES: Dict[str, Callable[[], Dict[str, Any]]] = {
+        'db_pool': get_pool_stats,
+        'bcrypt_pool': password_hasher.stats,
+        'response_cache': ResponseCache.stats,
+        'count_cache': BookCountCache.stats,
+        'token_cache': TokenCache.stats,
+        'token_revocation': TokenRevocationList.stats,
+        'columnar_catalog': columnar_catalog.stats,
+        'suggest_index': BookSuggestIndex.stats
+    }
+
+    @staticmethod
+    def register_gauges() -> None:
+        for source, stats in MetricsService.STATS_SOURCES.items():
+            request_metrics.add_gauges(source, stats)
+
+    @staticmethod
+    def render() -> str:
+        """Request metrics of the whole server, and component statistics per worker, in the Prometheus text format"""
+        return '\n'.join(request_metrics.render()) + '\n'
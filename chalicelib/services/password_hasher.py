@@ -0,0 +1,103 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeoutError
+from typing import Optional, Dict, Any, Callable
+import bcrypt
+from chalicelib.utils.exceptions import ServiceUnavailableException
+from chalicelib.utils.request_metrics import request_metrics
+from chalicelib.constants.api import (
+    BCRYPT_ROUNDS,
+    BCRYPT_WORKERS,
+    BCRYPT_MAX_PENDING,
+    BCRYPT_TIMEOUT_SECONDS,
+    ERROR_AUTH_BUSY,
+    METRICS_COMPONENT_BCRYPT
+)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a small dedicated thread pool.
+
+    bcrypt releases the GIL while hashing, so capping the worker count caps the
+    CPU that login/register bursts can take from other routes. At most
+    ``max_pending`` calls may be running or queued; anything beyond that is
+    rejected immediately with a 503 instead of piling up behind the pool.
+    """
+
+    def __init__(self, rounds: int, workers: int, max_pending: int, timeout: float) -> None:
+        self.rounds: int = rounds
+        self.workers: int = max(1, workers)
+        self.max_pending: int = max(self.workers, max_pending)
+        self.timeout: float = timeout
+        self._lock: threading.Lock = threading.Lock()
+        self._reset_state()
+
+    def _reset_state(self) -> None:
+        self._pid: int = os.getpid()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: int = 0
+        self._completed: int = 0
+        self._rejected: int = 0
+        self._timeouts: int = 0
+
+    def _reserve(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset_state()
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise ServiceUnavailableException(ERROR_AUTH_BUSY)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='bcrypt')
+            self._pending += 1
+            return self._executor
+
+    def _finished(self, _: Optional[Future] = None) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+
+    def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        executor: ThreadPoolExecutor = self._reserve()
+        try:
+            future: Future = executor.submit(func, *args)
+        except RuntimeError:
+            self._finished()
+            raise ServiceUnavailableException(ERROR_AUTH_BUSY)
+        future.add_done_callback(self._finished)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._timeouts += 1
+            raise ServiceUnavailableException(ERROR_AUTH_BUSY)
+
+    def hash_password(self, password: str) -> bytes:
+        with request_metrics.timed(METRICS_COMPONENT_BCRYPT):
+            return self._run(bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(rounds=self.rounds))
+
+    def verify_password(self, plain_password: str, hashed_password: bytes) -> bool:
+        with request_metrics.timed(METRICS_COMPONENT_BCRYPT):
+            return self._run(bcrypt.checkpw, plain_password.encode('utf-8'), hashed_password)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'rounds': self.rounds,
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'pending': self._pending,
+                'completed': self._completed,
+                'rejected': self._rejected,
+                'timeouts': self._timeouts
+            }
+
+
+password_hasher: PasswordHasher = PasswordHasher(
+    rounds=int(os.getenv('BCRYPT_ROUNDS', BCRYPT_ROUNDS)),
+    workers=int(os.getenv('BCRYPT_WORKERS', BCRYPT_WORKERS)),
+    max_pending=int(os.getenv('BCRYPT_MAX_PENDING', BCRYPT_MAX_PENDING)),
+    timeout=float(os.getenv('BCRYPT_TIMEOUT_SECONDS', BCRYPT_TIMEOUT_SECONDS))
+)
@@ -0,0 +1,73 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+from chalicelib.constants.api import TOKEN_CACHE_MAX_ENTRIES, TOKEN_CACHE_TTL_SECONDS
+
+
+class TokenCache:
+    """
+    In-process LRU of verified JWTs keyed by the token's SHA-256.
+
+    An entry lives for at most ``TOKEN_CACHE_TTL_SECONDS`` and never past the
+    token's own ``exp``, so a cache hit skips the signature check and the
+    user lookup without ever accepting an expired token.
+    """
+
+    _entries: 'OrderedDict[bytes, Tuple[Dict[str, Any], float]]' = OrderedDict()
+    _lock: threading.Lock = threading.Lock()
+    _hits: int = 0
+    _misses: int = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode('utf-8')).digest()
+
+    @staticmethod
+    def get(token: str) -> Optional[Dict[str, Any]]:
+        key: bytes = TokenCache._key(token)
+        with TokenCache._lock:
+            entry = TokenCache._entries.get(key)
+            if entry is None:
+                TokenCache._misses += 1
+                return None
+            if entry[1] <= time.time():
+                TokenCache._entries.pop(key, None)
+                TokenCache._misses += 1
+                return None
+            TokenCache._entries.move_to_end(key)
+            TokenCache._hits += 1
+            return dict(entry[0])
+
+    @staticmethod
+    def put(token: str, user: Dict[str, Any], token_expires_at: float) -> None:
+        expires_at: float = min(token_expires_at, time.time() + TOKEN_CACHE_TTL_SECONDS)
+        if expires_at <= time.time():
+            return
+
+        key: bytes = TokenCache._key(token)
+        with TokenCache._lock:
+            TokenCache._entries.pop(key, None)
+            TokenCache._entries[key] = (dict(user), expires_at)
+            while len(TokenCache._entries) > TOKEN_CACHE_MAX_ENTRIES:
+                TokenCache._entries.popitem(last=False)
+
+    @staticmethod
+    def invalidate(token: str) -> None:
+        with TokenCache._lock:
+            TokenCache._entries.pop(TokenCache._key(token), None)
+
+    @staticmethod
+    def clear() -> None:
+        with TokenCache._lock:
+            TokenCache._entries.clear()
+
+    @staticmethod
+    def stats() -> Dict[str, int]:
+        with TokenCache._lock:
+            return {
+                'entries': len(TokenCache._entries),
+                'hits': TokenCache._hits,
+                'misses': TokenCache._misses
+            }
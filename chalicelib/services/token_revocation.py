@@ -0,0 +1,198 @@
+import hashlib
+import math
+import os
+import threading
+import time
+from typing import Optional, Dict, Any, Iterable, Tuple
+from chalicelib.repositories.auth_token_repository import AuthTokenRepository
+from chalicelib.constants.api import (
+    REVOCATION_BLOOM_CAPACITY,
+    REVOCATION_BLOOM_ERROR_RATE,
+    REVOCATION_SYNC_SECONDS,
+    REVOCATION_PURGE_SECONDS
+)
+
+
+class BloomFilter:
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity: int = max(1, capacity)
+        self.size: int = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count: int = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits: bytearray = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str) -> Iterable[int]:
+        digest: bytes = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        first: int = int.from_bytes(digest[:8], 'little')
+        second: int = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class TokenRevocationList:
+    """
+    In-memory mirror of the revoked token ids stored in ``auth_tokens``.
+
+    A Bloom filter answers "definitely not revoked" for almost every token
+    without touching SQLite or the exact set; the exact set (jti -> exp)
+    settles the rare filter hit. Revocations made by other processes are
+    picked up by reading only rows newer than the last seen id, at most once
+    every ``REVOCATION_SYNC_SECONDS``.
+
+    The lock every token check takes only guards the in-memory state. Syncing
+    and purging run one thread at a time under a separate maintenance lock:
+    they query SQLite and rebuild the filter without the state lock, then
+    swap the result in, while other requests keep checking against the
+    current state. Only the first sync of a process is waited for, so a
+    fresh worker never accepts a revoked token.
+    """
+
+    _lock: threading.Lock = threading.Lock()
+    _maintenance_lock: threading.Lock = threading.Lock()
+    _pid: int = 0
+    _bloom: BloomFilter = BloomFilter(REVOCATION_BLOOM_CAPACITY, REVOCATION_BLOOM_ERROR_RATE)
+    _revoked: Dict[str, int] = {}
+    # Revocations recorded while a purge rebuilds the set outside the lock.
+    _pending: Optional[Dict[str, int]] = None
+    _last_id: int = 0
+    _synced: bool = False
+    _synced_at: float = 0.0
+    _purged_at: float = 0.0
+    _bloom_negatives: int = 0
+    _bloom_positives: int = 0
+
+    @staticmethod
+    def _reset_state() -> None:
+        TokenRevocationList._pid = os.getpid()
+        TokenRevocationList._maintenance_lock = threading.Lock()
+        TokenRevocationList._bloom = BloomFilter(REVOCATION_BLOOM_CAPACITY, REVOCATION_BLOOM_ERROR_RATE)
+        TokenRevocationList._revoked = {}
+        TokenRevocationList._pending = None
+        TokenRevocationList._last_id = 0
+        TokenRevocationList._synced = False
+        TokenRevocationList._synced_at = 0.0
+        TokenRevocationList._purged_at = time.monotonic()
+
+    @staticmethod
+    def _check_pid() -> threading.Lock:
+        """Reset the state after a fork and return the maintenance lock; call with ``_lock`` held"""
+        if TokenRevocationList._pid != os.getpid():
+            TokenRevocationList._reset_state()
+        return TokenRevocationList._maintenance_lock
+
+    @staticmethod
+    def _remember(jti: str, expires_at: int) -> None:
+        TokenRevocationList._revoked[jti] = expires_at
+        if TokenRevocationList._pending is not None:
+            TokenRevocationList._pending[jti] = expires_at
+        if len(TokenRevocationList._revoked) > TokenRevocationList._bloom.capacity:
+            TokenRevocationList._rebuild_bloom(TokenRevocationList._bloom.capacity * 2)
+        else:
+            TokenRevocationList._bloom.add(jti)
+
+    @staticmethod
+    def _rebuild_bloom(capacity: int) -> None:
+        bloom: BloomFilter = BloomFilter(capacity, REVOCATION_BLOOM_ERROR_RATE)
+        for jti in TokenRevocationList._revoked:
+            bloom.add(jti)
+        TokenRevocationList._bloom = bloom
+
+    @staticmethod
+    def _sync(now: float) -> None:
+        rows = AuthTokenRepository.find_revoked_since(TokenRevocationList._last_id, int(time.time()))
+        with TokenRevocationList._lock:
+            for row in rows:
+                TokenRevocationList._remember(row['token'], row['expires_at'])
+                TokenRevocationList._last_id = max(TokenRevocationList._last_id, row['id'])
+            TokenRevocationList._synced_at = now
+            TokenRevocationList._synced = True
+
+    @staticmethod
+    def _purge(now: float) -> int:
+        current_time: int = int(time.time())
+        removed: int = AuthTokenRepository.delete_expired(current_time)
+        with TokenRevocationList._lock:
+            snapshot: Dict[str, int] = dict(TokenRevocationList._revoked)
+            TokenRevocationList._pending = {}
+
+        revoked: Dict[str, int] = {jti: expires_at for jti, expires_at in snapshot.items() if expires_at > current_time}
+        bloom: BloomFilter = BloomFilter(max(REVOCATION_BLOOM_CAPACITY, len(revoked)), REVOCATION_BLOOM_ERROR_RATE)
+        for jti in revoked:
+            bloom.add(jti)
+
+        with TokenRevocationList._lock:
+            for jti, expires_at in TokenRevocationList._pending.items():
+                revoked[jti] = expires_at
+                bloom.add(jti)
+            TokenRevocationList._revoked = revoked
+            TokenRevocationList._bloom = bloom
+            TokenRevocationList._pending = None
+            TokenRevocationList._purged_at = now
+        return removed
+
+    @staticmethod
+    def _due(now: float) -> Tuple[bool, bool]:
+        return (now - TokenRevocationList._purged_at >= REVOCATION_PURGE_SECONDS,
+                now - TokenRevocationList._synced_at >= REVOCATION_SYNC_SECONDS)
+
+    @staticmethod
+    def _maintain() -> None:
+        with TokenRevocationList._lock:
+            maintenance_lock: threading.Lock = TokenRevocationList._check_pid()
+            synced: bool = TokenRevocationList._synced
+            if not any(TokenRevocationList._due(time.monotonic())):
+                return
+
+        # Whoever finds the lock taken carries on with the current state, unless nothing is loaded yet.
+        if not maintenance_lock.acquire(blocking=not synced):
+            return
+        try:
+            now: float = time.monotonic()
+            purge, sync = TokenRevocationList._due(now)
+            if purge:
+                TokenRevocationList._purge(now)
+            if sync:
+                TokenRevocationList._sync(now)
+        finally:
+            maintenance_lock.release()
+
+    @staticmethod
+    def is_revoked(jti: str) -> bool:
+        TokenRevocationList._maintain()
+        with TokenRevocationList._lock:
+            if jti not in TokenRevocationList._bloom:
+                TokenRevocationList._bloom_negatives += 1
+                return False
+            TokenRevocationList._bloom_positives += 1
+            return jti in TokenRevocationList._revoked
+
+    @staticmethod
+    def revoke(user_id: int, jti: str, expires_at: int) -> None:
+        AuthTokenRepository.revoke(user_id, jti, expires_at)
+        with TokenRevocationList._lock:
+            TokenRevocationList._check_pid()
+            TokenRevocationList._remember(jti, expires_at)
+
+    @staticmethod
+    def purge_expired() -> int:
+        with TokenRevocationList._lock:
+            maintenance_lock: threading.Lock = TokenRevocationList._check_pid()
+        with maintenance_lock:
+            return TokenRevocationList._purge(time.monotonic())
+
+    @staticmethod
+    def stats() -> Dict[str, Any]:
+        with TokenRevocationList._lock:
+            return {
+                'revoked': len(TokenRevocationList._revoked),
+                'bloom_bits': TokenRevocationList._bloom.size,
+                'bloom_hashes': TokenRevocationList._bloom.hash_count,
+                'bloom_negatives': TokenRevocationList._bloom_negatives,
+                'bloom_positives': TokenRevocationList._bloom_positives
+            }
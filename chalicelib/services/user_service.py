@@ -1,11 +1,16 @@
 
 from typing import Dict, Optional, Any, Tuple
 from chalicelib.repositories.user_repository import UserRepository
+from chalicelib.services.token_cache import TokenCache
+from chalicelib.services.password_hasher import password_hasher
+from chalicelib.services.token_revocation import TokenRevocationList
 from chalicelib.models import user_model
+from chalicelib.utils.request_metrics import request_metrics
 from chalicelib.utils.exceptions import (
     ValidationException,
     AuthenticationException,
-    ConflictException
+    ConflictException,
+    ServiceUnavailableException
 )
 from chalicelib.constants.api import (
     JWT_SECRET_KEY,
@@ -15,13 +20,15 @@ from chalicelib.constants.api import (
     ERROR_USERNAME_EXISTS,
     ERROR_UNAUTHORIZED,
     SUCCESS_USER_REGISTERED,
-    SUCCESS_LOGIN
+    SUCCESS_LOGIN,
+    METRICS_COMPONENT_JWT
 )
 from pydantic import ValidationError
 import jwt
 import datetime
+import hashlib
 import os
-import bcrypt
+import uuid
 
 
 class UserService:
@@ -30,24 +37,13 @@ class UserService:
     ALGORITHM: str = JWT_ALGORITHM
     TOKEN_EXPIRATION_HOURS: int = JWT_TOKEN_EXPIRATION_HOURS
 
-    @staticmethod
-    def _format_validation_errors(validation_error: ValidationError) -> list:
-        errors: list = []
-        for error in validation_error.errors():
-            errors.append({
-                'field': '.'.join(str(loc) for loc in error['loc']),
-                'message': error['msg'],
-                'type': error['type']
-            })
-        return errors
-
     @staticmethod
     def _hash_password(password: str) -> bytes:
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+        return password_hasher.hash_password(password)
 
     @staticmethod
     def _verify_password(plain_password: str, hashed_password: bytes) -> bool:
-        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password)
+        return password_hasher.verify_password(plain_password, hashed_password)
 
     @staticmethod
     def _generate_token(user_id: int, username: str) -> str:
@@ -55,11 +51,22 @@ class UserService:
             'user_id': user_id,
             'username': username,
             'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=UserService.TOKEN_EXPIRATION_HOURS),
-            'iat': datetime.datetime.utcnow()
+            'iat': datetime.datetime.utcnow(),
+            'jti': uuid.uuid4().hex
         }
-        token: str = jwt.encode(payload, UserService.SECRET_KEY, algorithm=UserService.ALGORITHM)
+        with request_metrics.timed(METRICS_COMPONENT_JWT):
+            token: str = jwt.encode(payload, UserService.SECRET_KEY, algorithm=UserService.ALGORITHM)
         return token
 
+    @staticmethod
+    def _token_id(token: str, payload: Dict[str, Any]) -> str:
+        # Tokens issued before the jti claim existed are revoked by their hash instead.
+        return payload.get('jti') or hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def purge_expired_revocations() -> int:
+        return TokenRevocationList.purge_expired()
+
     @staticmethod
     def register(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         try:
@@ -93,7 +100,7 @@ class UserService:
                 'token': token
             }, 201
 
-        except (ValidationException, ConflictException, AuthenticationException):
+        except (ValidationException, ConflictException, AuthenticationException, ServiceUnavailableException):
             raise
         except ValidationError as e:
             raise ValidationException(f"Validation failed: {str(e)}")
@@ -124,7 +131,7 @@ class UserService:
                 'token': token
             }, 200
 
-        except (ValidationException, AuthenticationException, ConflictException):
+        except (ValidationException, AuthenticationException, ConflictException, ServiceUnavailableException):
             raise
         except ValidationError as e:
             raise ValidationException(f"Validation failed: {str(e)}")
@@ -136,19 +143,35 @@ class UserService:
         if not token:
             return None
 
+        cached: Optional[Dict[str, Any]] = TokenCache.get(token)
+        if cached is not None:
+            if TokenRevocationList.is_revoked(cached['jti']):
+                TokenCache.invalidate(token)
+                return None
+            return cached
+
         try:
-            payload: Dict[str, Any] = jwt.decode(token, UserService.SECRET_KEY, algorithms=[UserService.ALGORITHM])
+            with request_metrics.timed(METRICS_COMPONENT_JWT):
+                payload: Dict[str, Any] = jwt.decode(token, UserService.SECRET_KEY, algorithms=[UserService.ALGORITHM])
             user_id: Optional[int] = payload.get('user_id')
             username: Optional[str] = payload.get('username')
+            jti: str = UserService._token_id(token, payload)
+
+            if TokenRevocationList.is_revoked(jti):
+                return None
 
             user: Optional[Dict[str, Any]] = UserRepository.find_by_id(user_id)
             if not user:
                 return None
 
-            return {
+            verified: Dict[str, Any] = {
                 'user_id': user_id,
-                'username': username
+                'username': username,
+                'jti': jti,
+                'exp': payload['exp']
             }
+            TokenCache.put(token, verified, payload['exp'])
+            return verified
 
         except jwt.ExpiredSignatureError:
             return None
@@ -167,6 +190,9 @@ class UserService:
             if not user:
                 raise AuthenticationException(ERROR_UNAUTHORIZED)
 
+            TokenRevocationList.revoke(user['user_id'], user['jti'], user['exp'])
+            TokenCache.invalidate(token)
+
             return {
                 'message': 'Logout successful',
                 'user_id': user['user_id']
@@ -0,0 +1,30 @@
+import hashlib
+from typing import Optional, Dict, Any
+from chalicelib.constants.db_queries import MigrationQueries
+
+# Schema changes can change the representation without touching any row, so every ETag includes the version.
+SCHEMA_VERSION: int = MigrationQueries.MIGRATIONS[-1][0]
+
+
+def book_etag(version: int) -> str:
+    return f'"{SCHEMA_VERSION}-{version}"'
+
+
+def list_etag(generation: int, params: Dict[str, Any]) -> str:
+    raw: str = repr((SCHEMA_VERSION, generation, sorted(params.items())))
+    return '"' + hashlib.sha1(raw.encode('utf-8')).hexdigest()[:20] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
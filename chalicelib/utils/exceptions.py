@@ -40,3 +40,15 @@ class ConflictException(APIException):
 
     def __init__(self, message: str) -> None:
         super().__init__(message, 409)
+
+
+class PreconditionFailedException(APIException):
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message, 412)
+
+
+class ServiceUnavailableException(APIException):
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message, 503)
@@ -0,0 +1,363 @@
+import atexit
+import bisect
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Dict, List, Tuple, Any, Iterator, Callable
+from chalicelib.constants.api import METRICS_NAMESPACE, METRICS_LATENCY_BUCKETS, METRICS_FLUSH_SECONDS
+
+RouteKey = Tuple[str, str]
+Gauges = Dict[str, Dict[str, Any]]
+
+RETIRED_NAME = 'retired'
+
+
+class _Shard:
+    """Counters only ever written by the thread that owns the shard"""
+
+    __slots__ = ('pid', 'thread', 'requests', 'statuses', 'components', 'route_components', 'spent')
+
+    def __init__(self) -> None:
+        self.pid: int = os.getpid()
+        self.thread: threading.Thread = threading.current_thread()
+        # (method, route) -> [count, seconds, one count per bucket, count above the last bucket]
+        self.requests: Dict[RouteKey, List[float]] = {}
+        self.statuses: Dict[Tuple[str, str, str], int] = {}
+        # component -> [calls, seconds]
+        self.components: Dict[str, List[float]] = {}
+        self.route_components: Dict[Tuple[str, str, str], float] = {}
+        # Component seconds of the request this thread is handling, if any.
+        self.spent: Optional[Dict[str, float]] = None
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels: str) -> str:
+    return '{' + ','.join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + '}'
+
+
+class RequestMetrics:
+    """
+    Per-route request latency and status counts, plus time spent in the
+    database, bcrypt and JWT, rendered in the Prometheus text format.
+
+    Every thread records into its own shard, so the request path never takes
+    a lock or contends with other threads; the lock is only taken the first
+    time a thread records and when a scrape sums the shards. Shards of threads
+    that have exited are folded into one retired shard at the next scrape.
+    Counters are per process and start over in a forked child.
+
+    Pre-forked servers pass a shared ``directory``. Each process then writes
+    its totals and gauges there every ``flush_seconds`` and on each scrape,
+    and whichever worker answers a scrape sums the counters of all of them.
+    Files of workers that have exited are folded into one retired file, so
+    totals never go backwards when workers are recycled. Gauges describe
+    live state, so they are reported per live worker with a ``worker`` label.
+    """
+
+    def __init__(
+        self,
+        buckets: Tuple[float, ...] = METRICS_LATENCY_BUCKETS,
+        directory: Optional[str] = None,
+        flush_seconds: float = METRICS_FLUSH_SECONDS
+    ) -> None:
+        self.buckets: Tuple[float, ...] = tuple(buckets)
+        self.directory: Optional[str] = directory
+        self.flush_seconds: float = flush_seconds
+        self._gauges: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._reset()
+        if directory:
+            atexit.register(self.flush)
+
+    def _reset(self) -> None:
+        self._pid: int = os.getpid()
+        # Unique per process lifetime, so a reused pid never inherits an exited worker's file.
+        self._name: str = f'{self._pid}-{time.time_ns()}'
+        self._local: threading.local = threading.local()
+        self._shards: List[_Shard] = []
+        self._retired: _Shard = _Shard()
+        self._flushing: bool = False
+        # Snapshots are written in the order they are taken, so the file never goes back in time.
+        self._publish_lock: threading.Lock = threading.Lock()
+
+    def add_gauges(self, source: str, stats: Callable[[], Dict[str, Any]]) -> None:
+        """Report every numeric value of ``stats()`` as a ``<namespace>_<source>_<key>`` gauge"""
+        self._gauges[source] = stats
+
+    def _shard(self) -> _Shard:
+        shard: Optional[_Shard] = getattr(self._local, 'shard', None)
+        if shard is None or shard.pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._reset()
+                shard = _Shard()
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def observe(self, component: str, seconds: float) -> None:
+        shard: _Shard = self._shard()
+        totals: Optional[List[float]] = shard.components.get(component)
+        if totals is None:
+            totals = shard.components[component] = [0, 0.0]
+        totals[0] += 1
+        totals[1] += seconds
+        if shard.spent is not None:
+            shard.spent[component] = shard.spent.get(component, 0.0) + seconds
+
+    @contextmanager
+    def timed(self, component: str) -> Iterator[None]:
+        started: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(component, time.perf_counter() - started)
+
+    def begin_request(self) -> None:
+        self._shard().spent = {}
+        if self.directory and not self._flushing:
+            # Only processes serving requests publish; a preloading master never does.
+            with self._lock:
+                if not self._flushing:
+                    self._flushing = True
+                    threading.Thread(target=self._flush_periodically, name='metrics-flush', daemon=True).start()
+
+    def end_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        shard: _Shard = self._shard()
+        key: RouteKey = (method, route)
+        histogram: Optional[List[float]] = shard.requests.get(key)
+        if histogram is None:
+            histogram = shard.requests[key] = [0, 0.0] + [0] * (len(self.buckets) + 1)
+        histogram[0] += 1
+        histogram[1] += seconds
+        histogram[2 + bisect.bisect_left(self.buckets, seconds)] += 1
+
+        status_key: Tuple[str, str, str] = (method, route, str(status))
+        shard.statuses[status_key] = shard.statuses.get(status_key, 0) + 1
+
+        for component, spent in (shard.spent or {}).items():
+            component_key: Tuple[str, str, str] = (method, route, component)
+            shard.route_components[component_key] = shard.route_components.get(component_key, 0.0) + spent
+        shard.spent = None
+
+    @staticmethod
+    def _merge(into: _Shard, shard: _Shard) -> None:
+        # dict() copies in one step under the GIL, so the owner may keep writing meanwhile.
+        for key, values in dict(shard.requests).items():
+            target: Optional[List[float]] = into.requests.get(key)
+            if target is None:
+                into.requests[key] = list(values)
+            else:
+                into.requests[key] = [total + value for total, value in zip(target, list(values))]
+        for key, count in dict(shard.statuses).items():
+            into.statuses[key] = into.statuses.get(key, 0) + count
+        for component, (calls, seconds) in dict(shard.components).items():
+            totals: List[float] = into.components.setdefault(component, [0, 0.0])
+            totals[0] += calls
+            totals[1] += seconds
+        for key, seconds in dict(shard.route_components).items():
+            into.route_components[key] = into.route_components.get(key, 0.0) + seconds
+
+    def snapshot(self) -> _Shard:
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            live: List[_Shard] = []
+            for shard in self._shards:
+                if shard.thread.is_alive():
+                    live.append(shard)
+                else:
+                    self._merge(self._retired, shard)
+            self._shards = live
+            total: _Shard = _Shard()
+            self._merge(total, self._retired)
+        for shard in live:
+            self._merge(total, shard)
+        return total
+
+    def _collect_gauges(self) -> Gauges:
+        return {source: stats() for source, stats in self._gauges.items()}
+
+    @staticmethod
+    def _dump(total: _Shard, gauges: Optional[Gauges]) -> Dict[str, Any]:
+        return {
+            'pid': os.getpid() if gauges is not None else 0,
+            'requests': [[method, route, values] for (method, route), values in total.requests.items()],
+            'statuses': [[*key, count] for key, count in total.statuses.items()],
+            'components': [[component, calls, seconds] for component, (calls, seconds) in total.components.items()],
+            'route_components': [[*key, seconds] for key, seconds in total.route_components.items()],
+            'gauges': gauges or {}
+        }
+
+    @staticmethod
+    def _load(state: Dict[str, Any]) -> _Shard:
+        shard: _Shard = _Shard()
+        shard.requests = {(method, route): values for method, route, values in state['requests']}
+        shard.statuses = {(method, route, status): count for method, route, status, count in state['statuses']}
+        shard.components = {component: [calls, seconds] for component, calls, seconds in state['components']}
+        shard.route_components = {
+            (method, route, component): seconds for method, route, component, seconds in state['route_components']
+        }
+        return shard
+
+    def _write(self, name: str, state: Dict[str, Any]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path: str = os.path.join(self.directory, f'{name}.json')
+        temporary: str = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'w') as output:
+            json.dump(state, output, default=str)
+        # Readers see either the previous or the new file, never a partial one.
+        os.replace(temporary, path)
+
+    @staticmethod
+    def _read(path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path) as source:
+                return json.load(source)
+        except (OSError, ValueError):
+            # Not written yet, or folded into the retired file by another scrape in the meantime.
+            return None
+
+    @staticmethod
+    def _alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _publish(self) -> Tuple[_Shard, Gauges]:
+        with self._lock:
+            # A forked child must not wait on a publish lock inherited mid-write.
+            if self._pid != os.getpid():
+                self._reset()
+        with self._publish_lock:
+            total: _Shard = self.snapshot()
+            gauges: Gauges = self._collect_gauges()
+            self._write(self._name, self._dump(total, gauges))
+        return total, gauges
+
+    def flush(self) -> None:
+        """Write this process's totals and gauges to the shared directory"""
+        if self.directory and self._flushing and self._pid == os.getpid():
+            self._publish()
+
+    def _flush_periodically(self) -> None:
+        while True:
+            time.sleep(self.flush_seconds)
+            self.flush()
+
+    def _shared_states(self) -> List[Dict[str, Any]]:
+        """States of the other processes, after folding those of exited workers into the retired file"""
+        import fcntl  # POSIX only, and only needed with a shared directory
+
+        own: str = os.path.join(self.directory, f'{self._name}.json')
+        retired_path: str = os.path.join(self.directory, f'{RETIRED_NAME}.json')
+        # Scrapes take turns, so none reads a worker's file together with the retired file it was just folded into.
+        with open(os.path.join(self.directory, f'{RETIRED_NAME}.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            states: List[Dict[str, Any]] = []
+            exited: List[Tuple[str, Dict[str, Any]]] = []
+            for path in glob.glob(os.path.join(self.directory, '*.json')):
+                if path in (own, retired_path):
+                    continue
+                state: Optional[Dict[str, Any]] = self._read(path)
+                if state is None:
+                    continue
+                if self._alive(state['pid']):
+                    states.append(state)
+                else:
+                    exited.append((path, state))
+
+            retired_state: Optional[Dict[str, Any]] = self._read(retired_path)
+            if exited:
+                retired: _Shard = self._load(retired_state) if retired_state else _Shard()
+                for _, state in exited:
+                    self._merge(retired, self._load(state))
+                retired_state = self._dump(retired, None)
+                self._write(RETIRED_NAME, retired_state)
+                for path, _ in exited:
+                    os.remove(path)
+            if retired_state:
+                states.append(retired_state)
+            return states
+
+    def render(self, namespace: str = METRICS_NAMESPACE) -> List[str]:
+        if not self.directory:
+            total: _Shard = self.snapshot()
+            gauges: Dict[int, Gauges] = {os.getpid(): self._collect_gauges()}
+        else:
+            total, own = self._publish()
+            gauges = {os.getpid(): own}
+            for state in self._shared_states():
+                self._merge(total, self._load(state))
+                if state['pid']:
+                    gauges[state['pid']] = state['gauges']
+        lines: List[str] = []
+
+        name: str = f'{namespace}_http_requests_total'
+        lines += [f'# HELP {name} Requests handled, by route and status.', f'# TYPE {name} counter']
+        for (method, route, status), count in sorted(total.statuses.items()):
+            lines.append(f'{name}{_labels(method=method, route=route, status=status)} {count}')
+
+        name = f'{namespace}_http_request_duration_seconds'
+        lines += [f'# HELP {name} Request latency, by route.', f'# TYPE {name} histogram']
+        for (method, route), histogram in sorted(total.requests.items()):
+            cumulative: int = 0
+            for bound, count in zip(self.buckets, histogram[2:]):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels(method=method, route=route, le=repr(bound))} {cumulative}')
+            lines.append(f'{name}_bucket{_labels(method=method, route=route, le="+Inf")} {histogram[0]}')
+            lines.append(f'{name}_sum{_labels(method=method, route=route)} {histogram[1]!r}')
+            lines.append(f'{name}_count{_labels(method=method, route=route)} {histogram[0]}')
+
+        name = f'{namespace}_http_request_component_seconds_total'
+        lines += [f'# HELP {name} Time requests spent in the database, bcrypt and JWT, by route.',
+                  f'# TYPE {name} counter']
+        for (method, route, component), seconds in sorted(total.route_components.items()):
+            lines.append(f'{name}{_labels(method=method, route=route, component=component)} {seconds!r}')
+
+        seconds_name: str = f'{namespace}_component_seconds_total'
+        calls_name: str = f'{namespace}_component_calls_total'
+        lines += [f'# HELP {seconds_name} Time spent in the database, bcrypt and JWT, in and out of requests.',
+                  f'# TYPE {seconds_name} counter']
+        for component, (_, seconds) in sorted(total.components.items()):
+            lines.append(f'{seconds_name}{_labels(component=component)} {seconds!r}')
+        lines += [f'# HELP {calls_name} Database connections used, bcrypt hashes and JWT operations.',
+                  f'# TYPE {calls_name} counter']
+        for component, (calls, _) in sorted(total.components.items()):
+            lines.append(f'{calls_name}{_labels(component=component)} {calls}')
+
+        name = f'{namespace}_workers'
+        lines += [f'# HELP {name} Live server processes that have handled a request; exited ones still count in the totals.',
+                  f'# TYPE {name} gauge', f'{name} {len(gauges)}']
+        return lines + render_gauges(gauges, namespace)
+
+
+def render_gauges(gauges: Dict[int, Gauges], namespace: str = METRICS_NAMESPACE) -> List[str]:
+    """One gauge per numeric value of each source's ``stats()`` dict, labelled with the worker's pid"""
+    samples: Dict[str, List[Tuple[int, Any]]] = {}
+    for worker, sources in sorted(gauges.items()):
+        for source, stats in sources.items():
+            for key, value in stats.items():
+                if isinstance(value, bool):
+                    value = int(value)
+                if isinstance(value, (int, float)):
+                    samples.setdefault(f'{namespace}_{source}_{key}', []).append((worker, value))
+
+    lines: List[str] = []
+    for name, values in samples.items():
+        lines.append(f'# TYPE {name} gauge')
+        lines.extend(f'{name}{_labels(worker=str(worker))} {value!r}' for worker, value in values)
+    return lines
+
+
+request_metrics: RequestMetrics = RequestMetrics(directory=os.getenv('METRICS_MULTIPROC_DIR') or None)
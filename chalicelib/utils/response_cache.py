@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple, Callable
+from chalicelib.database.db import db_connection
+from chalicelib.constants import db_queries
+from chalicelib.constants.api import (
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_MAX_ENTRY_BYTES,
+    RESPONSE_CACHE_SYNC_SECONDS,
+    RESPONSE_CACHE_HEADER
+)
+
+CacheKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+
+class ResponseCache:
+    """
+    LRU of serialized JSON bodies for book reads, bounded by total size.
+
+    Each body is stored with the ETag computed for it, so a hit always pairs a
+    body with the validator describing that exact snapshot.
+
+    Every ``BookRepository`` write bumps the local generation and drops all
+    entries; a response computed under an older generation is never stored.
+    Writes from other processes are noticed through the trigger-maintained
+    ``book_stats.generation``, checked at most every
+    ``RESPONSE_CACHE_SYNC_SECONDS``, or on every call that already knows the
+    current generation.
+    """
+
+    _entries: 'OrderedDict[CacheKey, Tuple[str, Optional[str]]]' = OrderedDict()
+    _lock: threading.Lock = threading.Lock()
+    _pid: int = os.getpid()
+    _bytes: int = 0
+    _generation: int = 0
+    _db_generation: Optional[int] = None
+    _checked_at: float = 0.0
+    _hits: int = 0
+    _misses: int = 0
+    _invalidations: int = 0
+
+    @staticmethod
+    def make_key(namespace: str, params: Dict[str, Any]) -> CacheKey:
+        return namespace, tuple(sorted(params.items()))
+
+    @staticmethod
+    def _clear_locked() -> None:
+        ResponseCache._entries.clear()
+        ResponseCache._bytes = 0
+        ResponseCache._generation += 1
+
+    @staticmethod
+    def _sync(db_generation: Optional[int] = None) -> int:
+        now: float = time.monotonic()
+        with ResponseCache._lock:
+            if ResponseCache._pid != os.getpid():
+                ResponseCache._pid = os.getpid()
+                ResponseCache._db_generation = None
+                ResponseCache._checked_at = 0.0
+                ResponseCache._clear_locked()
+            if db_generation is None and now - ResponseCache._checked_at < RESPONSE_CACHE_SYNC_SECONDS:
+                return ResponseCache._generation
+
+        if db_generation is None:
+            with db_connection() as conn:
+                db_generation = conn.execute(db_queries.BookQueries.SELECT_BOOK_STATS).fetchone()['generation']
+
+        with ResponseCache._lock:
+            if db_generation != ResponseCache._db_generation:
+                ResponseCache._db_generation = db_generation
+                ResponseCache._clear_locked()
+            ResponseCache._checked_at = now
+            return ResponseCache._generation
+
+    @staticmethod
+    def invalidate() -> None:
+        with ResponseCache._lock:
+            ResponseCache._invalidations += 1
+            ResponseCache._clear_locked()
+
+    @staticmethod
+    def read_through(
+        namespace: str,
+        params: Dict[str, Any],
+        produce: Callable[[], Tuple[Dict[str, Any], int]],
+        etag_for: Optional[Callable[[Dict[str, Any]], str]] = None,
+        db_generation: Optional[int] = None
+    ) -> Tuple[str, int, bool, Optional[str]]:
+        """Return ``(json_body, status_code, hit, etag)``, calling ``produce`` only on a miss"""
+        key: CacheKey = ResponseCache.make_key(namespace, params)
+        generation: int = ResponseCache._sync(db_generation)
+
+        with ResponseCache._lock:
+            entry: Optional[Tuple[str, Optional[str]]] = ResponseCache._entries.get(key)
+            if entry is not None:
+                ResponseCache._entries.move_to_end(key)
+                ResponseCache._hits += 1
+                return entry[0], 200, True, entry[1]
+            ResponseCache._misses += 1
+
+        result, status_code = produce()
+        # Same encoding Chalice applies to dict bodies, so hits and misses are byte-identical.
+        body: str = json.dumps(result, separators=(',', ':'))
+        etag: Optional[str] = etag_for(result) if etag_for is not None and status_code == 200 else None
+
+        if status_code == 200 and len(body) <= RESPONSE_CACHE_MAX_ENTRY_BYTES:
+            with ResponseCache._lock:
+                if generation == ResponseCache._generation:
+                    previous: Optional[Tuple[str, Optional[str]]] = ResponseCache._entries.pop(key, None)
+                    if previous is not None:
+                        ResponseCache._bytes -= len(previous[0])
+                    ResponseCache._entries[key] = (body, etag)
+                    ResponseCache._bytes += len(body)
+                    while ResponseCache._bytes > RESPONSE_CACHE_MAX_BYTES:
+                        _, (evicted, _) = ResponseCache._entries.popitem(last=False)
+                        ResponseCache._bytes -= len(evicted)
+
+        return body, status_code, False, etag
+
+    @staticmethod
+    def headers(hit: bool, etag: Optional[str] = None) -> Dict[str, str]:
+        headers: Dict[str, str] = {'Content-Type': 'application/json', RESPONSE_CACHE_HEADER: 'HIT' if hit else 'MISS'}
+        if etag is not None:
+            headers['ETag'] = etag
+        return headers
+
+    @staticmethod
+    def stats() -> Dict[str, int]:
+        with ResponseCache._lock:
+            return {
+                'entries': len(ResponseCache._entries),
+                'bytes': ResponseCache._bytes,
+                'hits': ResponseCache._hits,
+                'misses': ResponseCache._misses,
+                'invalidations': ResponseCache._invalidations
+            }
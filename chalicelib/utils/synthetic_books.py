@@ -0,0 +1,148 @@
+import random
+from typing import Optional, List, Iterator, Tuple
+from chalicelib.constants.api import (
+    SYNTHETIC_SEED,
+    SYNTHETIC_AUTHORS,
+    SYNTHETIC_BLOCK_SIZE,
+    SYNTHETIC_FIRST_YEAR,
+    SYNTHETIC_LAST_YEAR,
+    SYNTHETIC_MISSING_YEAR_RATE,
+    SYNTHETIC_MISSING_ISBN_RATE
+)
+
+BookRow = Tuple[str, str, Optional[int], Optional[str]]
+
+FIRST_NAMES: List[str] = [
+    'Ada', 'Alan', 'Alice', 'Amara', 'Anaïs', 'Anton', 'Beatrix', 'Björn', 'Carlos', 'Chloé',
+    'Clara', 'Daniel', 'Dmitri', 'Elena', 'Emil', 'Emily', 'Farah', 'Felix', 'Grace', 'Hana',
+    'Hugo', 'Ingrid', 'Isaac', 'Jane', 'José', 'Julia', 'Kenji', 'Laila', 'Leo', 'Lucía',
+    'Marcus', 'Margaret', 'Maya', 'Mei', 'Nadia', 'Nikolai', 'Noah', 'Olga', 'Omar', 'Priya',
+    'Rafael', 'Rosa', 'Samuel', 'Sofia', 'Søren', 'Tariq', 'Thomas', 'Ursula', 'Victor', 'Vera',
+    'Walter', 'Wen', 'Xavier', 'Yara', 'Yusuf', 'Zadie', 'Zoë', 'Hector', 'Ines', 'Oscar'
+]
+
+LAST_NAMES: List[str] = [
+    'Abbott', 'Achebe', 'Adeyemi', 'Alvarez', 'Andersen', 'Asimov', 'Atwood', 'Baldwin', 'Barnes', 'Bennett',
+    'Brontë', 'Calvino', 'Carver', 'Castillo', 'Chen', 'Christie', 'Collins', 'Cortázar', 'Dickens', 'Dostoevsky',
+    'Dumas', 'Eliot', 'Ellison', 'Faulkner', 'Fischer', 'Fitzgerald', 'Fontaine', 'García', 'Gibson', 'Gordimer',
+    'Hamid', 'Hardy', 'Hassan', 'Hemingway', 'Hughes', 'Ishiguro', 'Ivanova', 'James', 'Jansson', 'Kafka',
+    'Kawabata', 'Keller', 'Kim', 'Kowalski', 'Lagerlöf', 'Lee', 'Lindqvist', 'López', 'Mahfouz', 'Mann',
+    'Márquez', 'Miller', 'Mishima', 'Morrison', 'Müller', 'Murakami', 'Nakamura', 'Nguyen', 'Novak', 'Okafor',
+    'Orwell', 'Ozturk', 'Pamuk', 'Patel', 'Petrov', 'Pratchett', 'Quinn', 'Rahman', 'Rossi', 'Rowling',
+    'Rushdie', 'Saramago', 'Schmidt', 'Shelley', 'Silva', 'Smith', 'Sontag', 'Steinbeck', 'Tanaka', 'Tolkien',
+    'Tolstoy', 'Twain', 'Umar', 'Verne', 'Vonnegut', 'Walker', 'Wang', 'Wilde', 'Woolf', 'Xu',
+    'Yamamoto', 'Yilmaz', 'Zafón', 'Zhang', 'Zola', 'Ferrante', 'Grossman', 'Hugo', 'Lessing', 'Naipaul'
+]
+
+ADJECTIVES: List[str] = [
+    'Silent', 'Hidden', 'Last', 'Lost', 'Golden', 'Broken', 'Burning', 'Quiet', 'Distant', 'Secret',
+    'Forgotten', 'Endless', 'Crimson', 'Hollow', 'Wild', 'Frozen', 'Bitter', 'Bright', 'Dark', 'Little',
+    'Long', 'Midnight', 'Northern', 'Painted', 'Restless', 'Scarlet', 'Sleeping', 'Stolen', 'Strange', 'Sweet',
+    'Velvet', 'Wandering', 'Winter', 'Invisible', 'Iron', 'Glass', 'Electric', 'Ancient', 'Gentle', 'Savage',
+    'Shining', 'Sunken', 'Twisted', 'Whispering', 'Yellow', 'Blue', 'Empty', 'Falling', 'Final', 'First'
+]
+
+NOUNS: List[str] = [
+    'River', 'Garden', 'Night', 'Empire', 'Shadow', 'Letters', 'Ocean', 'Memory', 'Storm', 'Harbor',
+    'Crown', 'Echo', 'Forest', 'Lantern', 'Orchard', 'House', 'Mountain', 'City', 'Island', 'Kingdom',
+    'Daughter', 'Son', 'Mother', 'Stranger', 'Witness', 'Machine', 'Library', 'Map', 'Mirror', 'Road',
+    'Season', 'Silence', 'Summer', 'Sky', 'Star', 'Song', 'Stone', 'Sea', 'Sword', 'Tide',
+    'Tower', 'Valley', 'Voyage', 'War', 'Water', 'Wind', 'Wolf', 'World', 'Year', 'Heart',
+    'Bridge', 'Castle', 'Circle', 'Country', 'Dream', 'Door', 'Earth', 'Fire', 'Flame', 'Ghost',
+    'Girl', 'Boy', 'Hunter', 'Journey', 'Keeper', 'Lake', 'Light', 'Moon', 'Music', 'Name',
+    'Path', 'Promise', 'Queen', 'King', 'Rain', 'Secret', 'Shore', 'Soldier', 'Station', 'Thief',
+    'Time', 'Traveler', 'Truth', 'Village', 'Wedding', 'Widow', 'Window', 'Winter', 'Café', 'Señora'
+]
+
+TITLE_PATTERNS: List[str] = [
+    'The {adjective} {noun}',
+    'The {noun} of the {other}',
+    '{adjective} {noun}',
+    'A {noun} for the {other}',
+    '{noun} and {other}',
+    'The {noun}',
+    'The {adjective} {noun} of {other}',
+    'Beyond the {adjective} {noun}'
+]
+
+# Any odd multiplier not divisible by 5 spreads consecutive indexes over all 10^9 ISBN bodies.
+_ISBN_MULTIPLIER = 7919
+
+
+class SyntheticBooks:
+    """
+    Deterministic catalog of made-up books for benchmarks and imports.
+
+    Book ``i`` depends only on the seed and ``i``: books are drawn in blocks
+    of ``SYNTHETIC_BLOCK_SIZE``, each from its own generator seeded with the
+    block number, so a catalog can be grown or resumed from any position and
+    the first N books are the same whatever the final size. Authors come from
+    a fixed pool with a long tail (a few prolific authors, many with one
+    book), title words are skewed the same way, years lean recent and a
+    share of books has no year or ISBN. ISBN-13s carry a valid check digit and
+    are unique per position.
+    """
+
+    def __init__(self, seed: int = SYNTHETIC_SEED, authors: int = SYNTHETIC_AUTHORS) -> None:
+        self.seed: int = seed
+        self.authors: int = max(1, authors)
+        self._isbn_offset: int = random.Random(f'{seed}/isbn').randrange(10 ** 9)
+
+    @staticmethod
+    def author_name(index: int) -> str:
+        """The ``index``-th author of the pool; later tiers add middle initials to stay unique"""
+        first: str = FIRST_NAMES[index % len(FIRST_NAMES)]
+        last: str = LAST_NAMES[index // len(FIRST_NAMES) % len(LAST_NAMES)]
+        tier: int = index // (len(FIRST_NAMES) * len(LAST_NAMES))
+        initials: str = ''
+        while tier:
+            tier -= 1
+            initials = chr(ord('A') + tier % 26) + '. ' + initials
+            tier //= 26
+        return f'{first} {initials}{last}'
+
+    def isbn(self, index: int) -> str:
+        body: str = f'978{(index * _ISBN_MULTIPLIER + self._isbn_offset) % 10 ** 9:09d}'
+        total: int = sum(map(int, body[::2])) + 3 * sum(map(int, body[1::2]))
+        return f'{body[:3]}-{body[3]}-{body[4:8]}-{body[8:]}-{(10 - total % 10) % 10}'
+
+    def _block(self, block: int) -> List[BookRow]:
+        rng: random.Random = random.Random(f'{self.seed}/{block}')
+        draw = rng.random
+        year_span: int = SYNTHETIC_LAST_YEAR - SYNTHETIC_FIRST_YEAR + 1
+        start: int = block * SYNTHETIC_BLOCK_SIZE
+
+        books: List[BookRow] = []
+        for index in range(start, start + SYNTHETIC_BLOCK_SIZE):
+            title: str = TITLE_PATTERNS[int(len(TITLE_PATTERNS) * draw())].format(
+                adjective=ADJECTIVES[int(len(ADJECTIVES) * draw() ** 2)],
+                noun=NOUNS[int(len(NOUNS) * draw() ** 2)],
+                other=NOUNS[int(len(NOUNS) * draw() ** 2)]
+            )
+            author: str = self.author_name(int(self.authors * draw() ** 2))
+            year: Optional[int] = None
+            if draw() >= SYNTHETIC_MISSING_YEAR_RATE:
+                year = SYNTHETIC_LAST_YEAR - int(year_span * draw() ** 3)
+            isbn: Optional[str] = self.isbn(index) if draw() >= SYNTHETIC_MISSING_ISBN_RATE else None
+            books.append((title, author, year, isbn))
+        return books
+
+    def books(self, count: int, start: int = 0) -> Iterator[BookRow]:
+        """Books ``start`` to ``start + count - 1`` as ``(title, author, year, isbn)``"""
+        end: int = start + count
+        block: int = start // SYNTHETIC_BLOCK_SIZE
+        while start < end:
+            first: int = block * SYNTHETIC_BLOCK_SIZE
+            yield from self._block(block)[start - first:end - first]
+            start = first + SYNTHETIC_BLOCK_SIZE
+            block += 1
+
+    def batches(self, count: int, start: int = 0, size: int = SYNTHETIC_BLOCK_SIZE) -> Iterator[List[BookRow]]:
+        batch: List[BookRow] = []
+        for book in self.books(count, start):
+            batch.append(book)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
@@ -0,0 +1,36 @@
+import threading
+from typing import Optional, Any
+from chalice import Chalice
+from chalice.app import Request
+
+
+class ThreadLocalChalice(Chalice):
+    """
+    Chalice app whose ``current_request`` and ``lambda_context`` belong to
+    the calling thread.
+
+    Chalice stores the request being handled on the app object, which is
+    fine for Lambda (one request per process at a time) but lets a handler
+    read another thread's request as soon as one process serves requests
+    concurrently, e.g. from a load test or a threaded WSGI server.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._request_state: threading.local = threading.local()
+        super().__init__(*args, **kwargs)
+
+    @property
+    def current_request(self) -> Optional[Request]:
+        return getattr(self._request_state, 'current_request', None)
+
+    @current_request.setter
+    def current_request(self, request: Optional[Request]) -> None:
+        self._request_state.current_request = request
+
+    @property
+    def lambda_context(self) -> Any:
+        return getattr(self._request_state, 'lambda_context', None)
+
+    @lambda_context.setter
+    def lambda_context(self, context: Any) -> None:
+        self._request_state.lambda_context = context
@@ -1,9 +1,28 @@
 
-from typing import Dict, Optional, Tuple, Any
+import json
+from typing import Dict, Optional, Tuple, Any, List
 from chalicelib.constants.api import (
-    DEFAULT_PAGE, DEFAULT_PER_PAGE, MAX_PER_PAGE
+    DEFAULT_PAGE, DEFAULT_PER_PAGE, MAX_PER_PAGE, MATCH_CONTAINS, MATCH_MODES,
+    COUNT_EXACT, COUNT_MODES, FULL_TEXT_MIN_TERM_LENGTH,
+    EXPORT_FORMAT_NDJSON, EXPORT_FORMATS, BULK_MAX_BOOKS, BULK_MODE_ATOMIC, BULK_MODES,
+    ERROR_INVALID_IF_MATCH, CHANGES_DEFAULT_LIMIT, CHANGES_MAX_LIMIT,
+    SUGGEST_FIELDS, SUGGEST_DEFAULT_LIMIT, SUGGEST_MAX_LIMIT, FACETS_DEFAULT_LIMIT, FACETS_MAX_LIMIT,
+    BATCH_GET_MAX_IDS, IF_MATCH_NO_VERSION
 )
+from pydantic import ValidationError
 from chalicelib.utils.exceptions import ValidationException
+from chalicelib.utils.etags import SCHEMA_VERSION
+
+
+def format_validation_errors(validation_error: ValidationError) -> List[Dict[str, Any]]:
+    errors: List[Dict[str, Any]] = []
+    for error in validation_error.errors():
+        errors.append({
+            'field': '.'.join(str(loc) for loc in error['loc']),
+            'message': error['msg'],
+            'type': error['type']
+        })
+    return errors
 
 
 def parse_query_params(query_params: Dict[str, str]) -> Dict[str, Any]:
@@ -13,6 +32,9 @@ def parse_query_params(query_params: Dict[str, str]) -> Dict[str, Any]:
         'author': query_params.get('author'),
         'year': None,
         'title': query_params.get('title'),
+        'match': MATCH_CONTAINS,
+        'cursor': None,
+        'count': COUNT_EXACT,
     }
 
     if query_params.get('page'):
@@ -42,4 +64,191 @@ def parse_query_params(query_params: Dict[str, str]) -> Dict[str, Any]:
         except ValueError as e:
             raise ValidationException(f"Invalid year parameter: {str(e)}")
 
+    if query_params.get('match'):
+        match = query_params['match'].lower()
+        if match not in MATCH_MODES:
+            raise ValidationException(f"Invalid match parameter: must be one of {', '.join(MATCH_MODES)}")
+        parsed['match'] = match
+
+    if query_params.get('count'):
+        count = query_params['count'].lower()
+        if count not in COUNT_MODES:
+            raise ValidationException(f"Invalid count parameter: must be one of {', '.join(COUNT_MODES)}")
+        parsed['count'] = count
+
+    if 'cursor' in query_params:
+        parsed['cursor'] = query_params['cursor'] or ''
+
     return parsed
+
+
+def _parse_flag(query_params: Dict[str, str], name: str) -> bool:
+    value: str = (query_params.get(name) or 'false').lower()
+    if value not in ('true', 'false', '1', '0'):
+        raise ValidationException(f"Invalid {name} parameter: must be true or false")
+    return value in ('true', '1')
+
+
+def parse_search_params(query_params: Dict[str, str]) -> Dict[str, Any]:
+    query: str = (query_params.get('q') or '').strip()
+    if not query:
+        raise ValidationException("Missing required parameter: q")
+
+    terms = [term for term in query.split() if len(term) >= FULL_TEXT_MIN_TERM_LENGTH]
+    if not terms:
+        raise ValidationException(
+            f"Search query must contain a term of at least {FULL_TEXT_MIN_TERM_LENGTH} characters"
+        )
+
+    paging = parse_query_params({
+        'page': query_params.get('page'),
+        'per_page': query_params.get('per_page')
+    })
+
+    return {
+        'terms': terms,
+        'page': paging['page'],
+        'per_page': paging['per_page'],
+        'fuzzy': _parse_flag(query_params, 'fuzzy')
+    }
+
+
+def parse_export_params(query_params: Dict[str, str]) -> Dict[str, Any]:
+    export_format: str = (query_params.get('format') or EXPORT_FORMAT_NDJSON).lower()
+    if export_format not in EXPORT_FORMATS:
+        raise ValidationException(f"Invalid format parameter: must be one of {', '.join(EXPORT_FORMATS)}")
+
+    compress: bool = _parse_flag(query_params, 'gzip')
+
+    filters = parse_query_params({
+        key: query_params[key] for key in ('author', 'year', 'title', 'match') if key in query_params
+    })
+
+    return {
+        'export_format': export_format,
+        'compress': compress,
+        'author': filters['author'],
+        'year': filters['year'],
+        'title': filters['title'],
+        'match': filters['match']
+    }
+
+
+def parse_changes_params(query_params: Dict[str, str]) -> Dict[str, Any]:
+    try:
+        since: int = int(query_params.get('since') or 0)
+    except ValueError:
+        since = -1
+    if since < 0:
+        raise ValidationException("Invalid since parameter: use 0 or the next_since of a previous response")
+
+    limit: int = CHANGES_DEFAULT_LIMIT
+    if query_params.get('limit'):
+        try:
+            limit = int(query_params['limit'])
+        except ValueError:
+            limit = 0
+        if limit < 1 or limit > CHANGES_MAX_LIMIT:
+            raise ValidationException(f"Invalid limit parameter: must be between 1 and {CHANGES_MAX_LIMIT}")
+
+    return {'since': since, 'limit': limit}
+
+
+def parse_suggest_params(query_params: Dict[str, str]) -> Dict[str, Any]:
+    field: str = (query_params.get('field') or '').lower()
+    if field not in SUGGEST_FIELDS:
+        raise ValidationException(f"Invalid field parameter: must be one of {', '.join(SUGGEST_FIELDS)}")
+
+    prefix: str = (query_params.get('prefix') or '').strip()
+    if not prefix:
+        raise ValidationException("Missing required parameter: prefix")
+
+    limit: int = SUGGEST_DEFAULT_LIMIT
+    if query_params.get('limit'):
+        try:
+            limit = int(query_params['limit'])
+        except ValueError:
+            limit = 0
+        if limit < 1 or limit > SUGGEST_MAX_LIMIT:
+            raise ValidationException(f"Invalid limit parameter: must be between 1 and {SUGGEST_MAX_LIMIT}")
+
+    return {'field': field, 'prefix': prefix, 'limit': limit}
+
+
+def parse_facets_params(query_params: Dict[str, str]) -> Dict[str, Any]:
+    filters = parse_query_params({
+        key: query_params[key] for key in ('author', 'year', 'title', 'match') if key in query_params
+    })
+
+    limit: int = FACETS_DEFAULT_LIMIT
+    if query_params.get('limit'):
+        try:
+            limit = int(query_params['limit'])
+        except ValueError:
+            limit = 0
+        if limit < 1 or limit > FACETS_MAX_LIMIT:
+            raise ValidationException(f"Invalid limit parameter: must be between 1 and {FACETS_MAX_LIMIT}")
+
+    return {
+        'author': filters['author'],
+        'year': filters['year'],
+        'title': filters['title'],
+        'match': filters['match'],
+        'limit': limit
+    }
+
+
+def parse_bulk_request(query_params: Dict[str, str], raw_body: bytes, content_type: str) -> Dict[str, Any]:
+    mode: str = (query_params.get('mode') or BULK_MODE_ATOMIC).lower()
+    if mode not in BULK_MODES:
+        raise ValidationException(f"Invalid mode parameter: must be one of {', '.join(BULK_MODES)}")
+
+    try:
+        text: str = (raw_body or b'').decode('utf-8')
+        if 'ndjson' in (content_type or '').lower():
+            items: List[Any] = [json.loads(line) for line in text.splitlines() if line.strip()]
+        else:
+            items = json.loads(text) if text.strip() else []
+    except (UnicodeDecodeError, ValueError) as e:
+        raise ValidationException(f"Invalid request body: {str(e)}")
+
+    if not isinstance(items, list):
+        raise ValidationException("Request body must be a JSON array or NDJSON of books")
+    if not items:
+        raise ValidationException("Request body must contain at least one book")
+    if len(items) > BULK_MAX_BOOKS:
+        raise ValidationException(f"Too many books: at most {BULK_MAX_BOOKS} per request")
+
+    return {'items': items, 'mode': mode}
+
+
+def parse_batch_get_request(body: Any) -> Dict[str, Any]:
+    ids: Any = body.get('ids') if isinstance(body, dict) else None
+    if not isinstance(ids, list) or not ids:
+        raise ValidationException("Request body must be an object with a non-empty ids array")
+    if len(ids) > BATCH_GET_MAX_IDS:
+        raise ValidationException(f"Too many ids: at most {BATCH_GET_MAX_IDS} per request")
+    if not all(isinstance(book_id, int) and not isinstance(book_id, bool) and book_id > 0 for book_id in ids):
+        raise ValidationException("Invalid ids: every id must be a positive integer")
+
+    return {'ids': ids}
+
+
+def parse_if_match(header: Optional[str]) -> Optional[int]:
+    """Return the book version an If-Match header requires, or None when there is no precondition"""
+    if header is None or header.strip() == '*':
+        return None
+
+    value: str = header.strip()
+    if value.startswith('W/'):
+        # If-Match compares strongly, so a weak tag never matches.
+        return IF_MATCH_NO_VERSION
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        value = value[1:-1]
+    # Either a book ETag ("<schema version>-<version>") or the bare version from a response body.
+    schema, separator, version = value.rpartition('-')
+    if not all(part.isascii() and part.isdigit() for part in ((schema if separator else '0'), version)):
+        raise ValidationException(ERROR_INVALID_IF_MATCH)
+    if schema and int(schema) != SCHEMA_VERSION:
+        return IF_MATCH_NO_VERSION
+    return int(version)
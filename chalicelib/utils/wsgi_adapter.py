@@ -0,0 +1,92 @@
+import base64
+from http import HTTPStatus
+from typing import Optional, Dict, List, Any, Tuple, Callable, Iterable
+from urllib.parse import quote
+from chalice import Chalice
+from chalice.config import Config
+from chalice.local import LocalGateway, LocalGatewayException
+
+
+class WSGIAdapter:
+    """
+    Serves a Chalice app as a WSGI application.
+
+    Requests go through the same ``LocalGateway`` as ``chalice local``, so
+    routing, CORS, binary bodies and gateway errors behave exactly as they do
+    in development, and the app runs unchanged under any WSGI server. Threaded
+    workers need an app that keeps the current request per thread
+    (``ThreadLocalChalice``).
+    """
+
+    def __init__(self, app: Chalice, config: Optional[Config] = None) -> None:
+        self._gateway: LocalGateway = LocalGateway(app, config or Config.create())
+
+    @staticmethod
+    def _path(environ: Dict[str, Any]) -> str:
+        # PEP 3333 hands over the decoded path as latin-1; re-quote it the way it arrived on the wire.
+        raw: bytes = (environ.get('SCRIPT_NAME', '') + environ.get('PATH_INFO', '')).encode('latin-1')
+        path: str = quote(raw, safe="/;=,@:+$!*'()~") or '/'
+        query: str = environ.get('QUERY_STRING', '')
+        return f'{path}?{query}' if query else path
+
+    @staticmethod
+    def _headers(environ: Dict[str, Any]) -> Dict[str, str]:
+        headers: Dict[str, str] = {
+            key[5:].replace('_', '-').title(): value
+            for key, value in environ.items() if key.startswith('HTTP_')
+        }
+        for key, name in (('CONTENT_TYPE', 'Content-Type'), ('CONTENT_LENGTH', 'Content-Length')):
+            if environ.get(key):
+                headers[name] = environ[key]
+        return headers
+
+    @staticmethod
+    def _body(environ: Dict[str, Any]) -> Optional[bytes]:
+        length: int = int(environ.get('CONTENT_LENGTH') or 0)
+        if length > 0:
+            return environ['wsgi.input'].read(length)
+        if environ.get('wsgi.input_terminated'):
+            # Chunked uploads carry no length; the server marks the stream as safe to read to the end.
+            return environ['wsgi.input'].read() or None
+        return None
+
+    @staticmethod
+    def _status(code: int) -> str:
+        try:
+            return f'{code} {HTTPStatus(code).phrase}'
+        except ValueError:
+            return str(code)
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable[..., Any]) -> Iterable[bytes]:
+        multi_value_headers: Dict[str, List[str]] = {}
+        try:
+            response: Dict[str, Any] = self._gateway.handle_request(
+                method=environ['REQUEST_METHOD'],
+                path=self._path(environ),
+                headers=self._headers(environ),
+                body=self._body(environ)
+            )
+            code: int = response['statusCode']
+            headers: Dict[str, Any] = response['headers']
+            multi_value_headers = response.get('multiValueHeaders') or {}
+            body: Any = response.get('body')
+            if body and response.get('isBase64Encoded'):
+                body = base64.b64decode(body)
+        except LocalGatewayException as e:
+            code, headers, body = e.CODE, e.headers, e.body
+
+        if body is None:
+            body = b''
+        elif isinstance(body, str):
+            body = body.encode('utf-8')
+
+        header_list: List[Tuple[str, str]] = [
+            (name, str(value)) for name, value in headers.items() if name.lower() != 'content-length'
+        ]
+        header_list.extend((name, str(value)) for name, values in multi_value_headers.items() for value in values)
+        if body and not any(name.lower() == 'content-type' for name, _ in header_list):
+            header_list.append(('Content-Type', 'application/json'))
+        header_list.append(('Content-Length', str(len(body))))
+
+        start_response(self._status(code), header_list)
+        return [b''] if environ['REQUEST_METHOD'] == 'HEAD' else [body]
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Stream the book catalog to a file or stdout as NDJSON or CSV"""
+
+import argparse
+import sys
+import time
+
+from chalicelib.constants.api import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, MATCH_MODES
+from chalicelib.pagination.book_export import BookExport
+
+
+def export_books(args):
+    """Write export chunks as they are produced so memory stays flat"""
+    compress = args.gzip or (args.output or '').endswith('.gz')
+    chunks = BookExport.stream(
+        export_format=args.format,
+        compress=compress,
+        chunk_size=args.chunk_size,
+        author=args.author,
+        year=args.year,
+        title=args.title,
+        match=args.match
+    )
+
+    output = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    started = time.monotonic()
+    written = 0
+    try:
+        for chunk in chunks:
+            output.write(chunk)
+            written += len(chunk)
+    finally:
+        if args.output:
+            output.close()
+
+    elapsed = time.monotonic() - started
+    print(f"✓ Exported {written} bytes in {elapsed:.2f}s", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default=EXPORT_FORMATS[0], help='Output format')
+    parser.add_argument('--gzip', action='store_true', help='Gzip the output (implied by a .gz output file)')
+    parser.add_argument('--output', '-o', help='Output file (default: stdout)')
+    parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help='Rows fetched per round trip')
+    parser.add_argument('--author', help='Filter by author')
+    parser.add_argument('--year', type=int, help='Filter by publication year')
+    parser.add_argument('--title', help='Filter by title')
+    parser.add_argument('--match', choices=MATCH_MODES, default=MATCH_MODES[0], help='How title/author filters match')
+    export_books(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Write a deterministic synthetic catalog as CSV or NDJSON (optionally gzipped) for import_books.py"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import sys
+
+from chalicelib.constants.api import IMPORT_FORMAT_CSV, IMPORT_FORMATS, SYNTHETIC_SEED, SYNTHETIC_AUTHORS
+from chalicelib.services.book_import import BookImport
+from chalicelib.utils.synthetic_books import SyntheticBooks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('count', type=int, help='Books to write')
+    parser.add_argument('output', help='Output file; .gz is written as gzip')
+    parser.add_argument('--format', choices=IMPORT_FORMATS, help='Output format (default: from the file extension)')
+    parser.add_argument('--seed', type=int, default=SYNTHETIC_SEED, help='Same seed, same books')
+    parser.add_argument('--start', type=int, default=0, help='Position of the first book, to extend a catalog')
+    parser.add_argument('--authors', type=int, default=SYNTHETIC_AUTHORS, help='Size of the author pool')
+    args = parser.parse_args()
+
+    if args.count < 0 or args.start < 0:
+        parser.error('count and --start must not be negative')
+
+    output_format = args.format or BookImport.detect_format(args.output)
+    raw = gzip.open(args.output, 'wb') if args.output.endswith('.gz') else open(args.output, 'wb')
+    with io.TextIOWrapper(raw, encoding='utf-8', newline='') as stream:
+        books = SyntheticBooks(seed=args.seed, authors=args.authors).books(args.count, args.start)
+        if output_format == IMPORT_FORMAT_CSV:
+            writer = csv.writer(stream)
+            writer.writerow(['title', 'author', 'year', 'isbn'])
+            for title, author, year, isbn in books:
+                writer.writerow([title, author, '' if year is None else year, isbn or ''])
+        else:
+            for title, author, year, isbn in books:
+                book = {'title': title, 'author': author, 'year': year, 'isbn': isbn}
+                stream.write(json.dumps(book, ensure_ascii=False) + '\n')
+
+    print(f"✓ Wrote {args.count} books (seed {args.seed}, from #{args.start}) to {args.output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
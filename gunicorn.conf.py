@@ -0,0 +1,79 @@
+"""
+Gunicorn settings for serving the API with several pre-forked worker processes.
+
+    gunicorn --config gunicorn.conf.py wsgi:application
+
+Every setting can be overridden from the environment. Send SIGHUP to the
+master to reload code and settings gracefully: new workers start on the new
+code while the old ones finish their in-flight requests. The master never
+imports the application (modules it imported would be inherited, stale, by
+every reloaded worker); migrations run once in a separate interpreter before
+the first workers start, and each worker opens its own SQLite connections
+after the fork.
+
+Workers share their /metrics counters through METRICS_MULTIPROC_DIR (a fresh
+temporary directory unless set), so a scrape answered by any worker reports
+the whole server. It is emptied when the master starts, kept across reloads
+so counters carry on, and removed on shutdown when it was created here.
+"""
+
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+bind = os.getenv('WEB_BIND', f"0.0.0.0:{os.getenv('PORT', '8000')}")
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+# Threaded workers keep idle keep-alive connections open without tying up a process.
+worker_class = 'gthread'
+threads = int(os.getenv('WEB_THREADS', '4'))
+keepalive = int(os.getenv('WEB_KEEPALIVE_SECONDS', '5'))
+timeout = int(os.getenv('WEB_TIMEOUT_SECONDS', '60'))
+graceful_timeout = int(os.getenv('WEB_GRACEFUL_TIMEOUT_SECONDS', '30'))
+max_requests = int(os.getenv('WEB_MAX_REQUESTS', '0'))
+max_requests_jitter = int(os.getenv('WEB_MAX_REQUESTS_JITTER', '0'))
+# Preloading shares the imported app between workers copy-on-write, but SIGHUP then no longer reloads code.
+preload_app = os.getenv('WEB_PRELOAD', 'false').lower() in ('1', 'true', 'yes')
+
+accesslog = os.getenv('WEB_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.getenv('WEB_LOG_LEVEL', 'info')
+
+MIGRATE = 'from chalicelib.database.db import init_db; init_db()'
+
+# Set before any worker forks (or the app is preloaded), so every process reads the same directory.
+# This file is re-read on reload, but the master's pid, and so the default path, stays the same.
+DEFAULT_METRICS_DIR = os.path.join(tempfile.gettempdir(), f'library-api-metrics-{os.getpid()}')
+metrics_dir = os.environ.setdefault('METRICS_MULTIPROC_DIR', DEFAULT_METRICS_DIR)
+
+
+def _migrate(server):
+    server.log.info('Applying database migrations')
+    subprocess.run([sys.executable, '-c', MIGRATE], check=True)
+
+
+def on_starting(server):
+    # Files left by a previous run would carry its counters, and gauges of pids that may be reused.
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+    if not preload_app:
+        _migrate(server)
+
+
+def on_reload(server):
+    _migrate(server)
+
+
+def pre_fork(server, worker):
+    if preload_app:
+        # The preloaded app ran init_db() in the master; never hand its connections to a child.
+        from chalicelib.database.db import connection_pool, engine
+        connection_pool.close_all()
+        engine.dispose()
+
+
+def on_exit(server):
+    if metrics_dir == DEFAULT_METRICS_DIR:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
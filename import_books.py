@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Stream books from a CSV or NDJSON file (optionally gzipped) into the database, resuming after a crash"""
+
+import argparse
+import json
+import sys
+
+from chalicelib.constants.api import IMPORT_BATCH_SIZE, IMPORT_FORMATS
+from chalicelib.database.db import init_db
+from chalicelib.services.book_import import BookImport
+
+
+def report(summary):
+    print(f"  {summary['record']} records read, {summary['imported']} imported, {summary['rejected']} rejected "
+          f"({summary['rows_per_second']:.0f} rows/s)", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('source', help='CSV (with a title,author,year,isbn header) or NDJSON file; .gz is read as gzip')
+    parser.add_argument('--format', choices=IMPORT_FORMATS, help='Input format (default: from the file extension)')
+    parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE,
+                        help='Valid books inserted per transaction')
+    parser.add_argument('--rejects', help='Write rejected records with their errors to this NDJSON file')
+    parser.add_argument('--restart', action='store_true',
+                        help='Ignore the saved checkpoint and import the file from the beginning')
+    args = parser.parse_args()
+
+    if args.batch_size < 1:
+        parser.error('--batch-size must be at least 1')
+
+    init_db()
+    try:
+        summary = BookImport.import_file(
+            args.source,
+            import_format=args.format,
+            batch_size=args.batch_size,
+            rejects_path=args.rejects,
+            restart=args.restart,
+            progress=report
+        )
+    except (OSError, ValueError) as e:
+        print(f"✗ Import failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    action = 'Resumed and imported' if summary['resumed'] else 'Imported'
+    print(f"✓ {action} {summary['imported_this_run']} books in {summary['elapsed_seconds']:.2f}s "
+          f"({summary['rows_per_second']:.0f} rows/s), {summary['rejected']} rejected", file=sys.stderr)
+    print(json.dumps(summary))
+
+
+if __name__ == '__main__':
+    main()
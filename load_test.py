@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""Drive the Chalice app in-process from many threads with a weighted request mix and report per-route latency"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlencode
+
+os.environ.setdefault('DATABASE_PATH', os.path.join(tempfile.mkdtemp(prefix='load_test_'), 'load.db'))
+
+from chalice.config import Config
+from chalice.local import LocalGateway, LocalGatewayException
+
+from app import app
+from chalicelib.constants.api import SYNTHETIC_SEED
+from chalicelib.constants.db_queries import BookQueries
+from chalicelib.database.db import db_connection
+from chalicelib.repositories.book_repository import BookRepository
+from chalicelib.services.user_service import UserService
+from chalicelib.utils.exceptions import ConflictException
+from chalicelib.utils.synthetic_books import SyntheticBooks, ADJECTIVES, NOUNS, LAST_NAMES
+
+DEFAULT_MIX = 'login=1,list=4,filter=3,get=3,search=1,create=1,update=1'
+PASSWORD = 'Load-test-passw0rd'
+PER_PAGE = 20
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+
+class Context:
+    """Shared, read-only inputs for the scenarios: seeded catalog size, users and their tokens"""
+
+    def __init__(self, books, catalog_size, users):
+        self.books = books
+        self.catalog_size = catalog_size
+        self.users = users
+
+    def auth_headers(self, rng):
+        return {**JSON_HEADERS, 'Authorization': f'Bearer {rng.choice(self.users)[1]}'}
+
+
+# Each scenario returns (route, method, path, headers, body, expected statuses); route is the template
+# the report groups by.
+
+def login(rng, context):
+    body = {'username': rng.choice(context.users)[0], 'password': PASSWORD}
+    return 'POST /auth/login', 'POST', '/auth/login', JSON_HEADERS, body, (200,)
+
+
+def list_books(rng, context):
+    query = urlencode({'page': rng.randint(1, 50), 'per_page': PER_PAGE})
+    return 'GET /books', 'GET', f'/books?{query}', {}, None, (200,)
+
+
+def filter_books(rng, context):
+    filters = rng.choice([
+        {'author': rng.choice(LAST_NAMES).lower()},
+        {'year': rng.randint(1990, 2024)},
+        {'title': rng.choice(ADJECTIVES).lower(), 'match': 'prefix'},
+        {'author': rng.choice(LAST_NAMES).lower(), 'year': rng.randint(1990, 2024)}
+    ])
+    query = urlencode({**filters, 'page': 1, 'per_page': PER_PAGE})
+    return 'GET /books', 'GET', f'/books?{query}', {}, None, (200,)
+
+
+def get_book(rng, context):
+    book_id = rng.randint(1, context.catalog_size)
+    return 'GET /books/{book_id}', 'GET', f'/books/{book_id}', {}, None, (200,)
+
+
+def search_books(rng, context):
+    query = urlencode({'q': rng.choice(NOUNS).lower(), 'per_page': PER_PAGE})
+    return 'GET /books/search', 'GET', f'/books/search?{query}', {}, None, (200,)
+
+
+def create_book(rng, context):
+    body = {
+        'title': f'The {rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}',
+        'author': context.books.author_name(rng.randrange(context.books.authors)),
+        'year': rng.randint(1900, 2024),
+        'isbn': context.books.isbn(rng.randrange(10 ** 9))
+    }
+    return 'POST /books', 'POST', '/books', context.auth_headers(rng), body, (201,)
+
+
+def update_book(rng, context):
+    book_id = rng.randint(1, context.catalog_size)
+    body = {'title': f'{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}'}
+    return 'PUT /books/{book_id}', 'PUT', f'/books/{book_id}', context.auth_headers(rng), body, (200,)
+
+
+SCENARIOS = {
+    'login': login,
+    'list': list_books,
+    'filter': filter_books,
+    'get': get_book,
+    'search': search_books,
+    'create': create_book,
+    'update': update_book,
+}
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario '{name}', expected one of {', '.join(SCENARIOS)}")
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid weight for '{name}': {weight!r}")
+        if mix[name] < 0:
+            raise argparse.ArgumentTypeError(f"weight for '{name}' must not be negative")
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError('the mix needs at least one scenario with a positive weight')
+    return mix
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of already sorted samples"""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def prepare(books, catalog_size, user_count):
+    """Seed the catalog and register the users whose tokens the write scenarios send"""
+    with db_connection() as conn:
+        existing = conn.execute(BookQueries.SELECT_BOOK_STATS).fetchone()['row_count']
+    for batch in books.batches(max(0, catalog_size - existing), start=existing):
+        BookRepository.create_many(batch)
+
+    users = []
+    for i in range(user_count):
+        username = f'load_{i}'
+        try:
+            result, _ = UserService.register({'username': username, 'email': f'{username}@example.com', 'password': PASSWORD})
+        except ConflictException:
+            result, _ = UserService.login({'username': username, 'password': PASSWORD})
+        users.append((username, result['token']))
+    return Context(books, catalog_size, users)
+
+
+def send(gateway, method, path, headers, body):
+    payload = json.dumps(body).encode('utf-8') if body is not None else b''
+    try:
+        return gateway.handle_request(method=method, path=path, headers=dict(headers), body=payload)['statusCode']
+    except LocalGatewayException as e:
+        return e.CODE
+
+
+def run(context, mix, threads, duration, warmup, seed):
+    gateway = LocalGateway(app, Config.create())
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    stop = threading.Event()
+    results = [[] for _ in range(threads)]
+    measure_from = time.perf_counter() + warmup
+
+    def worker(index):
+        rng = random.Random(f'{seed}/{index}')
+        records = results[index]
+        while not stop.is_set():
+            scenario = rng.choices(names, weights)[0]
+            route, method, path, headers, body, expected = SCENARIOS[scenario](rng, context)
+            started = time.perf_counter()
+            try:
+                status = send(gateway, method, path, headers, body)
+            except Exception as e:
+                status = type(e).__name__
+            finished = time.perf_counter()
+            if started >= measure_from:
+                records.append((scenario, route, status, status in expected, finished - started))
+
+    workers = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    time.sleep(warmup + duration)
+    stop.set()
+    for thread in workers:
+        thread.join()
+    return [record for records in results for record in records]
+
+
+def summarize(records, duration):
+    latencies = sorted(record[4] for record in records)
+    errors = sum(1 for record in records if not record[3])
+    return {
+        'requests': len(records),
+        'requests_per_second': round(len(records) / duration, 1),
+        'errors': errors,
+        'error_rate': round(errors / len(records), 4) if records else 0.0,
+        'statuses': {str(status): count for status, count in sorted(Counter(record[2] for record in records).items(), key=str)},
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        'max_ms': round(latencies[-1] * 1000, 3) if latencies else 0.0
+    }
+
+
+def group(records, key, duration):
+    groups = {}
+    for record in records:
+        groups.setdefault(record[key], []).append(record)
+    return {name: summarize(group_records, duration) for name, group_records in sorted(groups.items())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, default=8, help='Concurrent client threads')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds to measure for')
+    parser.add_argument('--warmup', type=float, default=1.0, help='Seconds to run before measuring')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"Scenario weights as name=weight pairs (default: {DEFAULT_MIX})")
+    parser.add_argument('--books', type=int, default=10000, help='Synthetic books to seed before the run')
+    parser.add_argument('--users', type=int, default=8, help='Users to register for login and the write scenarios')
+    parser.add_argument('--seed', type=int, default=SYNTHETIC_SEED, help='Seed for the catalog and the request stream')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    if args.threads < 1 or args.books < 1 or args.users < 1 or args.duration <= 0 or args.warmup < 0:
+        parser.error('--threads, --books and --users must be at least 1 and --duration positive')
+
+    print(f'Seeding {args.books} books and {args.users} users...', file=sys.stderr)
+    context = prepare(SyntheticBooks(seed=args.seed), args.books, args.users)
+
+    print(f'Running {args.threads} threads for {args.duration:g}s (+{args.warmup:g}s warmup)...', file=sys.stderr)
+    records = run(context, args.mix, args.threads, args.duration, args.warmup, args.seed)
+
+    report = {
+        'meta': {
+            'threads': args.threads,
+            'duration_seconds': args.duration,
+            'mix': args.mix,
+            'books': args.books,
+            'users': args.users,
+            'seed': args.seed
+        },
+        'total': summarize(records, args.duration),
+        'routes': group(records, 1, args.duration),
+        'scenarios': group(records, 0, args.duration)
+    }
+
+    print(f"\n{'route':<24} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'errors':>7}", file=sys.stderr)
+    print('-' * 70, file=sys.stderr)
+    for name, stats in [*report['routes'].items(), ('total', report['total'])]:
+        print(f"{name:<24} {stats['requests_per_second']:>8.1f} {stats['p50_ms']:>7.2f}ms {stats['p95_ms']:>7.2f}ms "
+              f"{stats['p99_ms']:>7.2f}ms {stats['error_rate']:>6.1%}", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
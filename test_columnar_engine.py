@@ -0,0 +1,138 @@
+import os
+import random
+import tempfile
+from typing import Any, Dict, List
+
+os.environ['DATABASE_PATH'] = os.path.join(tempfile.mkdtemp(prefix='library_columnar_'), 'columnar.db')
+os.environ['BOOK_READ_ENGINE'] = 'sql'
+
+from chalicelib.constants.api import COUNT_EXACT, COUNT_NONE, MATCH_CONTAINS, MATCH_PREFIX
+from chalicelib.database.db import init_db
+from chalicelib.pagination.book_pagination import BookPagination
+from chalicelib.pagination.columnar_catalog import ColumnarCatalog
+from chalicelib.repositories.book_repository import BookRepository
+
+SEED_BOOKS = 3000
+WORDS = ['Silent', 'river', 'GARDEN', 'Night', 'Empire', 'Émile', 'Shadow', 'Letters', 'Ocean', 'Memory']
+AUTHORS = ['Fyodor Dostoevsky', 'Emily Brontë', 'frank herbert', 'Ursula K. Le Guin', 'ANNE CARSON', 'Author 7']
+
+QUERIES = [
+    ('First page', dict(count=COUNT_EXACT)),
+    ('Deep page', dict(page=40, per_page=25, count=COUNT_EXACT)),
+    ('Past the last page', dict(page=1000, per_page=50, count=COUNT_EXACT)),
+    ('No total', dict(page=3, count=COUNT_NONE)),
+    ('Year', dict(year=1987, count=COUNT_EXACT)),
+    ('Author contains', dict(author='dostoevsky', count=COUNT_EXACT)),
+    ('Author contains non-ASCII', dict(author='Brontë', count=COUNT_EXACT)),
+    ('Title contains', dict(title='night', per_page=50, count=COUNT_EXACT)),
+    ('Title prefix', dict(title='ocean', match=MATCH_PREFIX, count=COUNT_EXACT)),
+    ('Author prefix mixed case', dict(author='FRANK', match=MATCH_PREFIX, count=COUNT_EXACT)),
+    ('Author + year', dict(author='author 7', year=2001, match=MATCH_CONTAINS, count=COUNT_EXACT)),
+    ('No match', dict(title='zzz', count=COUNT_EXACT)),
+]
+
+COMPARED_KEYS = ('books', 'total', 'total_pages', 'has_more')
+
+
+class ColumnarEngineTester:
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+        self.catalog = ColumnarCatalog(enabled=True)
+
+    def print_result(self, test_name: str, passed: bool, message: str = '') -> None:
+        status = '✓ PASS' if passed else '✗ FAIL'
+        print(f'{status}: {test_name}')
+        if message:
+            print(f'  └─ {message}')
+
+    def print_section(self, title: str) -> None:
+        print(f'\n{"="*60}')
+        print(f'{title}')
+        print(f'{"="*60}')
+
+    def track_result(self, passed: bool) -> None:
+        if passed:
+            self.passed += 1
+        else:
+            self.failed += 1
+
+    def check_same_page(self, test_name: str, params: Dict[str, Any]) -> bool:
+        sql: Dict[str, Any] = BookPagination.paginate(**params)
+        columnar: Dict[str, Any] = self.catalog.paginate(**params)
+        differences: List[str] = [key for key in COMPARED_KEYS if sql[key] != columnar[key]]
+        passed = not differences
+        message = f"{len(sql['books'])} books, total {sql['total']}"
+        if differences:
+            message = (f"differs in {', '.join(differences)}: "
+                       f"sql total {sql['total']}, columnar total {columnar['total']}")
+        self.print_result(test_name, passed, message)
+        self.track_result(passed)
+        return passed
+
+    def test_engines_agree(self, section: str) -> None:
+        """Test: every listing query returns the same page from SQLite and the columnar engine"""
+        self.print_section(section)
+        for name, params in QUERIES:
+            self.check_same_page(name, params)
+
+    def test_engine_disabled_by_default(self) -> bool:
+        """Test: BOOK_READ_ENGINE=sql keeps listings on SQLite"""
+        self.print_section('ENGINE SELECTION')
+        passed = not ColumnarCatalog(enabled=False).can_answer('dostoevsky', None, MATCH_CONTAINS)
+        self.print_result('Disabled engine answers nothing', passed)
+        self.track_result(passed)
+        return passed
+
+    def test_wildcards_stay_on_sql(self) -> bool:
+        """Test: contains filters with LIKE wildcards are left to SQLite"""
+        passed = (not self.catalog.can_answer('50%', None, MATCH_CONTAINS)
+                  and self.catalog.can_answer('50%', None, MATCH_PREFIX))
+        self.print_result('LIKE wildcards fall back to SQL', passed)
+        self.track_result(passed)
+        return passed
+
+    def seed(self) -> None:
+        rng = random.Random(7)
+        BookRepository.create_many([
+            (' '.join(rng.sample(WORDS, 3)), rng.choice(AUTHORS), rng.choice([None] + list(range(1980, 2010))), None)
+            for _ in range(SEED_BOOKS)
+        ])
+
+    def change_catalog(self) -> None:
+        rng = random.Random(11)
+        for book_id in rng.sample(range(1, SEED_BOOKS + 1), 200):
+            BookRepository.update(book_id, title=f'Night Ocean {book_id}', author=rng.choice(AUTHORS), year=1987)
+        for book_id in rng.sample(range(1, SEED_BOOKS + 1), 150):
+            BookRepository.delete(book_id)
+        BookRepository.create_many([(f'Ocean Letters {n}', 'Emily Brontë', 2001, None) for n in range(100)])
+
+    def run_all_tests(self) -> None:
+        init_db()
+        self.seed()
+
+        self.test_engine_disabled_by_default()
+        self.test_wildcards_stay_on_sql()
+        self.test_engines_agree('FRESH CATALOG')
+
+        self.change_catalog()
+        self.test_engines_agree('AFTER UPDATES AND DELETES')
+
+        self.print_summary()
+
+    def print_summary(self) -> None:
+        """Print test summary"""
+        self.print_section('TEST SUMMARY')
+        total = self.passed + self.failed
+        percentage = (self.passed / total * 100) if total > 0 else 0
+
+        print(f'Total Tests: {total}')
+        print(f'Passed: {self.passed} ✓')
+        print(f'Failed: {self.failed} ✗')
+        print(f'Success Rate: {percentage:.1f}%')
+        print(f'{"="*60}\n')
+
+
+if __name__ == '__main__':
+    tester = ColumnarEngineTester()
+    tester.run_all_tests()
@@ -175,6 +175,27 @@ class APITester:
         self.track_result(passed)
         return passed
 
+    def test_logout_revokes_token(self) -> bool:
+        """Test: A token stops working after logout"""
+        payload = {
+            'username': self.test_username,
+            'password': self.test_password
+        }
+        login_response = requests.post(f'{BASE_URL}/auth/login', json=payload)
+        if login_response.status_code != 200:
+            self.print_result('Logout revokes token', False, f'Login status: {login_response.status_code}')
+            self.track_result(False)
+            return False
+
+        headers = {'Authorization': f'Bearer {login_response.json()["token"]}'}
+        logout_response = requests.post(f'{BASE_URL}/auth/logout', headers=headers)
+        book_response = requests.post(f'{BASE_URL}/books', json={'title': 'Revoked', 'author': 'Nobody'}, headers=headers)
+        passed = logout_response.status_code == 200 and book_response.status_code == 401
+        self.print_result('Logout revokes token', passed,
+                          f'Logout: {logout_response.status_code}, after logout: {book_response.status_code}')
+        self.track_result(passed)
+        return passed
+
     def test_create_book_with_token(self) -> bool:
         """Test: Create book with valid token"""
         self.print_section('BOOKS - CRUD Operations')
@@ -202,6 +223,41 @@ class APITester:
         
         return passed
 
+    def test_create_books_bulk(self) -> bool:
+        """Test: Create several books in one request"""
+        if not self.token:
+            self.print_result('Create books in bulk', False, 'No token available')
+            self.track_result(False)
+            return False
+
+        payload = [
+            {'title': 'Refactoring', 'author': 'Martin Fowler', 'year': 1999},
+            {'title': 'The Pragmatic Programmer', 'author': 'Andrew Hunt', 'year': 1999}
+        ]
+
+        headers = {'Authorization': f'Bearer {self.token}'}
+        response = requests.post(f'{BASE_URL}/books/bulk', json=payload, headers=headers)
+        passed = response.status_code == 201
+
+        if passed:
+            results = response.json().get('results', [])
+            passed = len(results) == 2 and all(result.get('book_id') for result in results)
+            self.book_ids.extend(result.get('book_id') for result in results)
+
+        self.print_result('Create books in bulk', passed, f'Status: {response.status_code}')
+        self.track_result(passed)
+        return passed
+
+    def test_create_books_bulk_atomic_failure(self) -> bool:
+        """Test: One invalid book rejects the whole atomic batch"""
+        headers = {'Authorization': f'Bearer {self.token}'}
+        payload = [{'title': 'Valid Book', 'author': 'Someone'}, {'title': '', 'author': 'Nobody'}]
+        response = requests.post(f'{BASE_URL}/books/bulk', json=payload, headers=headers)
+        passed = response.status_code == 400 and response.json().get('created') == 0
+        self.print_result('Create books in bulk (atomic failure)', passed, f'Status: {response.status_code}')
+        self.track_result(passed)
+        return passed
+
     def test_create_book_without_token(self) -> bool:
         """Test: Create book without token (should fail)"""
         payload = {
@@ -314,6 +370,56 @@ class APITester:
         self.track_result(passed)
         return passed
 
+    def test_get_books_without_count(self) -> bool:
+        """Test: count=none skips the total and reports has_more"""
+        params = {'page': 1, 'per_page': 1, 'count': 'none'}
+        response = requests.get(f'{BASE_URL}/books', params=params)
+        passed = response.status_code == 200
+
+        if passed:
+            data = response.json()
+            passed = data.get('total') is None and isinstance(data.get('has_more'), bool)
+            message = f'Total: {data.get("total")}, Has More: {data.get("has_more")}'
+        else:
+            message = f'Status: {response.status_code}'
+
+        self.print_result('Get books without count', passed, message)
+        self.track_result(passed)
+        return passed
+
+    def test_get_books_with_cursor(self) -> bool:
+        """Test: Walk books with keyset cursors"""
+        params = {'cursor': '', 'per_page': 1}
+        response = requests.get(f'{BASE_URL}/books', params=params)
+        passed = response.status_code == 200
+
+        if passed:
+            first_page = response.json()
+            next_cursor = first_page.get('next_cursor')
+            passed = 'next_cursor' in first_page and first_page.get('prev_cursor') is None
+            message = f'Books: {len(first_page.get("books", []))}, next_cursor: {bool(next_cursor)}'
+
+            if passed and next_cursor:
+                response = requests.get(f'{BASE_URL}/books', params={'cursor': next_cursor, 'per_page': 1})
+                second_page = response.json()
+                passed = (response.status_code == 200 and second_page.get('prev_cursor') is not None
+                          and second_page['books'][0]['id'] != first_page['books'][0]['id'])
+                message += f', second page status: {response.status_code}'
+        else:
+            message = f'Status: {response.status_code}'
+
+        self.print_result('Get books with cursor', passed, message)
+        self.track_result(passed)
+        return passed
+
+    def test_get_books_with_invalid_cursor(self) -> bool:
+        """Test: Malformed cursor is rejected"""
+        response = requests.get(f'{BASE_URL}/books', params={'cursor': 'not-a-cursor'})
+        passed = response.status_code == 400
+        self.print_result('Get books with invalid cursor', passed, f'Status: {response.status_code}')
+        self.track_result(passed)
+        return passed
+
     def test_get_books_with_title_filter(self) -> bool:
         """Test: Get books filtered by title"""
         params = {'title': 'Clean'}
@@ -348,6 +454,87 @@ class APITester:
         self.track_result(passed)
         return passed
 
+    def test_search_books(self) -> bool:
+        """Test: Full-text search ranks and highlights matches"""
+        response = requests.get(f'{BASE_URL}/books/search', params={'q': 'Clean'})
+        passed = response.status_code == 200
+
+        if passed:
+            data = response.json()
+            books = data.get('books', [])
+            passed = all('score' in book and 'highlights' in book for book in books)
+            message = f'Books found: {len(books)}'
+        else:
+            message = f'Status: {response.status_code}'
+
+        self.print_result('Search books', passed, message)
+        self.track_result(passed)
+        return passed
+
+    def test_search_books_fuzzy(self) -> bool:
+        """Test: Fuzzy search finds a misspelled title and reports the correction"""
+        response = requests.get(f'{BASE_URL}/books/search', params={'q': 'Refactorng', 'fuzzy': 'true'})
+        data = response.json() if response.status_code == 200 else {}
+        titles = [book['title'] for book in data.get('books', [])]
+        passed = 'Refactoring' in titles and data.get('corrections', {}).get('Refactorng') == 'refactoring'
+        self.print_result('Fuzzy search books', passed, f'Status: {response.status_code}, titles: {titles[:3]}')
+        self.track_result(passed)
+        return passed
+
+    def test_search_books_missing_query(self) -> bool:
+        """Test: Search without q is rejected"""
+        response = requests.get(f'{BASE_URL}/books/search')
+        passed = response.status_code == 400
+        self.print_result('Search books without query', passed, f'Status: {response.status_code}')
+        self.track_result(passed)
+        return passed
+
+    def test_suggest_books(self) -> bool:
+        """Test: Title suggestions complete a case-insensitive prefix"""
+        response = requests.get(f'{BASE_URL}/books/suggest', params={'field': 'title', 'prefix': 'clean c'})
+        suggestions = response.json().get('suggestions', []) if response.status_code == 200 else []
+        passed = any(suggestion['value'] == 'Clean Code' for suggestion in suggestions)
+        self.print_result('Suggest book titles', passed, f'Status: {response.status_code}, suggestions: {len(suggestions)}')
+        self.track_result(passed)
+        return passed
+
+    def test_suggest_books_invalid_field(self) -> bool:
+        """Test: Suggestions for an unsupported field are rejected"""
+        response = requests.get(f'{BASE_URL}/books/suggest', params={'field': 'isbn', 'prefix': '978'})
+        passed = response.status_code == 400
+        self.print_result('Suggest with invalid field', passed, f'Status: {response.status_code}')
+        self.track_result(passed)
+        return passed
+
+    def test_book_facets(self) -> bool:
+        """Test: Facets count every book and bucket years into decades"""
+        response = requests.get(f'{BASE_URL}/books/facets')
+        data = response.json() if response.status_code == 200 else {}
+        years = sum(bucket['count'] for bucket in data.get('years', []))
+        decades = sum(bucket['count'] for bucket in data.get('decades', []))
+        passed = response.status_code == 200 and years == decades and years + data.get('unknown_year', 0) == data['total']
+        self.print_result('Book facets', passed, f"Status: {response.status_code}, total: {data.get('total')}")
+        self.track_result(passed)
+        return passed
+
+    def test_export_books(self) -> bool:
+        """Test: Export the catalog as NDJSON and CSV"""
+        response = requests.get(f'{BASE_URL}/books/export')
+        passed = response.status_code == 200 and response.headers.get('Content-Type') == 'application/x-ndjson'
+
+        if passed:
+            lines = [line for line in response.text.splitlines() if line]
+            passed = all('id' in json.loads(line) for line in lines)
+            csv_response = requests.get(f'{BASE_URL}/books/export', params={'format': 'csv'})
+            passed = passed and csv_response.status_code == 200 and csv_response.text.startswith('id,title,author')
+            message = f'NDJSON rows: {len(lines)}, CSV status: {csv_response.status_code}'
+        else:
+            message = f'Status: {response.status_code}'
+
+        self.print_result('Export books', passed, message)
+        self.track_result(passed)
+        return passed
+
     def test_get_book_by_id(self) -> bool:
         """Test: Get book by ID"""
         if not self.book_ids:
@@ -372,6 +559,60 @@ class APITester:
         self.track_result(passed)
         return passed
 
+    def test_get_book_cache_headers(self) -> bool:
+        """Test: Repeated reads return the same body and ETag, whichever worker (and its cache) answers"""
+        if not self.book_ids:
+            self.print_result('Get book cache headers', False, 'No book IDs available')
+            self.track_result(False)
+            return False
+
+        book_id = self.book_ids[0]
+        first = requests.get(f'{BASE_URL}/books/{book_id}')
+        second = requests.get(f'{BASE_URL}/books/{book_id}')
+        # Each worker process has its own response cache, so X-Cache may be HIT or MISS on either read.
+        passed = (first.status_code == 200 and second.status_code == 200 and first.content == second.content
+                  and first.headers.get('ETag') is not None and first.headers.get('ETag') == second.headers.get('ETag')
+                  and {first.headers.get('X-Cache'), second.headers.get('X-Cache')} <= {'HIT', 'MISS'})
+        self.print_result('Get book cache headers', passed,
+                          f'ETag: {first.headers.get("ETag")}, then {second.headers.get("ETag")}; '
+                          f'X-Cache: {first.headers.get("X-Cache")}, then {second.headers.get("X-Cache")}')
+        self.track_result(passed)
+        return passed
+
+    def test_get_book_not_modified(self) -> bool:
+        """Test: If-None-Match with the current ETag answers 304"""
+        if not self.book_ids:
+            self.print_result('Get book not modified', False, 'No book IDs available')
+            self.track_result(False)
+            return False
+
+        book_id = self.book_ids[0]
+        etag = requests.get(f'{BASE_URL}/books/{book_id}').headers.get('ETag')
+        response = requests.get(f'{BASE_URL}/books/{book_id}', headers={'If-None-Match': etag or ''})
+        passed = etag is not None and response.status_code == 304
+        self.print_result('Get book not modified', passed, f'ETag: {etag}, status: {response.status_code}')
+        self.track_result(passed)
+        return passed
+
+    def test_batch_get_books(self) -> bool:
+        """Test: Batch get keeps request order and marks missing ids"""
+        if not self.book_ids:
+            self.print_result('Batch get books', False, 'No book IDs available')
+            self.track_result(False)
+            return False
+
+        ids = [self.book_ids[-1], 99999, self.book_ids[0]]
+        response = requests.post(f'{BASE_URL}/books/batch-get', json={'ids': ids})
+        results = response.json().get('results', []) if response.status_code == 200 else []
+        passed = (
+            [result['id'] for result in results] == ids
+            and [result['found'] for result in results] == [True, False, True]
+            and results[1]['book'] is None
+        )
+        self.print_result('Batch get books', passed, f'Status: {response.status_code}')
+        self.track_result(passed)
+        return passed
+
     def test_get_nonexistent_book(self) -> bool:
         """Test: Get nonexistent book (should fail)"""
         response = requests.get(f'{BASE_URL}/books/99999')
@@ -403,6 +644,46 @@ class APITester:
         self.track_result(passed)
         return passed
 
+    def test_update_book_if_match(self) -> bool:
+        """Test: If-Match applies the current version and rejects a stale one"""
+        if not self.book_ids or not self.token:
+            self.print_result('Update book with If-Match', False, 'No book IDs or token available')
+            self.track_result(False)
+            return False
+
+        book_id = self.book_ids[0]
+        read = requests.get(f'{BASE_URL}/books/{book_id}')
+        headers = {'Authorization': f'Bearer {self.token}', 'If-Match': read.headers.get('ETag', '')}
+        current = requests.put(f'{BASE_URL}/books/{book_id}', json={'year': 2008}, headers=headers)
+        stale = requests.put(f'{BASE_URL}/books/{book_id}', json={'year': 2009}, headers=headers)
+        headers['If-Match'] = f'"{current.json().get("version")}"'
+        by_version = requests.put(f'{BASE_URL}/books/{book_id}', json={'year': 2009}, headers=headers)
+        passed = current.status_code == 200 and stale.status_code == 412 and by_version.status_code == 200
+        self.print_result('Update book with If-Match', passed,
+                          f'Current ETag: {current.status_code}, stale ETag: {stale.status_code}, '
+                          f'bare version: {by_version.status_code}')
+        self.track_result(passed)
+        return passed
+
+    def test_update_book_if_match_invalid(self) -> bool:
+        """Test: A malformed If-Match is rejected and a weak tag never matches"""
+        if not self.book_ids or not self.token:
+            self.print_result('Update book with invalid If-Match', False, 'No book IDs or token available')
+            self.track_result(False)
+            return False
+
+        book_id = self.book_ids[0]
+        version = requests.get(f'{BASE_URL}/books/{book_id}').json()['book']['version']
+        statuses = [
+            requests.put(f'{BASE_URL}/books/{book_id}', json={'year': 2009},
+                         headers={'Authorization': f'Bearer {self.token}', 'If-Match': if_match}).status_code
+            for if_match in ('"²"', 'abc', f'W/"{version}"')
+        ]
+        passed = statuses == [400, 400, 412]
+        self.print_result('Update book with invalid If-Match', passed, f'Statuses: {statuses}')
+        self.track_result(passed)
+        return passed
+
     def test_update_book_without_token(self) -> bool:
         """Test: Update book without token (should fail)"""
         if not self.book_ids:
@@ -485,9 +766,47 @@ class APITester:
         
         if passed:
             self.book_ids.remove(book_id)
+            self.deleted_book_id = book_id
         
         return passed
 
+    def test_book_changes_tombstone(self) -> bool:
+        """Test: The change feed pages through to a tombstone for the deleted book"""
+        deleted_book_id = getattr(self, 'deleted_book_id', None)
+        if deleted_book_id is None:
+            self.print_result('Book changes tombstone', False, 'No deleted book available')
+            self.track_result(False)
+            return False
+
+        since, changes, pages = '0', [], 0
+        while True:
+            response = requests.get(f'{BASE_URL}/books/changes', params={'since': since, 'limit': 50})
+            if response.status_code != 200:
+                break
+            data = response.json()
+            changes.extend(data['changes'])
+            since, pages = data['next_since'], pages + 1
+            if not data['has_more']:
+                break
+
+        tombstones = [change for change in changes if change['op'] == 'delete']
+        passed = response.status_code == 200 and any(change['book_id'] == deleted_book_id for change in tombstones)
+        self.print_result('Book changes tombstone', passed,
+                          f'Pages: {pages}, changes: {len(changes)}, tombstones: {len(tombstones)}')
+        self.track_result(passed)
+        return passed
+
+    def test_book_changes_invalid_since(self) -> bool:
+        """Test: A since token that is not a non-negative integer is rejected"""
+        statuses = [
+            requests.get(f'{BASE_URL}/books/changes', params={'since': since}).status_code
+            for since in ('²', '-1', 'abc')
+        ]
+        passed = statuses == [400, 400, 400]
+        self.print_result('Book changes invalid since', passed, f'Statuses: {statuses}')
+        self.track_result(passed)
+        return passed
+
     def test_validator_empty_username(self) -> bool:
         """Test: Validator - Empty username"""
         self.print_section('VALIDATORS - Field Validation')
@@ -585,6 +904,21 @@ class APITester:
         self.track_result(passed)
         return passed
 
+    def test_metrics_endpoint(self) -> bool:
+        """Test: GET /metrics exposes per-route request metrics"""
+        self.print_section('METRICS')
+
+        response = requests.get(f'{BASE_URL}/metrics')
+        passed = (
+            response.status_code == 200
+            and response.headers.get('Content-Type', '').startswith('text/plain')
+            and 'library_http_request_duration_seconds_bucket{method="GET",route="/books/{book_id}"' in response.text
+            and 'library_component_seconds_total{component="db"}' in response.text
+        )
+        self.print_result('Get metrics', passed, f'Status: {response.status_code}')
+        self.track_result(passed)
+        return passed
+
     def run_all_tests(self) -> None:
         """Run all tests"""
         print('\n' + '='*60)
@@ -601,8 +935,11 @@ class APITester:
         self.test_login_invalid_username()
         self.test_login_invalid_password()
         self.test_login_missing_fields()
+        self.test_logout_revokes_token()
 
         self.test_create_book_with_token()
+        self.test_create_books_bulk()
+        self.test_create_books_bulk_atomic_failure()
         self.test_create_book_without_token()
         self.test_create_book_invalid_token()
         self.test_create_book_missing_required_fields()
@@ -611,13 +948,28 @@ class APITester:
 
         self.test_get_all_books()
         self.test_get_books_with_pagination()
+        self.test_get_books_without_count()
+        self.test_get_books_with_cursor()
+        self.test_get_books_with_invalid_cursor()
         self.test_get_books_with_title_filter()
         self.test_get_books_with_author_filter()
         self.test_get_books_with_year_filter()
+        self.test_search_books()
+        self.test_search_books_fuzzy()
+        self.test_search_books_missing_query()
+        self.test_suggest_books()
+        self.test_suggest_books_invalid_field()
+        self.test_book_facets()
+        self.test_export_books()
         self.test_get_book_by_id()
+        self.test_get_book_cache_headers()
+        self.test_get_book_not_modified()
+        self.test_batch_get_books()
         self.test_get_nonexistent_book()
 
         self.test_update_book_with_token()
+        self.test_update_book_if_match()
+        self.test_update_book_if_match_invalid()
         self.test_update_book_without_token()
         self.test_update_nonexistent_book()
         self.test_update_book_invalid_year()
@@ -625,6 +977,8 @@ class APITester:
         self.test_delete_book_without_token()
         self.test_delete_nonexistent_book()
         self.test_delete_book_with_token()
+        self.test_book_changes_tombstone()
+        self.test_book_changes_invalid_since()
 
         self.test_validator_empty_username()
         self.test_validator_empty_email()
@@ -635,6 +989,8 @@ class APITester:
         self.test_error_handling_invalid_method()
         self.test_error_handling_nonexistent_endpoint()
 
+        self.test_metrics_endpoint()
+
         self.print_summary()
 
     def print_summary(self) -> None:
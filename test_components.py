@@ -0,0 +1,491 @@
+import gzip
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from wsgiref.util import setup_testing_defaults
+
+os.environ['DATABASE_PATH'] = os.path.join(tempfile.mkdtemp(prefix='library_components_'), 'components.db')
+os.environ.setdefault('BCRYPT_ROUNDS', '4')
+
+from chalice.config import Config
+from chalice.local import LocalGateway
+from app import app
+from chalicelib.constants.api import BCRYPT_RETRY_AFTER_SECONDS, ERROR_AUTH_BUSY
+from chalicelib.database.db import (
+    ConnectionPool,
+    PoolTimeoutError,
+    PRAGMA_PROFILE,
+    apply_pragmas,
+    db_connection,
+    init_db,
+    load_pragma_profile
+)
+from chalicelib.pagination.book_pagination import BookPagination
+from chalicelib.repositories.book_repository import BookRepository
+from chalicelib.services.book_import import BookImport
+from chalicelib.services.password_hasher import PasswordHasher, password_hasher
+from chalicelib.services.token_cache import TokenCache
+from chalicelib.services.token_revocation import TokenRevocationList
+from chalicelib.services.user_service import UserService
+from chalicelib.utils.exceptions import ServiceUnavailableException
+from chalicelib.utils.wsgi_adapter import WSGIAdapter
+
+# bcrypt cost that keeps a hash running long enough to hold the pool busy.
+SLOW_BCRYPT_ROUNDS = 14
+
+# How SQLite reports the keyword values the profiles use.
+PRAGMA_KEYWORDS = {
+    'synchronous': {'OFF': 0, 'NORMAL': 1, 'FULL': 2, 'EXTRA': 3},
+    'temp_store': {'DEFAULT': 0, 'FILE': 1, 'MEMORY': 2}
+}
+
+
+class ComponentTester:
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+        self.gateway = LocalGateway(app, Config.create())
+        self.application = WSGIAdapter(app)
+
+    def print_result(self, test_name: str, passed: bool, message: str = '') -> None:
+        status = '✓ PASS' if passed else '✗ FAIL'
+        print(f'{status}: {test_name}')
+        if message:
+            print(f'  └─ {message}')
+
+    def print_section(self, title: str) -> None:
+        print(f'\n{"="*60}')
+        print(f'{title}')
+        print(f'{"="*60}')
+
+    def track_result(self, passed: bool) -> None:
+        if passed:
+            self.passed += 1
+        else:
+            self.failed += 1
+
+    def test_pool_reuses_connection(self) -> bool:
+        """Test: a released connection is handed out again instead of opening a new one"""
+        self.print_section('CONNECTION POOL')
+        pool = ConnectionPool(max_size=2)
+        first = pool.acquire()
+        pool.release(first)
+        second = pool.acquire()
+        pool.release(second)
+        stats = pool.stats()
+        passed = second is first and stats['created'] == 1 and stats['idle'] == 1
+        self.print_result('Released connection is reused', passed, f'Stats: {stats}')
+        self.track_result(passed)
+        pool.close_all()
+        return passed
+
+    def test_pool_concurrent_checkouts(self) -> bool:
+        """Test: connections checked out at the same time are distinct"""
+        pool = ConnectionPool(max_size=2)
+        first = pool.acquire()
+        second = pool.acquire()
+        stats = pool.stats()
+        passed = first is not second and stats['in_use'] == 2 and stats['size'] == 2
+        self.print_result('Concurrent checkouts get separate connections', passed, f'Stats: {stats}')
+        self.track_result(passed)
+        pool.release(first)
+        pool.release(second)
+        pool.close_all()
+        return passed
+
+    def test_pool_waits_for_release(self) -> bool:
+        """Test: a checkout on a full pool waits and gets the connection released by another thread"""
+        pool = ConnectionPool(max_size=1, timeout=2.0)
+        held = pool.acquire()
+        releaser = threading.Timer(0.1, pool.release, args=(held,))
+        releaser.start()
+        conn = pool.acquire()
+        releaser.join()
+        stats = pool.stats()
+        passed = conn is held and stats['waits'] == 1 and stats['timeouts'] == 0 and stats['created'] == 1
+        self.print_result('Full pool hands over a released connection', passed, f'Stats: {stats}')
+        self.track_result(passed)
+        pool.release(conn)
+        pool.close_all()
+        return passed
+
+    def test_pool_timeout_when_exhausted(self) -> bool:
+        """Test: a checkout on a full pool gives up with PoolTimeoutError after the timeout"""
+        pool = ConnectionPool(max_size=1, timeout=0.2)
+        held = pool.acquire()
+        started = time.monotonic()
+        try:
+            pool.acquire()
+            timed_out = False
+        except PoolTimeoutError:
+            timed_out = True
+        elapsed = time.monotonic() - started
+        stats = pool.stats()
+        passed = timed_out and 0.2 <= elapsed < 1.0 and stats['timeouts'] == 1 and stats['in_use'] == 1
+        self.print_result('Exhausted pool times out', passed, f'Waited {elapsed:.2f}s, stats: {stats}')
+        self.track_result(passed)
+        pool.release(held)
+        pool.close_all()
+        return passed
+
+    def test_pragma_profile_applied(self) -> bool:
+        """Test: a pooled connection reports every PRAGMA of the selected profile"""
+        self.print_section('PRAGMA PROFILE')
+        mismatches = []
+        with db_connection() as conn:
+            for name, value in PRAGMA_PROFILE.items():
+                actual = conn.execute(f'PRAGMA {name}').fetchone()[0]
+                expected = PRAGMA_KEYWORDS.get(name, {}).get(str(value).upper(), value)
+                if str(actual).lower() != str(expected).lower():
+                    mismatches.append(f'{name}: expected {expected}, got {actual}')
+        passed = not mismatches
+        self.print_result('Pooled connection uses the profile', passed,
+                          '; '.join(mismatches) or f'Profile: {PRAGMA_PROFILE}')
+        self.track_result(passed)
+        return passed
+
+    def test_pragma_override(self) -> bool:
+        """Test: DB_PRAGMA_<NAME> overrides one PRAGMA and leaves the rest of the profile alone"""
+        os.environ['DB_PRAGMA_MMAP_SIZE'] = '0'
+        try:
+            profile = load_pragma_profile('tuned')
+            legacy = load_pragma_profile('legacy')
+        finally:
+            del os.environ['DB_PRAGMA_MMAP_SIZE']
+        passed = profile['mmap_size'] == '0' and profile['synchronous'] == 'NORMAL' and 'mmap_size' not in legacy
+        self.print_result('Single PRAGMA override', passed, f'tuned: {profile}, legacy: {legacy}')
+        self.track_result(passed)
+        return passed
+
+    def test_pragma_rejects_bad_input(self) -> bool:
+        """Test: unknown profiles and values that are not a plain word or number are refused"""
+        try:
+            load_pragma_profile('fastest')
+            unknown_rejected = False
+        except ValueError:
+            unknown_rejected = True
+
+        conn = sqlite3.connect(':memory:')
+        try:
+            apply_pragmas(conn, {'cache_size': '1; DROP TABLE books'})
+            value_rejected = False
+        except ValueError:
+            value_rejected = True
+        finally:
+            conn.close()
+
+        passed = unknown_rejected and value_rejected
+        self.print_result('Bad profile and value refused', passed,
+                          f'unknown profile: {unknown_rejected}, injected value: {value_rejected}')
+        self.track_result(passed)
+        return passed
+
+    def register_user(self, username: str) -> str:
+        result, _ = UserService.register({
+            'username': username,
+            'email': f'{username}@example.com',
+            'password': 'ComponentPass123'
+        })
+        return result['token']
+
+    def test_token_cache_hit(self) -> bool:
+        """Test: the first check of a token fills the cache and the second is served from it"""
+        self.print_section('TOKEN CACHE')
+        token = self.register_user('cache_hit_user')
+        before = TokenCache.stats()
+        first = UserService.verify_token(token)
+        second = UserService.verify_token(token)
+        after = TokenCache.stats()
+        passed = (first is not None and second == first
+                  and after['misses'] - before['misses'] == 1 and after['hits'] - before['hits'] == 1)
+        self.print_result('Second check is a cache hit', passed, f'Before: {before}, after: {after}')
+        self.track_result(passed)
+        return passed
+
+    def test_token_cache_logout(self) -> bool:
+        """Test: logging out drops the cached token and later checks reject it"""
+        token = self.register_user('cache_logout_user')
+        cached = UserService.verify_token(token) is not None and TokenCache.get(token) is not None
+        UserService.logout(token)
+        passed = cached and TokenCache.get(token) is None and UserService.verify_token(token) is None
+        self.print_result('Logout invalidates the cached token', passed, f'Cached before logout: {cached}')
+        self.track_result(passed)
+        return passed
+
+    def test_token_cache_revoked_elsewhere(self) -> bool:
+        """Test: a cached token revoked without touching this cache (as another process would) is rejected"""
+        token = self.register_user('cache_revoked_user')
+        user = UserService.verify_token(token)
+        TokenRevocationList.revoke(user['user_id'], user['jti'], user['exp'])
+        rejected = UserService.verify_token(token) is None
+        passed = rejected and TokenCache.get(token) is None
+        self.print_result('Revocation evicts the cached token', passed, f'Rejected: {rejected}')
+        self.track_result(passed)
+        return passed
+
+    def test_bcrypt_busy_returns_503(self) -> bool:
+        """Test: a login arriving while the bcrypt pool is full gets 503 with Retry-After instead of queueing"""
+        self.print_section('PASSWORD HASHING')
+        self.register_user('busy_user')
+        settings = (password_hasher.rounds, password_hasher.workers, password_hasher.max_pending)
+        password_hasher.rounds, password_hasher.workers, password_hasher.max_pending = SLOW_BCRYPT_ROUNDS, 1, 1
+        busy = threading.Thread(target=password_hasher.hash_password, args=('HoldsThePool123',))
+        try:
+            rejected_before = password_hasher.stats()['rejected']
+            busy.start()
+            while password_hasher.stats()['pending'] == 0:
+                time.sleep(0.001)
+            response = self.gateway.handle_request(
+                method='POST',
+                path='/auth/login',
+                headers={'Content-Type': 'application/json'},
+                body=json.dumps({'username': 'busy_user', 'password': 'ComponentPass123'})
+            )
+            rejected = password_hasher.stats()['rejected'] - rejected_before
+        finally:
+            busy.join()
+            password_hasher.rounds, password_hasher.workers, password_hasher.max_pending = settings
+
+        headers = {name.lower(): value for name, value in response['headers'].items()}
+        body = json.loads(response['body'])
+        passed = (response['statusCode'] == 503 and headers.get('retry-after') == str(BCRYPT_RETRY_AFTER_SECONDS)
+                  and body.get('error') == ERROR_AUTH_BUSY and rejected == 1)
+        self.print_result('Full pool answers 503 with Retry-After', passed,
+                          f"Status: {response['statusCode']}, Retry-After: {headers.get('retry-after')}, "
+                          f"rejected: {rejected}")
+        self.track_result(passed)
+        return passed
+
+    def test_bcrypt_recovers_after_busy(self) -> bool:
+        """Test: once the pool drains, the same login succeeds"""
+        response = self.gateway.handle_request(
+            method='POST',
+            path='/auth/login',
+            headers={'Content-Type': 'application/json'},
+            body=json.dumps({'username': 'busy_user', 'password': 'ComponentPass123'})
+        )
+        passed = response['statusCode'] == 200 and password_hasher.stats()['pending'] == 0
+        self.print_result('Login succeeds after the pool drains', passed, f"Status: {response['statusCode']}")
+        self.track_result(passed)
+        return passed
+
+    def test_bcrypt_timeout(self) -> bool:
+        """Test: a hash that outlives the timeout is reported as busy rather than blocking the request"""
+        hasher = PasswordHasher(rounds=SLOW_BCRYPT_ROUNDS, workers=1, max_pending=1, timeout=0.05)
+        try:
+            hasher.hash_password('TooSlowToWait123')
+            timed_out = False
+        except ServiceUnavailableException:
+            timed_out = True
+        stats = hasher.stats()
+        passed = timed_out and stats['timeouts'] == 1
+        self.print_result('Slow hash times out with 503', passed, f'Stats: {stats}')
+        self.track_result(passed)
+        return passed
+
+    def wsgi_request(
+        self,
+        method: str,
+        path: str,
+        query: str = '',
+        headers: Optional[Dict[str, str]] = None,
+        body: bytes = b''
+    ) -> Tuple[str, List[Tuple[str, str]], bytes]:
+        environ = {'REQUEST_METHOD': method, 'PATH_INFO': path, 'QUERY_STRING': query,
+                   'CONTENT_LENGTH': str(len(body)), 'wsgi.input': io.BytesIO(body)}
+        for name, value in (headers or {}).items():
+            key = name.upper().replace('-', '_')
+            environ[key if key == 'CONTENT_TYPE' else f'HTTP_{key}'] = value
+        setup_testing_defaults(environ)
+
+        started = {}
+
+        def start_response(status, response_headers):
+            started['status'], started['headers'] = status, response_headers
+
+        response_body = b''.join(self.application(environ, start_response))
+        return started['status'], started['headers'], response_body
+
+    def test_wsgi_status_lines(self) -> bool:
+        """Test: status codes from routes and from the gateway itself become full WSGI status lines"""
+        self.print_section('WSGI ADAPTER')
+        statuses = [
+            self.wsgi_request('GET', '/books')[0],
+            self.wsgi_request('GET', '/books/999999')[0],
+            self.wsgi_request('GET', '/no-such-route')[0]
+        ]
+        passed = statuses == ['200 OK', '404 Not Found', '403 Forbidden']
+        self.print_result('Status lines', passed, f'Statuses: {statuses}')
+        self.track_result(passed)
+        return passed
+
+    def test_wsgi_headers(self) -> bool:
+        """Test: route headers pass through and Content-Length always matches the body sent"""
+        status, headers, body = self.wsgi_request('GET', '/books')
+        names = dict(headers)
+        lengths = [value for name, value in headers if name.lower() == 'content-length']
+        not_modified, revalidated, empty = self.wsgi_request('GET', '/books',
+                                                             headers={'If-None-Match': names.get('ETag', '')})
+        passed = (status == '200 OK' and names.get('Content-Type') == 'application/json' and 'ETag' in names
+                  and lengths == [str(len(body))]
+                  and not_modified == '304 Not Modified' and empty == b''
+                  and dict(revalidated).get('Content-Length') == '0')
+        self.print_result('Headers and Content-Length', passed,
+                          f"Content-Length: {lengths} for {len(body)} bytes, ETag: {names.get('ETag')}, "
+                          f'revalidation: {not_modified}')
+        self.track_result(passed)
+        return passed
+
+    def test_wsgi_binary_round_trip(self) -> bool:
+        """Test: a raw NDJSON upload and a gzip export cross the adapter byte for byte"""
+        token = self.register_user('wsgi_user')
+        titles = ['Ψυχή και Έρως', 'Der Zauberberg', '雪国']
+        upload = ''.join(json.dumps({'title': title, 'author': 'WSGI Roundtrip', 'year': 1924}) + '\n'
+                         for title in titles).encode('utf-8')
+        created, _, _ = self.wsgi_request('POST', '/books/bulk', headers={
+            'Content-Type': 'application/x-ndjson',
+            'Authorization': f'Bearer {token}'
+        }, body=upload)
+
+        status, headers, body = self.wsgi_request('GET', '/books/export', query='gzip=true&author=WSGI%20Roundtrip',
+                                                  headers={'Accept': 'application/gzip'})
+        exported = sorted(json.loads(line)['title'] for line in gzip.decompress(body).decode('utf-8').splitlines())
+        names = dict(headers)
+        passed = (created == '201 Created' and status == '200 OK' and names.get('Content-Type') == 'application/gzip'
+                  and names.get('Content-Length') == str(len(body)) and exported == sorted(titles))
+        self.print_result('Binary bodies round trip', passed,
+                          f'Upload: {created}, export: {status}, {len(body)} gzip bytes, titles: {exported}')
+        self.track_result(passed)
+        return passed
+
+    def write_feed(self, author: str, count: int, compress: bool = False) -> str:
+        path = os.path.join(os.path.dirname(os.environ['DATABASE_PATH']),
+                            f"{author.replace(' ', '_')}.ndjson{'.gz' if compress else ''}")
+        lines = ''.join(json.dumps({'title': f'{author} {n}', 'author': author, 'year': 1990}) + '\n'
+                        for n in range(count)).encode('utf-8')
+        with (gzip.open(path, 'wb') if compress else open(path, 'wb')) as feed:
+            feed.write(lines)
+        return path
+
+    def import_until_crash(self, path: str, batches: int) -> None:
+        """Run an import that dies after ``batches`` committed batches, as a killed process would"""
+        import_batch = BookRepository.import_batch
+        committed = []
+
+        def crashing_batch(*args, **kwargs):
+            if len(committed) == batches:
+                raise RuntimeError('simulated crash')
+            committed.append(import_batch(*args, **kwargs))
+            return committed[-1]
+
+        BookRepository.import_batch = crashing_batch
+        try:
+            BookImport.import_file(path, batch_size=3)
+        except RuntimeError:
+            pass
+        finally:
+            BookRepository.import_batch = import_batch
+
+    def count_books(self, author: str) -> int:
+        return BookPagination.paginate(author=author, match='prefix')['total']
+
+    def test_import_same_file_twice(self) -> bool:
+        """Test: a finished import leaves no checkpoint, so importing the file again starts from the top"""
+        self.print_section('BOOK IMPORT')
+        path = self.write_feed('Import Twice', 5)
+        first = BookImport.import_file(path, batch_size=2)
+        checkpoint = BookRepository.find_import_checkpoint(os.path.realpath(path))
+        second = BookImport.import_file(path, batch_size=2)
+        total = self.count_books('Import Twice')
+        passed = (first['imported_this_run'] == 5 and checkpoint is None
+                  and second['imported_this_run'] == 5 and not second['resumed'] and total == 10)
+        self.print_result('Second run imports the whole file again', passed,
+                          f"First: {first['imported_this_run']}, second: {second['imported_this_run']} "
+                          f"(resumed: {second['resumed']}), checkpoint after first: {checkpoint}, books: {total}")
+        self.track_result(passed)
+        return passed
+
+    def test_import_resumes_after_crash(self) -> bool:
+        """Test: a crashed import resumes after its last committed batch without duplicating or skipping books"""
+        path = self.write_feed('Import Crash', 10)
+        self.import_until_crash(path, batches=2)
+        committed = self.count_books('Import Crash')
+        resumed = BookImport.import_file(path, batch_size=3)
+        titles = BookPagination.paginate(author='Import Crash', match='prefix', per_page=50)['books']
+        passed = (committed == 6 and resumed['resumed'] and resumed['imported_this_run'] == 4
+                  and sorted(book['title'] for book in titles) == sorted(f'Import Crash {n}' for n in range(10))
+                  and BookRepository.find_import_checkpoint(os.path.realpath(path)) is None)
+        self.print_result('Crashed import resumes exactly', passed,
+                          f"Committed before crash: {committed}, resumed run: {resumed['imported_this_run']}, "
+                          f'books: {len(titles)}')
+        self.track_result(passed)
+        return passed
+
+    def test_import_refuses_replaced_file(self) -> bool:
+        """Test: a (gzipped) file replaced after a crash is not resumed at the old offset"""
+        path = self.write_feed('Import Replaced', 10, compress=True)
+        self.import_until_crash(path, batches=1)
+        self.write_feed('Import Replaced', 12, compress=True)
+        try:
+            BookImport.import_file(path, batch_size=3)
+            refused = False
+        except ValueError:
+            refused = True
+        restarted = BookImport.import_file(path, batch_size=3, restart=True)
+        passed = refused and restarted['imported_this_run'] == 12 and self.count_books('Import Replaced') == 15
+        self.print_result('Replaced file is refused until --restart', passed,
+                          f"Refused: {refused}, restarted run: {restarted['imported_this_run']}")
+        self.track_result(passed)
+        return passed
+
+    def run_all_tests(self) -> None:
+        init_db()
+
+        self.test_pool_reuses_connection()
+        self.test_pool_concurrent_checkouts()
+        self.test_pool_waits_for_release()
+        self.test_pool_timeout_when_exhausted()
+
+        self.test_pragma_profile_applied()
+        self.test_pragma_override()
+        self.test_pragma_rejects_bad_input()
+
+        self.test_token_cache_hit()
+        self.test_token_cache_logout()
+        self.test_token_cache_revoked_elsewhere()
+
+        self.test_bcrypt_busy_returns_503()
+        self.test_bcrypt_recovers_after_busy()
+        self.test_bcrypt_timeout()
+
+        self.test_wsgi_status_lines()
+        self.test_wsgi_headers()
+        self.test_wsgi_binary_round_trip()
+
+        self.test_import_same_file_twice()
+        self.test_import_resumes_after_crash()
+        self.test_import_refuses_replaced_file()
+
+        self.print_summary()
+
+    def print_summary(self) -> None:
+        """Print test summary"""
+        self.print_section('TEST SUMMARY')
+        total = self.passed + self.failed
+        percentage = (self.passed / total * 100) if total > 0 else 0
+
+        print(f'Total Tests: {total}')
+        print(f'Passed: {self.passed} ✓')
+        print(f'Failed: {self.failed} ✗')
+        print(f'Success Rate: {percentage:.1f}%')
+        print(f'{"="*60}\n')
+
+
+if __name__ == '__main__':
+    tester = ComponentTester()
+    tester.run_all_tests()
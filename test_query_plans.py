@@ -0,0 +1,179 @@
+import os
+import tempfile
+from typing import List
+
+os.environ['DATABASE_PATH'] = os.path.join(tempfile.mkdtemp(prefix='library_plans_'), 'plans.db')
+
+from chalicelib.constants.db_queries import BookQueries, MigrationQueries
+from chalicelib.database.db import db_connection, init_db
+from chalicelib.pagination.book_pagination import BookPagination
+from chalicelib.repositories.book_repository import BookRepository
+
+SAMPLE_BOOKS = [
+    ("Crime and Punishment", "Fyodor Dostoevsky", 1866, "978-0-14-044913-5"),
+    ("The Brothers Karamazov", "Fyodor Dostoevsky", 1879, "978-0-14-044924-1"),
+    ("Wuthering Heights", "Emily Brontë", 1847, "978-0-14-143957-0"),
+    ("Dune", "Frank Herbert", 1965, "978-0-441-17266-5"),
+]
+
+
+class QueryPlanTester:
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+
+    def print_result(self, test_name: str, passed: bool, message: str = '') -> None:
+        status = '✓ PASS' if passed else '✗ FAIL'
+        print(f'{status}: {test_name}')
+        if message:
+            print(f'  └─ {message}')
+
+    def print_section(self, title: str) -> None:
+        print(f'\n{"="*60}')
+        print(f'{title}')
+        print(f'{"="*60}')
+
+    def track_result(self, passed: bool) -> None:
+        if passed:
+            self.passed += 1
+        else:
+            self.failed += 1
+
+    def explain(self, query: str, params: tuple) -> List[str]:
+        with db_connection() as conn:
+            rows = conn.execute(f'EXPLAIN QUERY PLAN {query}', params).fetchall()
+            return [row['detail'] for row in rows]
+
+    def check_plan(self, test_name: str, query: str, params: tuple, expected: str, forbidden: str = None) -> bool:
+        plan = self.explain(query, params)
+        passed = any(expected in step for step in plan)
+        if forbidden:
+            passed = passed and not any(forbidden in step for step in plan)
+        self.print_result(test_name, passed, ' | '.join(plan))
+        self.track_result(passed)
+        return passed
+
+    def test_schema_version(self) -> bool:
+        """Test: init_db applies every migration"""
+        self.print_section('SCHEMA MIGRATIONS')
+        with db_connection() as conn:
+            version = conn.execute(MigrationQueries.GET_SCHEMA_VERSION).fetchone()[0]
+        latest = MigrationQueries.MIGRATIONS[-1][0]
+        passed = version == latest
+        self.print_result('Schema at latest version', passed, f'user_version: {version}, latest: {latest}')
+        self.track_result(passed)
+        return passed
+
+    def test_default_listing_uses_created_at_index(self) -> bool:
+        """Test: unfiltered page walks idx_books_created_at instead of sorting"""
+        self.print_section('QUERY PLANS')
+        query = BookQueries.SELECT_BOOKS_BASE + BookQueries.PAGINATION_SUFFIX
+        return self.check_plan('Default listing ordered by index', query, (10, 0),
+                               'idx_books_created_at', forbidden='TEMP B-TREE')
+
+    def test_year_filter_uses_index(self) -> bool:
+        """Test: year filter searches idx_books_year"""
+        query = BookQueries.SELECT_BOOKS_BASE + BookQueries.FILTER_BY_YEAR + BookQueries.PAGINATION_SUFFIX
+        return self.check_plan('Year filter', query, (1866, 10, 0), 'SEARCH books USING INDEX idx_books_year')
+
+    def test_author_prefix_uses_index(self) -> bool:
+        """Test: author prefix filter searches idx_books_author_lc"""
+        query = BookQueries.SELECT_BOOKS_BASE + BookQueries.FILTER_BY_AUTHOR_PREFIX + BookQueries.PAGINATION_SUFFIX
+        params = BookPagination._prefix_bounds('Fyodor') + (10, 0)
+        return self.check_plan('Author prefix filter', query, params, 'SEARCH books USING INDEX idx_books_author_lc')
+
+    def test_title_prefix_uses_index(self) -> bool:
+        """Test: title prefix filter searches idx_books_title_lc"""
+        query = BookQueries.SELECT_BOOKS_BASE + BookQueries.FILTER_BY_TITLE_PREFIX + BookQueries.PAGINATION_SUFFIX
+        params = BookPagination._prefix_bounds('Crime') + (10, 0)
+        return self.check_plan('Title prefix filter', query, params, 'SEARCH books USING INDEX idx_books_title_lc')
+
+    def test_isbn_lookup_uses_index(self) -> bool:
+        """Test: ISBN equality lookup searches idx_books_isbn"""
+        query = f'SELECT {BookQueries.BOOK_COLUMNS} FROM books WHERE isbn = ?'
+        return self.check_plan('ISBN lookup', query, ('978-0-441-17266-5',), 'SEARCH books USING INDEX idx_books_isbn')
+
+    def test_contains_filter_uses_full_text_index(self) -> bool:
+        """Test: contains filters are pre-filtered through books_fts when FTS5 is available"""
+        filter_clause, filter_params = BookPagination.build_filters(author='dostoevsky')
+        query = BookQueries.SELECT_BOOKS_BASE + filter_clause + BookQueries.PAGINATION_SUFFIX
+        return self.check_plan('Contains filter via FTS5', query, tuple(filter_params) + (10, 0),
+                               'SCAN books_fts VIRTUAL TABLE')
+
+    def test_changes_feed_uses_sequence(self) -> bool:
+        """Test: the change feed seeks on book_changes.seq instead of scanning the log"""
+        return self.check_plan('Change feed since token', BookQueries.SELECT_CHANGES_SINCE, (2, 100),
+                               'SEARCH c USING INTEGER PRIMARY KEY (rowid>?)')
+
+    def test_author_facets_use_count_index(self) -> bool:
+        """Test: unfiltered top authors walk the count index instead of grouping books"""
+        return self.check_plan('Top author facets', BookQueries.SELECT_AUTHOR_FACETS, (10,),
+                               'idx_book_author_counts_count', forbidden='TEMP B-TREE')
+
+    def test_prefix_match_results(self) -> bool:
+        """Test: prefix match is case-insensitive and anchored at the start"""
+        self.print_section('PREFIX MATCHING')
+        result = BookPagination.paginate(author='fyodor', match='prefix')
+        anchored = BookPagination.paginate(author='dostoevsky', match='prefix')
+        contains = BookPagination.paginate(author='dostoevsky')
+        passed = result['total'] == 2 and anchored['total'] == 0 and contains['total'] == 2
+        self.print_result('Prefix vs contains matching', passed,
+                          f"prefix 'fyodor': {result['total']}, prefix 'dostoevsky': {anchored['total']}, "
+                          f"contains 'dostoevsky': {contains['total']}")
+        self.track_result(passed)
+        return passed
+
+    def test_prefix_match_non_ascii(self) -> bool:
+        """Test: non-ASCII characters survive the prefix bounds"""
+        result = BookPagination.paginate(author='EMILY Brontë', match='prefix')
+        passed = result['total'] == 1
+        self.print_result('Prefix match with non-ASCII author', passed, f"Total: {result['total']}")
+        self.track_result(passed)
+        return passed
+
+    def test_books_exclude_search_columns(self) -> bool:
+        """Test: generated search columns are not returned to clients"""
+        book = BookPagination.paginate(per_page=1)['books'][0]
+        passed = 'author_lc' not in book and 'title_lc' not in book
+        self.print_result('Search columns hidden from responses', passed, f'Keys: {sorted(book)}')
+        self.track_result(passed)
+        return passed
+
+    def run_all_tests(self) -> None:
+        init_db()
+        for title, author, year, isbn in SAMPLE_BOOKS:
+            BookRepository.create(title=title, author=author, year=year, isbn=isbn)
+
+        self.test_schema_version()
+
+        self.test_default_listing_uses_created_at_index()
+        self.test_year_filter_uses_index()
+        self.test_author_prefix_uses_index()
+        self.test_title_prefix_uses_index()
+        self.test_isbn_lookup_uses_index()
+        self.test_contains_filter_uses_full_text_index()
+        self.test_changes_feed_uses_sequence()
+        self.test_author_facets_use_count_index()
+
+        self.test_prefix_match_results()
+        self.test_prefix_match_non_ascii()
+        self.test_books_exclude_search_columns()
+
+        self.print_summary()
+
+    def print_summary(self) -> None:
+        """Print test summary"""
+        self.print_section('TEST SUMMARY')
+        total = self.passed + self.failed
+        percentage = (self.passed / total * 100) if total > 0 else 0
+
+        print(f'Total Tests: {total}')
+        print(f'Passed: {self.passed} ✓')
+        print(f'Failed: {self.failed} ✗')
+        print(f'Success Rate: {percentage:.1f}%')
+        print(f'{"="*60}\n')
+
+
+if __name__ == '__main__':
+    tester = QueryPlanTester()
+    tester.run_all_tests()
@@ -0,0 +1,6 @@
+"""WSGI entry point for production servers: gunicorn --config gunicorn.conf.py wsgi:application"""
+
+from app import app
+from chalicelib.utils.wsgi_adapter import WSGIAdapter
+
+application = WSGIAdapter(app)